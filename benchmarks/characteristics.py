@@ -0,0 +1,130 @@
+"""
+Batched characteristic reads.
+
+Reads a large batch of characteristics at once through GET /characteristics,
+and compares looking up the ids in the server's (aid, iid) index against
+scanning the accessories for each of them.
+
+    python -m benchmarks.characteristics [--accessories N] [--ids N]
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Any
+
+from hap.accessories import (
+    Accessory,
+    AccessoryInformation,
+    BaseCharacteristic,
+    Brightness,
+    FirmwareRevision,
+    Identify,
+    Lightbulb,
+    Manufacturer,
+    Model,
+    Name,
+    On,
+    SerialNumber,
+    Service,
+)
+from hap.backends.memory import MemoryBackend
+from hap.http.app import App
+from hap.http.request import Request, Session
+from hap.server import AccessoryServer
+
+
+def create_accessory(aid: int) -> Accessory:
+    iids = itertools.count(1)
+    return Accessory(
+        aid=aid,
+        services=[
+            Service.from_spec(
+                AccessoryInformation(
+                    FirmwareRevision("1.0"),
+                    Identify(),
+                    Manufacturer("Benchmark"),
+                    Model("Bulb"),
+                    Name(f"Bulb {aid}"),
+                    SerialNumber(str(aid)),
+                ),
+                iids.__next__,
+            ),
+            Service.from_spec(
+                Lightbulb(On(False), Brightness(50), primary=True),
+                iids.__next__,
+            ),
+        ],
+    )
+
+
+def create_server(accessories: int) -> AccessoryServer:
+    server = AccessoryServer(MemoryBackend())
+    for aid in range(1, accessories + 1):
+        server.add_accessory(create_accessory(aid))
+    return server
+
+
+def scan(server: AccessoryServer, aid: int, iid: int) -> BaseCharacteristic[Any] | None:
+    for accessory in server.accessories:
+        if accessory.aid != aid:
+            continue
+        for service in accessory.services:
+            for characteristic in service.characteristics:
+                if characteristic.iid == iid:
+                    return characteristic
+    return None
+
+
+def measure_lookups(
+    server: AccessoryServer, ids: list[tuple[int, int]], rounds: int
+) -> tuple[float, float]:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for aid, iid in ids:
+            server.get_characteristic(aid, iid)
+    indexed = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for aid, iid in ids:
+            scan(server, aid, iid)
+    scanned = (time.perf_counter() - start) / rounds
+    return indexed, scanned
+
+
+async def measure_requests(app: App, target: bytes, rounds: int) -> float:
+    session = Session()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await app(Request(method="GET", target=target, body=b"", session=session))
+    return (time.perf_counter() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accessories", type=int, default=100)
+    parser.add_argument("--ids", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    server = create_server(args.accessories)
+    ids = [
+        (aid, iid)
+        for aid in range(1, args.accessories + 1)
+        for iid in (2, 3, 4, 5, 6, 7, 9, 10)
+    ][: args.ids]
+    target = b"/characteristics?id=" + ",".join(f"{a}.{i}" for a, i in ids).encode()
+
+    indexed, scanned = measure_lookups(server, ids, args.rounds)
+    elapsed = asyncio.run(measure_requests(App(server=server), target, args.rounds))
+
+    print(f"{len(ids)} ids from {args.accessories} accessories")
+    print(f"lookups (index): {indexed * 1e6:10.1f} us")
+    print(f"lookups (scan):  {scanned * 1e6:10.1f} us")
+    print(f"GET request:     {elapsed * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
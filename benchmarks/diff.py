@@ -0,0 +1,81 @@
+"""
+Structural diff between two versions of a bridge.
+
+Builds a bridge of lightbulbs twice, as when redeploying it, with some
+accessories added, removed and given another service in the new version, and
+reports the time taken by diff_accessories(), with and without comparing the
+values as well.
+
+    python -m benchmarks.diff [--accessories N]
+"""
+
+import argparse
+import time
+from functools import partial
+from typing import Any, Callable
+
+from hap.accessories import (
+    AccessoryInformation,
+    AccessoryTemplate,
+    Brightness,
+    FirmwareRevision,
+    Identify,
+    Lightbulb,
+    Manufacturer,
+    Model,
+    Name,
+    On,
+    SerialNumber,
+    diff_accessories,
+)
+
+INFORMATION = AccessoryInformation(
+    FirmwareRevision("1.0"),
+    Identify(),
+    Manufacturer("Benchmark"),
+    Model("Bulb"),
+    Name("Bulb"),
+    SerialNumber("0"),
+)
+
+
+def measure(function: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accessories", type=int, default=10000)
+    args = parser.parse_args()
+
+    template = AccessoryTemplate([INFORMATION, Lightbulb(On(False), Brightness(50))])
+    extended = AccessoryTemplate(
+        [INFORMATION, Lightbulb(On(False), Brightness(50)), Lightbulb(On(False))]
+    )
+
+    # One in a hundred accessories is removed, added or extended
+    count = args.accessories
+    old = template.create_many(range(2, count + 2))
+    new = [
+        (extended if aid % 100 == 50 else template).create(aid)
+        for aid in range(2, count + 2)
+        if aid % 100
+    ] + template.create_many(range(count + 2, count + 2 + count // 100))
+
+    result = diff_accessories(old, new)
+    print(
+        f"{count} accessories: {len(result.added)} added, "
+        f"{len(result.removed)} removed, {len(result.changed)} changed"
+    )
+    for name, values in [("structure", False), ("values", True)]:
+        elapsed = measure(partial(diff_accessories, old, new, values=values))
+        print(f"{name:>10}: {elapsed * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Encoding of HAP JSON payloads.
+
+Compares the HAP encoder with json.dumps for the common response shapes:
+characteristic reads with all metadata, multi-status lists and the attribute
+database. The json.dumps variants encode the same data, built as dicts.
+
+    python -m benchmarks.encoder [--accessories N] [--rounds N]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+from hap.accessories.base import Permission
+from hap.http import encoder
+from hap.http.encoder import ReadFlags, encode_reads, encode_statuses
+
+from .characteristics import create_server
+
+ALL_FLAGS = ReadFlags.META | ReadFlags.PERMS | ReadFlags.TYPE | ReadFlags.EV
+
+
+def measure(function: Callable[[], Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            function()
+        best = min(best, (time.perf_counter() - start) / rounds)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accessories", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+
+    server = create_server(args.accessories)
+    reads = [
+        (aid, iid, characteristic, 0)
+        for (aid, iid), characteristic in server._characteristics.items()
+        if Permission.PAIRED_READ in characteristic.type.permissions
+    ]
+
+    # The same payloads as plain data, as they'd be passed to json.dumps
+    reads_data = json.loads(encode_reads(reads, ALL_FLAGS, with_status=False))
+    statuses = [(aid, iid, -70402) for aid, iid, _, _ in reads]
+    statuses_data = json.loads(encode_statuses(statuses))
+    database_data = json.loads(server.database.serialize())
+
+    def build_database() -> bytes:
+        server.database.invalidate()
+        return server.database.serialize()
+
+    cases: list[tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+        (
+            f"{len(reads)} reads",
+            lambda: encode_reads(reads, ALL_FLAGS, with_status=False),
+            lambda: json.dumps(reads_data).encode(),
+        ),
+        (
+            f"{len(statuses)} statuses",
+            lambda: encode_statuses(statuses),
+            lambda: json.dumps(statuses_data).encode(),
+        ),
+        (
+            "attribute database",  # A full rebuild, it's cached otherwise
+            build_database,
+            lambda: json.dumps(database_data).encode(),
+        ),
+    ]
+
+    print(f"orjson: {'yes' if encoder._orjson is not None else 'no'}")
+    print(f"{'payload':>20} {'encoder':>10} {'json.dumps':>11} {'speedup':>8}  (us)")
+    for name, encode, dumps in cases:
+        fast = measure(encode, args.rounds)
+        slow = measure(dumps, args.rounds)
+        print(
+            f"{name:>20} {fast * 1e6:>10.1f} {slow * 1e6:>11.1f} {slow / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Request latency of small GET and PUT requests over a single keep-alive
+connection, comparing event loops and socket options.
+
+    python -m benchmarks.latency [--requests N]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import time
+
+from hap.http.app import App
+from hap.http.server import install_event_loop_policy, serve
+
+from .characteristics import create_server
+
+GET = b"GET / HTTP/1.1\r\nHost: bench\r\n\r\n"
+# Sets the brightness of the benchmark accessory
+PUT_BODY = b'{"characteristics": [{"aid": 1, "iid": 10, "value": 1}]}'
+PUT = (
+    b"PUT /characteristics HTTP/1.1\r\n"
+    b"Host: bench\r\n"
+    b"Content-Type: application/hap+json\r\n"
+    b"Content-Length: %d\r\n"
+    b"\r\n%s" % (len(PUT_BODY), PUT_BODY)
+)
+WARMUP = 100
+
+
+async def read_response(reader: asyncio.StreamReader) -> bytes:
+    """
+    Read a response and return its status line.
+    """
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *lines = head.split(b"\r\n")
+    for line in lines:
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            await reader.readexactly(int(value))
+            break
+    return status_line
+
+
+async def measure(port: int, request: bytes, status: int, requests: int) -> list[float]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    samples = []
+    for i in range(WARMUP + requests):
+        start = time.perf_counter()
+        writer.write(request)
+        status_line = await read_response(reader)
+        assert status_line.startswith(b"HTTP/1.1 %d " % status), status_line
+        if i >= WARMUP:
+            samples.append(time.perf_counter() - start)
+    writer.close()
+    return samples
+
+
+async def run(nodelay: bool, requests: int) -> dict[str, list[float]]:
+    app = App(server=create_server(1))
+    async with serve(port=0, app=app, nodelay=nodelay) as server:
+        port = server.sockets[0].getsockname()[1]
+        return {
+            "GET": await measure(port, GET, 200, requests),
+            "PUT": await measure(port, PUT, 204, requests),
+        }
+
+
+def percentile(samples: list[float], p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    loops = ["asyncio"]
+    if importlib.util.find_spec("uvloop"):
+        loops.append("uvloop")
+
+    print(
+        f"{'loop':<8} {'nodelay':<8} "
+        f"{'GET p50':>9} {'GET p99':>9} {'PUT p50':>9} {'PUT p99':>9}  (µs)"
+    )
+    for loop in loops:
+        for nodelay in (True, False):
+            install_event_loop_policy(loop)
+            results = asyncio.run(run(nodelay, args.requests))
+            print(
+                f"{loop:<8} {str(nodelay):<8} "
+                + " ".join(
+                    f"{percentile(samples, p) * 1e6:>9.1f}"
+                    for samples in results.values()
+                    for p in (0.5, 0.99)
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
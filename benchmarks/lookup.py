@@ -0,0 +1,115 @@
+"""
+Characteristic lookup by type.
+
+Looks up characteristics of a service with 20 characteristics by their type,
+and sets their values, through the type index of Service.__getitem__ and
+__setitem__. A linear scan comparing the types, as the lookup used to do, is
+measured for comparison.
+
+    python -m benchmarks.lookup [--rounds N]
+"""
+
+import argparse
+import itertools
+import time
+from typing import Any, Callable
+from uuid import UUID
+
+from hap.accessories import (
+    BaseCharacteristic,
+    Characteristic,
+    CharacteristicType,
+    Service,
+    ServiceType,
+)
+from hap.accessories.base import Permission
+
+CHARACTERISTICS = 20
+
+TYPES = [
+    CharacteristicType[int](
+        uuid=UUID(f"{i:08X}-0000-1000-8000-0026BB765291"),
+        permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+        format="uint8",
+        description=f"Benchmark {i}",
+        min_value=0,
+        max_value=100,
+    )
+    for i in range(1, CHARACTERISTICS + 1)
+]
+
+
+def create_service() -> Service:
+    iids = itertools.count(2)
+    return Service(
+        iid=1,
+        type=ServiceType(
+            uuid=UUID("000000FF-0000-1000-8000-0026BB765291"),
+            name="Benchmark",
+            required_characteristics=(),
+            optional_characteristics=(),
+        ),
+        characteristics=[
+            Characteristic.from_spec(char_type(0), iids.__next__) for char_type in TYPES
+        ],
+        primary=True,
+        hidden=False,
+    )
+
+
+def scan(service: Service, key: CharacteristicType[Any]) -> BaseCharacteristic[Any]:
+    return next(char for char in service.characteristics if char.type == key)
+
+
+def measure(function: Callable[[], Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            function()
+        best = min(best, (time.perf_counter() - start) / rounds)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=10000)
+    args = parser.parse_args()
+
+    service = create_service()
+    types = [char.type for char in service.characteristics]
+
+    # Equal types that aren't the same objects, which are compared field by
+    # field rather than by identity
+    copies = [char_type._replace() for char_type in types]
+
+    def get_all() -> None:
+        for char_type in types:
+            service[char_type]
+
+    def set_all() -> None:
+        for value, char_type in enumerate(types):
+            service[char_type] = value
+
+    def get_all_copies() -> None:
+        for char_type in copies:
+            service[char_type]
+
+    def scan_all() -> None:
+        for char_type in copies:
+            scan(service, char_type)
+
+    cases = [
+        ("get (index)", get_all),
+        ("set (index)", set_all),
+        ("get (index, equal type)", get_all_copies),
+        ("get (scan, equal type)", scan_all),
+    ]
+
+    print(f"{CHARACTERISTICS} lookups of each characteristic of a service")
+    for name, function in cases:
+        print(f"{name:>24}: {measure(function, args.rounds) * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
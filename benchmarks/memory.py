@@ -0,0 +1,68 @@
+"""
+Memory used per accessory.
+
+Builds a large bridge of accessories with an AccessoryInformation and a
+Lightbulb service each, and reports the memory allocated per accessory, both
+for the accessory model itself and once added to an accessory server.
+
+    python -m benchmarks.memory [--accessories N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, TypeVar
+
+from hap.accessories import Accessory
+from hap.backends.memory import MemoryBackend
+from hap.server import AccessoryServer
+
+from .characteristics import create_accessory
+
+T = TypeVar("T")
+
+
+def measure(function: Callable[[], T]) -> tuple[T, int]:
+    """
+    Call a function, returning its result and the memory it allocated that's
+    still in use afterwards.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = function()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accessories", type=int, default=5000)
+    args = parser.parse_args()
+
+    def create_accessories() -> list[Accessory]:
+        return [create_accessory(aid) for aid in range(2, args.accessories + 2)]
+
+    accessories, model = measure(create_accessories)
+
+    def add_accessories() -> AccessoryServer:
+        server = AccessoryServer(MemoryBackend())
+        for accessory in accessories:
+            server.add_accessory(accessory)
+        return server
+
+    _, server = measure(add_accessories)
+
+    print(f"{args.accessories} accessories (AccessoryInformation + Lightbulb)")
+    print(f"model:  {model / args.accessories:8.0f} bytes per accessory")
+    print(f"server: {server / args.accessories:8.0f} bytes per accessory")
+    print(f"total:  {(model + server) / args.accessories:8.0f} bytes per accessory")
+
+
+if __name__ == "__main__":
+    main()
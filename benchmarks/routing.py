@@ -0,0 +1,59 @@
+"""
+Per-request overhead of routing and middleware.
+
+Dispatches requests to a trivial handler through the app with a growing
+number of no-op middleware, and reports the time per request and the overhead
+added by each middleware.
+
+    python -m benchmarks.routing [--requests N]
+"""
+
+import argparse
+import asyncio
+import time
+
+from hap.http.api import ROUTES
+from hap.http.app import App
+from hap.http.request import Request, Session
+from hap.http.response import Response
+from hap.http.routing import Handler, Route, Router
+
+RESPONSE = Response(body=b"", status=204, content_type="text/plain")
+
+
+async def handler(request: Request) -> Response:
+    return RESPONSE
+
+
+async def noop(request: Request, *, handler: Handler) -> Response:
+    return await handler(request)
+
+
+async def measure(app: App, request: Request, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(request)
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    request = Request(method="GET", target=b"/bench", body=b"", session=Session())
+    routes = [*ROUTES, Route("/bench", handler)]
+
+    print(f"{'middleware':>10} {'per request':>12} {'per middleware':>15}  (ns)")
+    baseline = None
+    for count in (0, 1, 2, 4, 8):
+        app = App(router=Router(routes, middleware=[noop] * count))
+        elapsed = asyncio.run(measure(app, request, args.requests))
+        if baseline is None:
+            baseline = elapsed
+        overhead = (elapsed - baseline) / count if count else 0.0
+        print(f"{count:>10} {elapsed * 1e9:>12.0f} {overhead * 1e9:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
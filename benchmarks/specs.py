@@ -0,0 +1,104 @@
+"""
+Building accessories from specs.
+
+Builds a fleet of identical accessories, each defined by calling the service
+and characteristic types as usual, and reports the time per accessory spent
+on defining the specs and on creating the instances from them. Creating the
+instances from an AccessoryTemplate is measured for comparison, both with the
+initial values and with a name per accessory.
+
+    python -m benchmarks.specs [--accessories N]
+"""
+
+import argparse
+import itertools
+import time
+from typing import Any, Callable
+
+from hap.accessories import (
+    Accessory,
+    AccessoryInformation,
+    AccessoryTemplate,
+    CurrentTemperature,
+    FirmwareRevision,
+    Identify,
+    Manufacturer,
+    Model,
+    Name,
+    SerialNumber,
+    Service,
+    TemperatureSensor,
+)
+from hap.accessories.base import ServiceSpec
+
+
+def define_specs() -> list[ServiceSpec]:
+    return [
+        AccessoryInformation(
+            FirmwareRevision("1.0"),
+            Identify(),
+            Manufacturer("Benchmark"),
+            Model("Sensor"),
+            Name("Sensor"),
+            SerialNumber("0"),
+        ),
+        TemperatureSensor(CurrentTemperature(20.0), primary=True),
+    ]
+
+
+def create_accessory(aid: int, specs: list[ServiceSpec]) -> Accessory:
+    iids = itertools.count(1)
+    return Accessory(
+        aid=aid, services=[Service.from_spec(spec, iids.__next__) for spec in specs]
+    )
+
+
+def measure(function: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accessories", type=int, default=10000)
+    args = parser.parse_args()
+
+    specs = define_specs()
+
+    def define_all() -> None:
+        for _ in range(args.accessories):
+            define_specs()
+
+    def create_all() -> None:
+        for aid in range(2, args.accessories + 2):
+            create_accessory(aid, specs)
+
+    template = AccessoryTemplate(specs)
+    aids = range(2, args.accessories + 2)
+    name_spec = specs[0].characteristics[4]
+    name_iid = template.iid(AccessoryInformation, name_spec.type)
+    names = [{name_iid: f"Sensor {aid}"} for aid in aids]
+
+    def create_from_template() -> None:
+        template.create_many(aids)
+
+    def create_named_from_template() -> None:
+        template.create_many(aids, names)
+
+    print(f"{args.accessories} accessories (AccessoryInformation + TemperatureSensor)")
+    for name, function in [
+        ("specs", define_all),
+        ("instances", create_all),
+        ("template", create_from_template),
+        ("template (named)", create_named_from_template),
+    ]:
+        elapsed = measure(function)
+        print(f"{name:>16}: {elapsed / args.accessories * 1e6:8.2f} us per accessory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Bulk access to characteristic values in a ValueStore.
+
+Creates a bridge of temperature sensors, with their values kept in a
+ValueStore or in the characteristics themselves, and compares reading and
+updating all temperatures one characteristic at a time with the bulk APIs of
+the store.
+
+    python -m benchmarks.store [--sensors N] [--rounds N]
+"""
+
+import argparse
+import itertools
+import random
+import time
+from typing import Any, Callable
+
+from hap.accessories import (
+    Accessory,
+    CurrentTemperature,
+    Service,
+    TemperatureSensor,
+    ValueStore,
+)
+from hap.accessories.store import StoredCharacteristic
+from hap.backends.memory import MemoryBackend
+from hap.server import AccessoryServer
+
+
+def create_server(sensors: int, store: ValueStore | None) -> AccessoryServer:
+    server = AccessoryServer(MemoryBackend())
+    for aid in range(2, sensors + 2):
+        iids = itertools.count(1)
+        server.add_accessory(
+            Accessory(
+                aid=aid,
+                services=[
+                    Service.from_spec(
+                        TemperatureSensor(CurrentTemperature(20.0)),
+                        iids.__next__,
+                        store,
+                    )
+                ],
+            )
+        )
+    return server
+
+
+def measure(function: Callable[[], Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            function()
+        best = min(best, (time.perf_counter() - start) / rounds)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sensors", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    store = ValueStore()
+    server = create_server(args.sensors, store)
+    characteristics = [
+        accessory.services[0].characteristics[0] for accessory in server.accessories
+    ]
+    slots = [
+        characteristic.slot
+        for characteristic in characteristics
+        if isinstance(characteristic, StoredCharacteristic)
+    ]
+    readings = [[random.uniform(15, 25) for _ in slots] for _ in range(2)]
+    rounds = itertools.cycle(readings)
+
+    def read_each() -> Any:
+        return sum(characteristic.value for characteristic in characteristics)
+
+    def read_view() -> Any:
+        return sum(store.view("float"))
+
+    def write_each() -> None:
+        for characteristic, value in zip(characteristics, next(rounds)):
+            characteristic.value = value
+
+    def write_bulk() -> None:
+        store.write("float", slots, next(rounds))
+
+    print(f"{args.sensors} temperature sensors")
+    for name, function in [
+        ("read each", read_each),
+        ("read view", read_view),
+        ("write each", write_each),
+        ("write bulk", write_bulk),
+    ]:
+        print(f"{name:>12}: {measure(function, args.rounds) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
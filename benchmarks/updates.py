@@ -0,0 +1,89 @@
+"""
+Throughput of value updates.
+
+Mirrors an external system by pushing batches of brightness values to a bridge
+of lightbulbs, both through AccessoryServer.apply_updates() and by setting the
+value of each characteristic, and reports the updates per second. Half of the
+updates of each batch don't change the value. This runs outside of an event
+loop, where each value that's set is flushed right away.
+
+    python -m benchmarks.updates [--accessories N] [--batches N]
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+from hap.accessories import Brightness, Lightbulb
+from hap.backends.memory import MemoryBackend
+from hap.server import AccessoryServer, Update
+
+from .characteristics import create_accessory
+
+# Instance ID of the brightness characteristic of the benchmark accessories
+BRIGHTNESS_IID = 10
+
+
+def measure(function: Callable[[], Any], batches: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(batches):
+            function()
+        best = min(best, (time.perf_counter() - start) / batches)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accessories", type=int, default=1000)
+    parser.add_argument("--batches", type=int, default=20)
+    args = parser.parse_args()
+
+    server = AccessoryServer(MemoryBackend())
+    accessories = [create_accessory(aid) for aid in range(2, args.accessories + 2)]
+    for accessory in accessories:
+        server.add_accessory(accessory)
+    server.database.serialize()
+
+    dispatches = 0
+
+    def listener(updates: list[Update], origin: Any) -> None:
+        nonlocal dispatches
+        dispatches += 1
+
+    server.listeners.append(listener)
+
+    # Every other accessory alternates between two values
+    batches: list[list[Update]] = [
+        [
+            (accessory.aid, BRIGHTNESS_IID, value if accessory.aid % 2 else 50)
+            for accessory in accessories
+        ]
+        for value in (20, 80)
+    ]
+    rounds = iter(range(1 << 62))
+
+    def apply_updates() -> None:
+        server.apply_updates(batches[next(rounds) % 2])
+
+    def set_values() -> None:
+        for aid, _, value in batches[next(rounds) % 2]:
+            accessories[aid - 2][Lightbulb][Brightness] = value
+        server.flush_updates()
+
+    print(f"{args.accessories} updates per batch")
+    for name, function in [
+        ("apply_updates", apply_updates),
+        ("set each value", set_values),
+    ]:
+        dispatches = 0
+        elapsed = measure(function, args.batches)
+        print(
+            f"{name:>14}: {args.accessories / elapsed:10.0f} updates/s, "
+            f"{dispatches / (5 * args.batches):.0f} dispatches per batch"
+        )
+
+
+if __name__ == "__main__":
+    main()
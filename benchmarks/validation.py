@@ -0,0 +1,59 @@
+"""
+Validation of characteristic values.
+
+Validates values of a mix of formats, as written by controllers, one at a
+time through CharacteristicType.validate() and in a single call through
+validate_many().
+
+    python -m benchmarks.validation [--values N]
+"""
+
+import argparse
+import itertools
+import time
+from typing import Any, Callable
+
+from hap.accessories import Brightness, CurrentTemperature, Hue, Name, On, validate_many
+
+
+def measure(function: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--values", type=int, default=100000)
+    args = parser.parse_args()
+
+    samples: list[tuple[Any, Any]] = [
+        (On, True),
+        (Brightness, 50),
+        (Hue, 120.5),
+        (CurrentTemperature, 21.53),
+        (Name, "Lamp"),
+    ]
+    values = list(itertools.islice(itertools.cycle(samples), args.values))
+
+    def validate_each() -> None:
+        for char_type, value in values:
+            char_type.validate(value)
+
+    def validate_batch() -> None:
+        validate_many(values)
+
+    print(f"{args.values} values")
+    for name, function in [
+        ("validate", validate_each),
+        ("validate_many", validate_batch),
+    ]:
+        elapsed = measure(function)
+        print(f"{name:>14}: {elapsed / args.values * 1e9:8.1f} ns per value")
+
+
+if __name__ == "__main__":
+    main()
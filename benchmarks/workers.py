@@ -0,0 +1,109 @@
+"""
+Request throughput of multi-process serving.
+
+Serves a bridge of lightbulbs through serve_workers(), with a single worker
+process and with N of them, and reports the requests per second of requests
+answered by the workers themselves and of characteristic reads, which the
+workers forward to the state owner. The load is generated by a number of
+client processes, each keeping a few keep-alive connections busy.
+
+    python -m benchmarks.workers [--workers N] [--clients N] [--duration S]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from hap.http.workers import serve_workers
+
+from .characteristics import create_server
+from .latency import read_response
+
+REQUESTS = {
+    "worker": b"GET / HTTP/1.1\r\nHost: bench\r\n\r\n",
+    "owner": b"GET /characteristics?id=1.10 HTTP/1.1\r\nHost: bench\r\n\r\n",
+}
+CONNECTIONS = 4
+
+
+async def _load(port: int, request: bytes, duration: float) -> int:
+    deadline = time.perf_counter() + duration
+    count = 0
+
+    async def connection() -> None:
+        nonlocal count
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        while time.perf_counter() < deadline:
+            writer.write(request)
+            status_line = await read_response(reader)
+            assert status_line.startswith(b"HTTP/1.1 200 "), status_line
+            count += 1
+        writer.close()
+
+    await asyncio.gather(*(connection() for _ in range(CONNECTIONS)))
+    return count
+
+
+def load(port: int, request: bytes, duration: float) -> int:
+    """
+    Send requests over a few connections for a number of seconds, and return
+    how many were answered.
+    """
+
+    return asyncio.run(_load(port, request, duration))
+
+
+async def wait_until_listening(port: int) -> None:
+    for _ in range(200):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except ConnectionRefusedError:
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            return
+    raise RuntimeError("The workers did not start")
+
+
+async def run(workers: int, clients: int, duration: float) -> dict[str, float]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    async with serve_workers(create_server(100), workers=workers, port=port):
+        await wait_until_listening(port)
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(clients, mp_context=context) as pool:
+            for name, request in REQUESTS.items():
+                counts = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(pool, load, port, request, duration)
+                        for _ in range(clients)
+                    )
+                )
+                results[name] = sum(counts) / duration
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.clients} client processes")
+    print(f"{'workers':>7} {'worker req/s':>13} {'owner req/s':>12}")
+    for workers in sorted({1, args.workers}):
+        results = asyncio.run(run(workers, args.clients, args.duration))
+        print(f"{workers:>7} {results['worker']:>13.0f} {results['owner']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
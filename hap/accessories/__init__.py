@@ -1,4 +1,13 @@
-from .base import Accessory, Characteristic, CharacteristicType, Service, ServiceType
+from .base import (
+    Accessory,
+    BaseCharacteristic,
+    Characteristic,
+    CharacteristicType,
+    ReadProvider,
+    Service,
+    ServiceType,
+    validate_many,
+)
 from .characteristics import (
     AccessoryFlags,
     Active,
@@ -126,6 +135,7 @@ from .characteristics import (
     Volume,
     WaterLevel,
 )
+from .diff import Diff, diff_accessories
 from .services import (
     AccessoryInformation,
     AirPurifier,
@@ -168,6 +178,8 @@ from .services import (
     Window,
     WindowCovering,
 )
+from .store import ValueStore
+from .template import AccessoryTemplate
 
 __all__ = [
     "AccessoryInformation",
@@ -336,8 +348,15 @@ __all__ = [
     "Volume",
     "WaterLevel",
     "Accessory",
+    "AccessoryTemplate",
+    "BaseCharacteristic",
     "Characteristic",
     "CharacteristicType",
+    "Diff",
+    "ReadProvider",
     "Service",
     "ServiceType",
+    "ValueStore",
+    "diff_accessories",
+    "validate_many",
 ]
@@ -1,14 +1,34 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import math
+import sys
 from enum import Enum
-from typing import Any, Callable, Generic, Iterable, TypeVar
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Generic, Iterable, TypeVar
 from uuid import UUID
 
 from typing_extensions import NamedTuple
 
+if TYPE_CHECKING:
+    from .store import ValueStore
+
 T = TypeVar("T")
 Number = int | float
 
+# Bounds of the integer formats
+INTEGER_RANGES = {
+    "uint8": (0, 2**8 - 1),
+    "uint16": (0, 2**16 - 1),
+    "uint32": (0, 2**32 - 1),
+    "uint64": (0, 2**64 - 1),
+    "int32": (-(2**31), 2**31 - 1),
+    "int": (-(2**31), 2**31 - 1),
+}
+
+# Default maximum length of string values
+MAX_LENGTH = 64
+
 
 # Service and characteristic type definitions
 #
@@ -61,9 +81,52 @@ class CharacteristicType(NamedTuple, Generic[T]):
     ) -> CharacteristicSpec[T]:
         """
         Define a characteristic spec. The returned spec is immutable and can be reused.
+        Identical specs are interned, so they're only allocated once.
         """
 
-        return CharacteristicSpec(self, initial_value, event_notifications_enabled)
+        # The type of the value is part of the key, as e.g. 1 == True
+        key = (
+            id(self),
+            type(initial_value),
+            initial_value,
+            event_notifications_enabled,
+        )
+        try:
+            spec = _lookup(_characteristic_specs, _new_characteristic_specs, key)
+        except TypeError:
+            # Unhashable values aren't interned
+            return CharacteristicSpec(self, initial_value, event_notifications_enabled)
+        if spec is None:
+            spec = _intern(
+                _new_characteristic_specs,
+                key,
+                CharacteristicSpec(self, initial_value, event_notifications_enabled),
+                MAX_NEW,
+            )
+        return spec
+
+    def validate(self, value: Any) -> T:
+        """
+        Validate a value written by a controller, and convert it to the type
+        used for this characteristic. Raises ValueError for invalid values.
+
+        Integers are rounded to the nearest step of min_step.
+        """
+
+        if (validators := _validators.get(id(self))) is None:
+            validators = _get_validators(self)
+        return validators[0](value)  # type: ignore[no-any-return]
+
+    def coerce(self, value: Any) -> T:
+        """
+        Validate a value set by the accessory itself. This is the same as
+        validate(), except binary values are given as bytes rather than base64
+        encoded.
+        """
+
+        if (validators := _validators.get(id(self))) is None:
+            validators = _get_validators(self)
+        return validators[1](value)  # type: ignore[no-any-return]
 
 
 class ServiceType(NamedTuple):
@@ -93,28 +156,51 @@ class ServiceType(NamedTuple):
     ) -> ServiceSpec:
         """
         Define a service spec. The returned spec is immutable and can be reused.
+        Identical specs are interned, so they're only allocated once.
         """
 
-        characteristics = tuple(characteristics)
-        char_types = {char.type for char in characteristics}
+        key = (id(self), tuple(map(id, characteristics)), primary, hidden)
+        if (spec := _lookup(_service_specs, _new_service_specs, key)) is not None:
+            return spec
+
+        char_types = frozenset(char.type for char in characteristics)
+        checked_key = (id(self), frozenset(map(id, char_types)))
+        if checked_key not in _checked_types:
+            self._check_characteristics(char_types)
+            _intern(_checked_types, checked_key, (self, char_types))
+
+        return _intern(
+            _new_service_specs,
+            key,
+            ServiceSpec(self, characteristics, primary, hidden),
+            MAX_NEW,
+        )
+
+    def _check_characteristics(
+        self, char_types: frozenset[CharacteristicType[Any]]
+    ) -> None:
+        if (type_sets := _type_sets.get(id(self))) is None:
+            type_sets = _intern(
+                _type_sets,
+                id(self),
+                (
+                    self,
+                    frozenset(self.required_characteristics),
+                    frozenset(
+                        self.required_characteristics + self.optional_characteristics
+                    ),
+                ),
+            )
+        _, required, allowed = type_sets
 
-        if unsupported_char_types := {
-            char_type
-            for char_type in char_types
-            if char_type not in self.required_characteristics
-            and char_type not in self.optional_characteristics
-        }:
+        if unsupported_char_types := char_types - allowed:
             names = ", ".join(
                 char_type.description or str(char_type.uuid)
                 for char_type in unsupported_char_types
             )
             raise ValueError(f'Unsupported characteristics for "{self.name}": {names}')
 
-        if missing_char_types := {
-            char_type
-            for char_type in self.required_characteristics
-            if char_type not in char_types
-        }:
+        if missing_char_types := required - char_types:
             names = ", ".join(
                 char_type.description or str(char_type.uuid)
                 for char_type in missing_char_types
@@ -123,8 +209,6 @@ class ServiceType(NamedTuple):
                 f'Missing requred characteristics for "{self.name}": {names}'
             )
 
-        return ServiceSpec(self, characteristics, primary, hidden)
-
 
 # Specs
 #
@@ -134,6 +218,25 @@ class ServiceType(NamedTuple):
 # types.
 
 
+class ReadProvider(NamedTuple):
+    """
+    An async source of the value of a characteristic, e.g. a bridged device.
+
+    Values are considered fresh for max_age seconds after they're read, and
+    are served without calling the handler. After that, the stale value is
+    still served for up to stale_while_revalidate seconds while it's being
+    refreshed in the background.
+
+    A read that takes longer than timeout seconds is reported as unable to
+    communicate, even if the deadline of the request is further away.
+    """
+
+    handler: Callable[[], Awaitable[Any]]
+    max_age: float = 0.0
+    stale_while_revalidate: float = math.inf
+    timeout: float | None = None
+
+
 class CharacteristicSpec(NamedTuple, Generic[T]):
     type: CharacteristicType[T]
     initial_value: T | None
@@ -153,67 +256,192 @@ class ServiceSpec(NamedTuple):
 # and service, that is stateful instances connected to a specific accessory.
 
 
-class Characteristic(Generic[T]):
+class CharacteristicExtras:
+    """
+    State of a characteristic that's rarely used, and only allocated once any
+    of it is set.
+    """
+
+    __slots__ = ("write_handler", "write_timeout", "provider")
+
+    def __init__(self) -> None:
+        self.write_handler: Callable[[Any], Awaitable[None]] | None = None
+        self.write_timeout: float | None = None
+        self.provider: ReadProvider | None = None
+
+
+class BaseCharacteristic(Generic[T]):
     """
     An instance of a characteristics, bound to a service.
 
-    You typically don't use this directly, but rather instantiate it from one
-    of Apple's pre-defined characteristics.
+    Bridges can have many thousands of characteristics, so instances are kept
+    small: everything describing the characteristic is in its shared type, and
+    rarely used state is kept in a separate CharacteristicExtras. Where the
+    value is kept is up to the subclasses, see Characteristic and
+    StoredCharacteristic.
     """
 
+    __slots__ = (
+        "iid",
+        "type",
+        "event_notifications_enabled",
+        "_on_update",
+        "_extras",
+    )
+
     def __init__(
         self,
         iid: int,
         type: CharacteristicType[T],
         event_notifications_enabled: bool,
-        initial_value: T | None,
     ) -> None:
         self.iid = iid
         self.type = type
         self.event_notifications_enabled = event_notifications_enabled
-        self._value: T | None = initial_value
-        self._ttl: int | None = None
-        self._pid: int | None = None
 
-    @classmethod
-    def from_spec(
-        cls,
-        spec: CharacteristicSpec[Any],
-        get_instance_id: Callable[[], int],
-    ) -> Characteristic[Any]:
-        return Characteristic(
-            iid=get_instance_id(),
-            type=spec.type,
-            event_notifications_enabled=spec.event_notifications_enabled,
-            initial_value=spec.initial_value,
-        )
+        # Called whenever the value is set, once bound to an accessory server
+        self._on_update: Callable[[BaseCharacteristic[Any]], None] | None = None
+
+        self._extras: CharacteristicExtras | None = None
 
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__qualname__} "
             f"iid={self.iid} type={self.type.uuid} "
             f"event_notifications_enabled={self.event_notifications_enabled} "
-            f"value={self._value} ttl={self._ttl} pid={self._pid}>"
+            f"value={self.value}>"
         )
 
     def __eq__(self, other: Any) -> bool:
-        if not isinstance(other, Characteristic):
+        if not isinstance(other, BaseCharacteristic):
             return NotImplemented
         return (
             other.iid == self.iid
             and other.type == self.type
             and other.event_notifications_enabled == self.event_notifications_enabled
-            and other._value == self._value
-            and other._ttl == self._ttl
-            and other._pid == self._pid
+            and other.value == self.value
+        )
+
+    @property
+    def value(self) -> T | None:
+        raise NotImplementedError
+
+    @value.setter
+    def value(self, value: T) -> None:
+        raise NotImplementedError
+
+    def _set_value(self, value: T) -> None:
+        # Set a value that's already been coerced, without notifying anyone
+        raise NotImplementedError
+
+    @property
+    def write_handler(self) -> Callable[[T], Awaitable[None]] | None:
+        """
+        Called with the new value when a controller writes the characteristic,
+        before the value is updated. A write fails if the handler raises an
+        exception.
+        """
+
+        return self._extras.write_handler if self._extras is not None else None
+
+    @write_handler.setter
+    def write_handler(self, handler: Callable[[T], Awaitable[None]] | None) -> None:
+        self._get_extras().write_handler = handler
+
+    @property
+    def write_timeout(self) -> float | None:
+        """
+        How many seconds the write handler may take, after which the write
+        fails, even if the deadline of the request is further away.
+        """
+
+        return self._extras.write_timeout if self._extras is not None else None
+
+    @write_timeout.setter
+    def write_timeout(self, timeout: float | None) -> None:
+        self._get_extras().write_timeout = timeout
+
+    @property
+    def provider(self) -> ReadProvider | None:
+        """
+        Where the value is read from, if it isn't simply set.
+        """
+
+        return self._extras.provider if self._extras is not None else None
+
+    @provider.setter
+    def provider(self, provider: ReadProvider | None) -> None:
+        self._get_extras().provider = provider
+
+    def _get_extras(self) -> CharacteristicExtras:
+        if self._extras is None:
+            self._extras = CharacteristicExtras()
+        return self._extras
+
+
+class Characteristic(BaseCharacteristic[T]):
+    """
+    A characteristic that holds its own value.
+
+    You typically don't use this directly, but rather instantiate it from one
+    of Apple's pre-defined characteristics.
+    """
+
+    __slots__ = ("_value",)
+
+    def __init__(
+        self,
+        iid: int,
+        type: CharacteristicType[T],
+        event_notifications_enabled: bool,
+        initial_value: T | None,
+    ) -> None:
+        super().__init__(iid, type, event_notifications_enabled)
+        self._value: T | None = initial_value
+
+    @classmethod
+    def from_spec(
+        cls,
+        spec: CharacteristicSpec[Any],
+        get_instance_id: Callable[[], int],
+    ) -> Characteristic[Any]:
+        return Characteristic(
+            iid=get_instance_id(),
+            type=spec.type,
+            event_notifications_enabled=spec.event_notifications_enabled,
+            initial_value=spec.initial_value,
         )
 
+    @classmethod
+    def _create(
+        cls,
+        iid: int,
+        type: CharacteristicType[Any],
+        event_notifications_enabled: bool,
+        value: Any,
+    ) -> Characteristic[Any]:
+        # Like the constructor, without its overhead, for templates creating
+        # many characteristics. Sets every slot the constructors do.
+        characteristic: Characteristic[Any] = cls.__new__(cls)
+        characteristic.iid = iid
+        characteristic.type = type
+        characteristic.event_notifications_enabled = event_notifications_enabled
+        characteristic._on_update = None
+        characteristic._extras = None
+        characteristic._value = value
+        return characteristic
+
     @property
     def value(self) -> T | None:
         return self._value
 
     @value.setter
     def value(self, value: T) -> None:
+        self._value = self.type.coerce(value) if value is not None else None
+        if self._on_update is not None:
+            self._on_update(self)
+
+    def _set_value(self, value: T) -> None:
         self._value = value
 
 
@@ -224,35 +452,76 @@ class Service:
 
     # TODO: Support linked services
 
+    __slots__ = ("iid", "type", "characteristics", "hidden", "primary", "_index")
+
     def __init__(
         self,
         iid: int,
         type: ServiceType,
-        characteristics: Iterable[Characteristic[Any]],
+        characteristics: Iterable[BaseCharacteristic[Any]],
         primary: bool,
         hidden: bool,
     ) -> None:
         self.iid = iid
         self.type = type
-        self.characteristics: tuple[Characteristic[Any], ...] = tuple(characteristics)
+        self.characteristics: tuple[BaseCharacteristic[Any], ...] = tuple(
+            characteristics
+        )
         self.hidden = hidden
         self.primary = primary
 
+        # Positions of the first characteristic of each type, by the type's
+        # UUID, shared by all services with the same layout
+        self._index = _layout_index(
+            tuple(char.type.uuid.int for char in self.characteristics)
+        )
+
     @classmethod
     def from_spec(
-        cls, spec: ServiceSpec, get_instance_id: Callable[[], int]
+        cls,
+        spec: ServiceSpec,
+        get_instance_id: Callable[[], int],
+        store: ValueStore | None = None,
     ) -> Service:
+        """
+        Create a service from a spec. If a value store is given, the values
+        of numeric characteristics are kept in the store.
+        """
+
+        create = store.create if store is not None else Characteristic.from_spec
         return Service(
             iid=get_instance_id(),
             type=spec.type,
             primary=spec.primary,
             hidden=spec.hidden,
             characteristics=(
-                Characteristic.from_spec(characteristic_spec, get_instance_id)
+                create(characteristic_spec, get_instance_id)
                 for characteristic_spec in spec.characteristics
             ),
         )
 
+    @classmethod
+    def _create(
+        cls,
+        iid: int,
+        type: ServiceType,
+        characteristics: tuple[BaseCharacteristic[Any], ...],
+        primary: bool,
+        hidden: bool,
+        index: dict[int, int],
+    ) -> Service:
+        # Like the constructor, but with the index of the layout of the
+        # characteristics already looked up, for templates. Sets every slot
+        # the constructor does.
+        service = cls.__new__(cls)
+        service.iid = iid
+        service.type = type
+        service.characteristics = characteristics
+        service.hidden = hidden
+        service.primary = primary
+        service._index = index
+        return service
+
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__qualname__} "
@@ -272,15 +541,18 @@ class Service:
             and other.primary == self.primary
         )
 
-    def __getitem__(self, key: CharacteristicType[T]) -> Characteristic[T]:
-        if char := next(
-            (char for char in self.characteristics if char.type == key), None
-        ):
+    def __getitem__(self, key: CharacteristicType[T]) -> BaseCharacteristic[T]:
+        position = self._index.get(key.uuid.int)
+        char = self.characteristics[position] if position is not None else None
+        if char is not None and char.type is not key and char.type != key:
+            # Another type with the same UUID, which is rare enough to scan for
+            char = next((c for c in self.characteristics if c.type == key), None)
+        if char is not None:
             return char
         raise KeyError(f'Service as no "{key}" characteristic')
 
     def __setitem__(self, key: CharacteristicType[T], value: T) -> None:
-        characteristic: Characteristic[T] = self[key]
+        characteristic: BaseCharacteristic[T] = self[key]
         characteristic.value = value
 
 
@@ -290,10 +562,31 @@ class Accessory:
     to the accessory server.
     """
 
+    __slots__ = ("aid", "services", "_index")
+
     def __init__(self, aid: int, services: Iterable[Service]) -> None:
         self.aid = aid
         self.services: tuple[Service, ...] = tuple(services)
 
+        # Positions of the first service of each type, by the type's UUID,
+        # shared by all accessories with the same layout
+        self._index = _layout_index(
+            tuple(service.type.uuid.int for service in self.services)
+        )
+
+    @classmethod
+    def _create(
+        cls, aid: int, services: tuple[Service, ...], index: dict[int, int]
+    ) -> Accessory:
+        # Like the constructor, but with the index of the layout of the
+        # services already looked up, for templates. Sets every slot the
+        # constructor does.
+        accessory = cls.__new__(cls)
+        accessory.aid = aid
+        accessory.services = services
+        accessory._index = index
+        return accessory
+
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__qualname__} aid={self.aid} services={self.services}>"
@@ -305,8 +598,263 @@ class Accessory:
         return other.aid == self.aid and other.services == self.services
 
     def __getitem__(self, key: ServiceType) -> Service:
-        if service := next(
-            (service for service in self.services if service.type == key), None
-        ):
+        position = self._index.get(key.uuid.int)
+        service = self.services[position] if position is not None else None
+        if service is not None and service.type is not key and service.type != key:
+            # Another type with the same UUID, which is rare enough to scan for
+            service = next((s for s in self.services if s.type == key), None)
+        if service is not None:
             return service
         raise KeyError(f'Accessory as no "{key}" service')
+
+
+# Type indexes by layout, that is the UUIDs of the types of the characteristics
+# of a service or of the services of an accessory
+_layouts: dict[tuple[int, ...], dict[int, int]] = {}
+
+
+def _layout_index(layout: tuple[int, ...]) -> dict[int, int]:
+    if (index := _layouts.get(layout)) is None:
+        index = _layouts[layout] = {}
+        for position, uuid in enumerate(layout):
+            index.setdefault(uuid, position)
+    return index
+
+
+# Interning
+#
+# Fleets of identical accessories are defined from identical specs, which are
+# only allocated and checked once. The caches are keyed by the ids of the types
+# and specs involved, which the cached values keep alive so that the ids aren't
+# reused, and are bounded so that unique specs don't make them grow forever.
+#
+# Specs start out in a small cache of new specs, and are only interned for good
+# once they're defined again. Specs unique to one accessory, like its name and
+# serial number, so don't take the place of shared ones, and the least recently
+# used specs are evicted first.
+
+MAX_INTERNED = 4096
+MAX_NEW = 256
+
+_characteristic_specs: dict[tuple[int, type, Any, bool], CharacteristicSpec[Any]] = {}
+_new_characteristic_specs: dict[
+    tuple[int, type, Any, bool], CharacteristicSpec[Any]
+] = {}
+_service_specs: dict[tuple[int, tuple[int, ...], bool, bool], ServiceSpec] = {}
+_new_service_specs: dict[tuple[int, tuple[int, ...], bool, bool], ServiceSpec] = {}
+
+# Sets of characteristic types that were checked against a service type
+_checked_types: dict[
+    tuple[int, frozenset[int]],
+    tuple[ServiceType, frozenset[CharacteristicType[Any]]],
+] = {}
+
+# The required and all allowed characteristic types of service types
+_type_sets: dict[
+    int,
+    tuple[
+        ServiceType,
+        frozenset[CharacteristicType[Any]],
+        frozenset[CharacteristicType[Any]],
+    ],
+] = {}
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def _intern(cache: dict[K, V], key: K, value: V, limit: int = MAX_INTERNED) -> V:
+    if len(cache) >= limit:
+        # Evict the oldest entry
+        del cache[next(iter(cache))]
+    cache[key] = value
+    return value
+
+
+def _lookup(interned: dict[K, V], new: dict[K, V], key: K) -> V | None:
+    """
+    Look up an interned spec, moving it to the end of its cache as the most
+    recently used. A new spec that's found is interned for good.
+    """
+
+    if (value := interned.get(key)) is not None:
+        del interned[key]
+    elif (value := new.get(key)) is not None:
+        del new[key]
+    else:
+        return None
+    return _intern(interned, key, value)
+
+
+# Validators
+#
+# Validating a value against its type is on the path of every write, so each
+# characteristic type gets a validator and a coercer compiled on first use,
+# which only check what applies to the type.
+
+Validator = Callable[[Any], Any]
+
+# Compiled validator and coercer by the id of their type, cached like the
+# interned specs above
+_validators: dict[int, tuple[Validator, Validator, CharacteristicType[Any]]] = {}
+
+
+def _get_validators(
+    char_type: CharacteristicType[Any],
+) -> tuple[Validator, Validator, CharacteristicType[Any]]:
+    if (validators := _validators.get(id(char_type))) is None:
+        validators = _intern(
+            _validators,
+            id(char_type),
+            (_compile(char_type, False), _compile(char_type, True), char_type),
+        )
+    return validators
+
+
+def validate_many(
+    values: Iterable[tuple[CharacteristicType[Any], Any]], coerce: bool = False
+) -> list[Any]:
+    """
+    Validate a number of values, each along with its type, in a single call.
+    Invalid values don't raise, but their ValueError is returned in place of
+    the value, so one invalid value doesn't fail the others.
+
+    Values are coerced as set by the accessory itself if coerce is true, and
+    validated as written by a controller otherwise.
+    """
+
+    results: list[Any] = []
+    append = results.append
+    validators: dict[int, Validator] = {}
+    for char_type, value in values:
+        if (validator := validators.get(id(char_type))) is None:
+            compiled = _get_validators(char_type)
+            validator = validators[id(char_type)] = (
+                compiled[1] if coerce else compiled[0]
+            )
+        try:
+            append(validator(value))
+        except ValueError as e:
+            append(e)
+    return results
+
+
+def _compile(char_type: CharacteristicType[Any], coerce: bool) -> Validator:
+    """
+    Compile a validator for a type, converting values as validate() does, or
+    as coerce() does if coerce is true.
+    """
+
+    def invalid(value: Any) -> ValueError:
+        return ValueError(f"Invalid value for {char_type}: {value!r}")
+
+    def out_of_range(value: Any) -> ValueError:
+        return ValueError(f"Value out of range for {char_type}: {value!r}")
+
+    format = char_type.format
+    valid = (
+        frozenset(char_type.valid_values)
+        if char_type.valid_values is not None
+        else None
+    )
+
+    # All bounds of a number are checked at once. Floats are bounded by the
+    # largest finite float, which also rules out infinity and NaN.
+    low, high = INTEGER_RANGES.get(format, (-sys.float_info.max, sys.float_info.max))
+    if char_type.min_value is not None:
+        low = max(low, char_type.min_value)
+    if char_type.max_value is not None:
+        high = min(high, char_type.max_value)
+    if char_type.valid_values_range is not None:
+        low = max(low, char_type.valid_values_range[0])
+        high = min(high, char_type.valid_values_range[1])
+
+    validate: Validator
+
+    if format == "bool":
+
+        def validate(value: Any) -> Any:
+            if value is True or value is False:
+                result = value
+            elif type(value) is int and (value == 0 or value == 1):
+                result = value == 1
+            else:
+                raise invalid(value)
+            if valid is not None and result not in valid:
+                raise invalid(value)
+            return result
+
+    elif format in INTEGER_RANGES:
+        # Values are rounded to the nearest step, counted from the minimum
+        step = char_type.min_step
+        start = char_type.min_value or 0
+        if step == 1 and isinstance(start, int):
+            # Every integer is a step
+            step = None
+
+        def validate(value: Any) -> Any:
+            if type(value) is not int and (
+                not isinstance(value, int) or isinstance(value, bool)
+            ):
+                raise invalid(value)
+            if step:
+                result = int(start + round((value - start) / step) * step)
+            else:
+                result = value
+            if not low <= result <= high:
+                raise out_of_range(value)
+            if valid is not None and result not in valid:
+                raise invalid(value)
+            return result
+
+    elif format == "float":
+
+        def validate(value: Any) -> Any:
+            if (
+                type(value) is not float
+                and type(value) is not int
+                and (not isinstance(value, (int, float)) or isinstance(value, bool))
+            ):
+                raise invalid(value)
+            if not low <= value <= high:
+                raise out_of_range(value)
+            if valid is not None and value not in valid:
+                raise invalid(value)
+            return value
+
+    elif format == "string":
+        max_length = char_type.max_length or MAX_LENGTH
+
+        def validate(value: Any) -> Any:
+            if type(value) is not str and not isinstance(value, str):
+                raise invalid(value)
+            if len(value) > max_length:
+                raise ValueError(f"Value too long for {char_type}")
+            if valid is not None and value not in valid:
+                raise invalid(value)
+            return value
+
+    elif format in ("data", "tlv8"):
+        max_data_length = char_type.max_data_length
+
+        def validate(value: Any) -> Any:
+            if coerce:
+                if not isinstance(value, (bytes, bytearray, memoryview)):
+                    raise invalid(value)
+                result = bytes(value)
+            else:
+                # Binary values are base64 encoded in JSON
+                try:
+                    result = base64.b64decode(value, validate=True)
+                except (TypeError, binascii.Error):
+                    raise invalid(value) from None
+            if max_data_length and len(result) > max_data_length:
+                raise ValueError(f"Value too long for {char_type}")
+            return result
+
+    else:
+
+        def validate(value: Any) -> Any:
+            raise ValueError(f"Unsupported format for {char_type}: {format}")
+
+    return validate
@@ -6,26 +6,26 @@ AccessoryFlags = CharacteristicType[int](
     UUID("000000A6-0000-1000-8000-0026BB765291"),
     description="Accessory Flags",
     format="uint32",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
 )
 Active = CharacteristicType[int](
     UUID("000000B0-0000-1000-8000-0026BB765291"),
     description="Active",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 AdministratorOnlyAccess = CharacteristicType[bool](
     UUID("00000001-0000-1000-8000-0026BB765291"),
     description="Administrator Only Access",
     format="bool",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
 )
 AirParticulateDensity = CharacteristicType[float](
     UUID("00000064-0000-1000-8000-0026BB765291"),
     description="Air Particulate Density",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=1000,
     min_step=1,
@@ -34,27 +34,27 @@ AirParticulateSize = CharacteristicType[int](
     UUID("00000065-0000-1000-8000-0026BB765291"),
     description="Air Particulate Size",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 AirQuality = CharacteristicType[int](
     UUID("00000095-0000-1000-8000-0026BB765291"),
     description="Air Quality",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3, 4, 5),
 )
 AudioFeedback = CharacteristicType[bool](
     UUID("00000005-0000-1000-8000-0026BB765291"),
     description="Audio Feedback",
     format="bool",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
 )
 BatteryLevel = CharacteristicType[int](
     UUID("00000068-0000-1000-8000-0026BB765291"),
     description="Battery Level",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -64,7 +64,7 @@ Brightness = CharacteristicType[int](
     UUID("00000008-0000-1000-8000-0026BB765291"),
     description="Brightness",
     format="int32",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -74,14 +74,14 @@ CarbonDioxideDetected = CharacteristicType[int](
     UUID("00000092-0000-1000-8000-0026BB765291"),
     description="Carbon Dioxide Detected",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 CarbonDioxideLevel = CharacteristicType[float](
     UUID("00000093-0000-1000-8000-0026BB765291"),
     description="Carbon Dioxide Level",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=100000,
 )
@@ -89,7 +89,7 @@ CarbonDioxidePeakLevel = CharacteristicType[float](
     UUID("00000094-0000-1000-8000-0026BB765291"),
     description="Carbon Dioxide Peak Level",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=100000,
 )
@@ -97,14 +97,14 @@ CarbonMonoxideDetected = CharacteristicType[int](
     UUID("00000069-0000-1000-8000-0026BB765291"),
     description="Carbon Monoxide Detected",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 CarbonMonoxideLevel = CharacteristicType[float](
     UUID("00000090-0000-1000-8000-0026BB765291"),
     description="Carbon Monoxide Level",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=100,
 )
@@ -112,7 +112,7 @@ CarbonMonoxidePeakLevel = CharacteristicType[float](
     UUID("00000091-0000-1000-8000-0026BB765291"),
     description="Carbon Monoxide Peak Level",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=100,
 )
@@ -120,14 +120,14 @@ ChargingState = CharacteristicType[int](
     UUID("0000008F-0000-1000-8000-0026BB765291"),
     description="Charging State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 ColorTemperature = CharacteristicType[int](
     UUID("000000CE-0000-1000-8000-0026BB765291"),
     description="Color Temperature",
     format="uint32",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     min_value=140,
     max_value=500,
     min_step=1,
@@ -136,14 +136,14 @@ ContactSensorState = CharacteristicType[int](
     UUID("0000006A-0000-1000-8000-0026BB765291"),
     description="Contact Sensor State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 CoolingThresholdTemperature = CharacteristicType[float](
     UUID("0000000D-0000-1000-8000-0026BB765291"),
     description="Cooling Threshold Temperature",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="celsius",
     min_value=10,
     max_value=35,
@@ -153,14 +153,14 @@ CurrentAirPurifierState = CharacteristicType[int](
     UUID("000000A9-0000-1000-8000-0026BB765291"),
     description="Current Air Purifier State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 CurrentAmbientLightLevel = CharacteristicType[float](
     UUID("0000006B-0000-1000-8000-0026BB765291"),
     description="Current Ambient Light Level",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     unit="lux",
     min_value=0.0001,
     max_value=100000,
@@ -169,35 +169,35 @@ CurrentDoorState = CharacteristicType[int](
     UUID("0000000E-0000-1000-8000-0026BB765291"),
     description="Current Door State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3, 4),
 )
 CurrentFanState = CharacteristicType[int](
     UUID("000000AF-0000-1000-8000-0026BB765291"),
     description="Current Fan State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 CurrentHeaterCoolerState = CharacteristicType[int](
     UUID("000000B1-0000-1000-8000-0026BB765291"),
     description="Current Heater Cooler State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3),
 )
 CurrentHeatingCoolingState = CharacteristicType[int](
     UUID("0000000F-0000-1000-8000-0026BB765291"),
     description="Current Heating Cooling State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 CurrentHorizontalTiltAngle = CharacteristicType[int](
     UUID("0000006C-0000-1000-8000-0026BB765291"),
     description="Current Horizontal Tilt Angle",
     format="int32",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     unit="arcdegrees",
     min_value=-90,
     max_value=90,
@@ -207,14 +207,14 @@ CurrentHumidifierDehumidifierState = CharacteristicType[int](
     UUID("000000B3-0000-1000-8000-0026BB765291"),
     description="Current Humidifier Dehumidifier State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3),
 )
 CurrentPosition = CharacteristicType[int](
     UUID("0000006D-0000-1000-8000-0026BB765291"),
     description="Current Position",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -224,7 +224,7 @@ CurrentRelativeHumidity = CharacteristicType[float](
     UUID("00000010-0000-1000-8000-0026BB765291"),
     description="Current Relative Humidity",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -234,14 +234,14 @@ CurrentSlatState = CharacteristicType[int](
     UUID("000000AA-0000-1000-8000-0026BB765291"),
     description="Current Slat State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 CurrentTemperature = CharacteristicType[float](
     UUID("00000011-0000-1000-8000-0026BB765291"),
     description="Current Temperature",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     unit="celsius",
     min_value=0,
     max_value=100,
@@ -251,7 +251,7 @@ CurrentTiltAngle = CharacteristicType[int](
     UUID("000000C1-0000-1000-8000-0026BB765291"),
     description="Current Tilt Angle",
     format="int32",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     unit="arcdegrees",
     min_value=-90,
     max_value=90,
@@ -261,7 +261,7 @@ CurrentVerticalTiltAngle = CharacteristicType[int](
     UUID("0000006E-0000-1000-8000-0026BB765291"),
     description="Current Vertical Tilt Angle",
     format="int32",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     unit="arcdegrees",
     min_value=-90,
     max_value=90,
@@ -271,20 +271,20 @@ DigitalZoom = CharacteristicType[float](
     UUID("0000011D-0000-1000-8000-0026BB765291"),
     description="Digital Zoom",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
 )
 FilterChangeIndication = CharacteristicType[int](
     UUID("000000AC-0000-1000-8000-0026BB765291"),
     description="Filter Change Indication",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 FilterLifeLevel = CharacteristicType[float](
     UUID("000000AB-0000-1000-8000-0026BB765291"),
     description="Filter Life Level",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=100,
 )
@@ -304,7 +304,7 @@ HeatingThresholdTemperature = CharacteristicType[float](
     UUID("00000012-0000-1000-8000-0026BB765291"),
     description="Heating Threshold Temperature",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="celsius",
     min_value=0,
     max_value=25,
@@ -320,7 +320,7 @@ Hue = CharacteristicType[float](
     UUID("00000013-0000-1000-8000-0026BB765291"),
     description="Hue",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="arcdegrees",
     min_value=0,
     max_value=360,
@@ -336,13 +336,13 @@ ImageMirroring = CharacteristicType[bool](
     UUID("0000011F-0000-1000-8000-0026BB765291"),
     description="Image Mirroring",
     format="bool",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
 )
 ImageRotation = CharacteristicType[float](
     UUID("0000011E-0000-1000-8000-0026BB765291"),
     description="Image Rotation",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="arcdegrees",
     min_value=0,
     max_value=270,
@@ -352,21 +352,21 @@ InUse = CharacteristicType[int](
     UUID("000000D2-0000-1000-8000-0026BB765291"),
     description="In Use",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 IsConfigured = CharacteristicType[int](
     UUID("000000D6-0000-1000-8000-0026BB765291"),
     description="Is Configured",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 LeakDetected = CharacteristicType[int](
     UUID("00000070-0000-1000-8000-0026BB765291"),
     description="Leak Detected",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 LockControlPoint = CharacteristicType[bytes](
@@ -379,42 +379,42 @@ LockCurrentState = CharacteristicType[int](
     UUID("0000001D-0000-1000-8000-0026BB765291"),
     description="Lock Current State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3),
 )
 LockLastKnownAction = CharacteristicType[int](
     UUID("0000001C-0000-1000-8000-0026BB765291"),
     description="Lock Last Known Action",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3, 4, 5, 6, 7, 8),
 )
 LockManagementAutoSecurityTimeout = CharacteristicType[int](
     UUID("0000001A-0000-1000-8000-0026BB765291"),
     description="Lock Management Auto Security Timeout",
     format="uint32",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="seconds",
 )
 LockPhysicalControls = CharacteristicType[int](
     UUID("000000A7-0000-1000-8000-0026BB765291"),
     description="Lock Physical Controls",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 LockTargetState = CharacteristicType[int](
     UUID("0000001E-0000-1000-8000-0026BB765291"),
     description="Lock Target State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 Logs = CharacteristicType[bytes](
     UUID("0000001F-0000-1000-8000-0026BB765291"),
     description="Logs",
     format="tlv8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
 )
 Manufacturer = CharacteristicType[str](
     UUID("00000020-0000-1000-8000-0026BB765291"),
@@ -432,13 +432,13 @@ MotionDetected = CharacteristicType[bool](
     UUID("00000022-0000-1000-8000-0026BB765291"),
     description="Motion Detected",
     format="bool",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
 )
 Mute = CharacteristicType[bool](
     UUID("0000011A-0000-1000-8000-0026BB765291"),
     description="Mute",
     format="bool",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
 )
 Name = CharacteristicType[str](
     UUID("00000023-0000-1000-8000-0026BB765291"),
@@ -450,13 +450,13 @@ NightVision = CharacteristicType[bool](
     UUID("0000011B-0000-1000-8000-0026BB765291"),
     description="Night Vision",
     format="bool",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
 )
 NitrogenDioxideDensity = CharacteristicType[float](
     UUID("000000C4-0000-1000-8000-0026BB765291"),
     description="Nitrogen Dioxide Density",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=1000,
     min_step=1,
@@ -465,38 +465,38 @@ ObstructionDetected = CharacteristicType[bool](
     UUID("00000024-0000-1000-8000-0026BB765291"),
     description="Obstruction Detected",
     format="bool",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
 )
 OccupancyDetected = CharacteristicType[int](
     UUID("00000071-0000-1000-8000-0026BB765291"),
     description="Occupancy Detected",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 On = CharacteristicType[bool](
     UUID("00000025-0000-1000-8000-0026BB765291"),
     description="On",
     format="bool",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
 )
 OpticalZoom = CharacteristicType[float](
     UUID("0000011C-0000-1000-8000-0026BB765291"),
     description="Optical Zoom",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
 )
 OutletInUse = CharacteristicType[bool](
     UUID("00000026-0000-1000-8000-0026BB765291"),
     description="Outlet In Use",
     format="bool",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
 )
 OzoneDensity = CharacteristicType[float](
     UUID("000000C3-0000-1000-8000-0026BB765291"),
     description="Ozone Density",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=1000,
     min_step=1,
@@ -529,7 +529,7 @@ Pm10Density = CharacteristicType[float](
     UUID("000000C7-0000-1000-8000-0026BB765291"),
     description="PM10 Density",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=1000,
     min_step=1,
@@ -538,7 +538,7 @@ Pm2_5Density = CharacteristicType[float](
     UUID("000000C6-0000-1000-8000-0026BB765291"),
     description="PM2.5 Density",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=1000,
     min_step=1,
@@ -547,28 +547,28 @@ PositionState = CharacteristicType[int](
     UUID("00000072-0000-1000-8000-0026BB765291"),
     description="Position State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 ProgramMode = CharacteristicType[int](
     UUID("000000D1-0000-1000-8000-0026BB765291"),
     description="Program Mode",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 ProgrammableSwitchEvent = CharacteristicType[int](
     UUID("00000073-0000-1000-8000-0026BB765291"),
     description="Programmable Switch Event",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 RelativeHumidityDehumidifierThreshold = CharacteristicType[float](
     UUID("000000C9-0000-1000-8000-0026BB765291"),
     description="Relative Humidity Dehumidifier Threshold",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -578,7 +578,7 @@ RelativeHumidityHumidifierThreshold = CharacteristicType[float](
     UUID("000000CA-0000-1000-8000-0026BB765291"),
     description="Relative Humidity Humidifier Threshold",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -588,7 +588,7 @@ RemainingDuration = CharacteristicType[int](
     UUID("000000D4-0000-1000-8000-0026BB765291"),
     description="Remaining Duration",
     format="uint32",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=3600,
     min_step=1,
@@ -606,14 +606,14 @@ RotationDirection = CharacteristicType[int](
     UUID("00000028-0000-1000-8000-0026BB765291"),
     description="Rotation Direction",
     format="int32",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 RotationSpeed = CharacteristicType[float](
     UUID("00000029-0000-1000-8000-0026BB765291"),
     description="Rotation Speed",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -623,7 +623,7 @@ Saturation = CharacteristicType[float](
     UUID("0000002F-0000-1000-8000-0026BB765291"),
     description="Saturation",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -633,7 +633,7 @@ SecuritySystemAlarmType = CharacteristicType[int](
     UUID("0000008E-0000-1000-8000-0026BB765291"),
     description="Security System Alarm Type",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=1,
     min_step=1,
@@ -642,14 +642,14 @@ SecuritySystemCurrentState = CharacteristicType[int](
     UUID("00000066-0000-1000-8000-0026BB765291"),
     description="Security System Current State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3, 4),
 )
 SecuritySystemTargetState = CharacteristicType[int](
     UUID("00000067-0000-1000-8000-0026BB765291"),
     description="Security System Target State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3),
 )
 SelectedRtpStreamConfiguration = CharacteristicType[bytes](
@@ -685,7 +685,7 @@ SetDuration = CharacteristicType[int](
     UUID("000000D3-0000-1000-8000-0026BB765291"),
     description="Set Duration",
     format="uint32",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     min_value=0,
     max_value=3600,
     min_step=1,
@@ -707,54 +707,54 @@ SmokeDetected = CharacteristicType[int](
     UUID("00000076-0000-1000-8000-0026BB765291"),
     description="Smoke Detected",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 StatusActive = CharacteristicType[bool](
     UUID("00000075-0000-1000-8000-0026BB765291"),
     description="Status Active",
     format="bool",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
 )
 StatusFault = CharacteristicType[int](
     UUID("00000077-0000-1000-8000-0026BB765291"),
     description="Status Fault",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 StatusJammed = CharacteristicType[int](
     UUID("00000078-0000-1000-8000-0026BB765291"),
     description="Status Jammed",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 StatusLowBattery = CharacteristicType[int](
     UUID("00000079-0000-1000-8000-0026BB765291"),
     description="Status Low Battery",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 StatusTampered = CharacteristicType[int](
     UUID("0000007A-0000-1000-8000-0026BB765291"),
     description="Status Tampered",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 StreamingStatus = CharacteristicType[bytes](
     UUID("00000120-0000-1000-8000-0026BB765291"),
     description="Streaming Status",
     format="tlv8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
 )
 SulphurDioxideDensity = CharacteristicType[float](
     UUID("000000C5-0000-1000-8000-0026BB765291"),
     description="Sulphur Dioxide Density",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=1000,
     min_step=1,
@@ -781,56 +781,56 @@ SwingMode = CharacteristicType[int](
     UUID("000000B6-0000-1000-8000-0026BB765291"),
     description="Swing Mode",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 TargetAirPurifierState = CharacteristicType[int](
     UUID("000000A8-0000-1000-8000-0026BB765291"),
     description="Target Air Purifier State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 TargetAirQuality = CharacteristicType[int](
     UUID("000000AE-0000-1000-8000-0026BB765291"),
     description="Target Air Quality",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 TargetDoorState = CharacteristicType[int](
     UUID("00000032-0000-1000-8000-0026BB765291"),
     description="Target Door State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 TargetFanState = CharacteristicType[int](
     UUID("000000BF-0000-1000-8000-0026BB765291"),
     description="Target Fan State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 TargetHeaterCoolerState = CharacteristicType[int](
     UUID("000000B2-0000-1000-8000-0026BB765291"),
     description="Target Heater Cooler State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 TargetHeatingCoolingState = CharacteristicType[int](
     UUID("00000033-0000-1000-8000-0026BB765291"),
     description="Target Heating Cooling State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3),
 )
 TargetHorizontalTiltAngle = CharacteristicType[int](
     UUID("0000007B-0000-1000-8000-0026BB765291"),
     description="Target Horizontal Tilt Angle",
     format="int32",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="arcdegrees",
     min_value=-90,
     max_value=90,
@@ -840,14 +840,14 @@ TargetHumidifierDehumidifierState = CharacteristicType[int](
     UUID("000000B4-0000-1000-8000-0026BB765291"),
     description="Target Humidifier Dehumidifier State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1, 2),
 )
 TargetPosition = CharacteristicType[int](
     UUID("0000007C-0000-1000-8000-0026BB765291"),
     description="Target Position",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -857,7 +857,7 @@ TargetRelativeHumidity = CharacteristicType[float](
     UUID("00000034-0000-1000-8000-0026BB765291"),
     description="Target Relative Humidity",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -867,14 +867,14 @@ TargetSlatState = CharacteristicType[int](
     UUID("000000BE-0000-1000-8000-0026BB765291"),
     description="Target Slat State",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 TargetTemperature = CharacteristicType[float](
     UUID("00000035-0000-1000-8000-0026BB765291"),
     description="Target Temperature",
     format="float",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="celsius",
     min_value=10,
     max_value=38,
@@ -884,7 +884,7 @@ TargetTiltAngle = CharacteristicType[int](
     UUID("000000C2-0000-1000-8000-0026BB765291"),
     description="Target Tilt Angle",
     format="int32",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="arcdegrees",
     min_value=-90,
     max_value=90,
@@ -894,7 +894,7 @@ TargetVerticalTiltAngle = CharacteristicType[int](
     UUID("0000007D-0000-1000-8000-0026BB765291"),
     description="Target Vertical Tilt Angle",
     format="int32",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="arcdegrees",
     min_value=-90,
     max_value=90,
@@ -904,14 +904,14 @@ TemperatureDisplayUnits = CharacteristicType[int](
     UUID("00000036-0000-1000-8000-0026BB765291"),
     description="Temperature Display Units",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     valid_values=(0, 1),
 )
 ValveType = CharacteristicType[int](
     UUID("000000D5-0000-1000-8000-0026BB765291"),
     description="Valve Type",
     format="uint8",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     valid_values=(0, 1, 2, 3),
 )
 Version = CharacteristicType[str](
@@ -925,7 +925,7 @@ VocDensity = CharacteristicType[float](
     UUID("000000C8-0000-1000-8000-0026BB765291"),
     description="VOC Density",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     min_value=0,
     max_value=1000,
     min_step=1,
@@ -934,7 +934,7 @@ Volume = CharacteristicType[int](
     UUID("00000119-0000-1000-8000-0026BB765291"),
     description="Volume",
     format="uint8",
-    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE),
+    permissions=(Permission.PAIRED_READ, Permission.PAIRED_WRITE, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
@@ -944,7 +944,7 @@ WaterLevel = CharacteristicType[float](
     UUID("000000B5-0000-1000-8000-0026BB765291"),
     description="Water Level",
     format="float",
-    permissions=(Permission.PAIRED_READ,),
+    permissions=(Permission.PAIRED_READ, Permission.NOTIFY),
     unit="percentage",
     min_value=0,
     max_value=100,
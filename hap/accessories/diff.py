@@ -0,0 +1,129 @@
+"""
+Structural diff between two sets of accessories.
+
+Compares the accessories, services and characteristics of two versions of
+a bridge, e.g. before and after it was redeployed with a changed device list,
+by their aid and instance ID. Runs in linear time: elements are matched
+through dictionaries by ID, and the characteristics of services with the same
+layout are compared position by position.
+"""
+
+from typing import Any, Iterable, NamedTuple, Sequence
+
+from .base import Accessory, BaseCharacteristic, Service
+
+# An accessory, as its aid and None, or a service or characteristic, as the
+# aid of its accessory and its instance ID
+Key = tuple[int, int | None]
+
+
+class Diff(NamedTuple):
+    """
+    The elements that were added, removed or changed. Only the top-most
+    element is included, e.g. the characteristics of an added service
+    aren't included themselves.
+    """
+
+    added: list[Key]
+    removed: list[Key]
+    changed: list[Key]
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def diff_accessories(
+    old: Iterable[Accessory], new: Iterable[Accessory], values: bool = False
+) -> Diff:
+    """
+    Compare two sets of accessories.
+
+    A service changed if its type or its primary or hidden flag changed, and
+    a characteristic changed if its type changed. If values is true, a
+    characteristic whose value changed counts as changed as well.
+    """
+
+    result = Diff([], [], [])
+    old_accessories = {accessory.aid: accessory for accessory in old}
+    new_aids = set()
+    for accessory in new:
+        new_aids.add(accessory.aid)
+        if (previous := old_accessories.get(accessory.aid)) is None:
+            result.added.append((accessory.aid, None))
+        elif previous is not accessory:
+            _diff_services(
+                result, accessory.aid, previous.services, accessory.services, values
+            )
+    for aid in old_accessories:
+        if aid not in new_aids:
+            result.removed.append((aid, None))
+    return result
+
+
+def _diff_services(
+    result: Diff,
+    aid: int,
+    old: Sequence[Service],
+    new: Sequence[Service],
+    values: bool,
+) -> None:
+    old_services = {service.iid: service for service in old}
+    new_iids = set()
+    for service in new:
+        new_iids.add(service.iid)
+        if (previous := old_services.get(service.iid)) is None:
+            result.added.append((aid, service.iid))
+            continue
+        if (
+            (previous.type is not service.type and previous.type != service.type)
+            or previous.primary != service.primary
+            or previous.hidden != service.hidden
+        ):
+            result.changed.append((aid, service.iid))
+            continue
+
+        old_chars = previous.characteristics
+        new_chars = service.characteristics
+        if previous._index is service._index and all(
+            a.iid == b.iid for a, b in zip(old_chars, new_chars)
+        ):
+            # Same layout with the same instance IDs, so the characteristics
+            # can be compared in order
+            for a, b in zip(old_chars, new_chars):
+                if _changed(a, b, values):
+                    result.changed.append((aid, b.iid))
+        else:
+            _diff_characteristics(result, aid, old_chars, new_chars, values)
+
+    for iid in old_services:
+        if iid not in new_iids:
+            result.removed.append((aid, iid))
+
+
+def _diff_characteristics(
+    result: Diff,
+    aid: int,
+    old: Sequence[BaseCharacteristic[Any]],
+    new: Sequence[BaseCharacteristic[Any]],
+    values: bool,
+) -> None:
+    old_chars = {char.iid: char for char in old}
+    new_iids = set()
+    for char in new:
+        new_iids.add(char.iid)
+        if (previous := old_chars.get(char.iid)) is None:
+            result.added.append((aid, char.iid))
+        elif _changed(previous, char, values):
+            result.changed.append((aid, char.iid))
+    for iid in old_chars:
+        if iid not in new_iids:
+            result.removed.append((aid, iid))
+
+
+def _changed(
+    old: BaseCharacteristic[Any], new: BaseCharacteristic[Any], values: bool
+) -> bool:
+    if old.type is not new.type and old.type != new.type:
+        return True
+    return values and old.value != new.value
@@ -0,0 +1,204 @@
+"""
+Array-backed storage of numeric characteristic values.
+
+Every characteristic normally holds its own value, which for a numeric value
+means a boxed int or float per characteristic. Bridges with thousands of
+sensors can instead keep those values in a ValueStore, which holds a typed
+array per format. Characteristics created through the store are views into
+these arrays, and the values of many characteristics can be read and written
+in bulk.
+"""
+
+import importlib
+from array import array
+from typing import Any, Callable, Iterable, Sequence
+
+from .base import (
+    BaseCharacteristic,
+    Characteristic,
+    CharacteristicSpec,
+    CharacteristicType,
+    validate_many,
+)
+
+try:
+    _numpy: Any = importlib.import_module("numpy")
+except ImportError:
+    _numpy = None
+
+# Array type codes of the formats that can be stored
+TYPECODES = {
+    "bool": "B",
+    "uint8": "B",
+    "uint16": "H",
+    "uint32": "I",
+    "uint64": "Q",
+    "int32": "i",
+    "int": "i",
+    "float": "d",
+}
+
+
+class StoredCharacteristic(BaseCharacteristic[Any]):
+    """
+    A characteristic whose value is kept in a slot of a ValueStore array,
+    rather than in a boxed value of its own.
+    """
+
+    __slots__ = ("store", "slot")
+
+    def __init__(
+        self,
+        iid: int,
+        type: CharacteristicType[Any],
+        event_notifications_enabled: bool,
+        store: "ValueStore",
+        slot: int,
+    ) -> None:
+        super().__init__(iid, type, event_notifications_enabled)
+        self.store = store
+        self.slot = slot
+
+    @property
+    def value(self) -> Any:
+        format = self.type.format
+        value = self.store.arrays[format][self.slot]
+        return bool(value) if format == "bool" else value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self.store.arrays[self.type.format][self.slot] = self.type.coerce(value)
+        if self._on_update is not None:
+            self._on_update(self)
+
+    def _set_value(self, value: Any) -> None:
+        self.store.arrays[self.type.format][self.slot] = value
+
+
+class ValueStore:
+    """
+    Values of numeric characteristics, kept in a typed array per format and
+    indexed by the slot of each characteristic.
+
+    Values can't be None, so characteristics without an initial value, or of
+    formats that can't be stored, are created as regular characteristics.
+    Slots aren't reused once their characteristic is removed.
+    """
+
+    def __init__(self) -> None:
+        self.arrays: dict[str, array[Any]] = {}
+        self._characteristics: dict[str, list[StoredCharacteristic]] = {}
+
+        # Called with the format and the changed characteristics of each
+        # write(), e.g. by the accessory servers the characteristics were
+        # added to
+        self.listeners: list[Callable[[str, list[StoredCharacteristic]], None]] = []
+
+    def create(
+        self, spec: CharacteristicSpec[Any], get_instance_id: Callable[[], int]
+    ) -> BaseCharacteristic[Any]:
+        """
+        Create a characteristic from a spec, with its value kept in the store
+        if possible. See Service.from_spec().
+        """
+
+        format = spec.type.format
+        if (typecode := TYPECODES.get(format)) is None or spec.initial_value is None:
+            return Characteristic.from_spec(spec, get_instance_id)
+
+        if (values := self.arrays.get(format)) is None:
+            values = self.arrays[format] = array(typecode)
+            self._characteristics[format] = []
+        values.append(spec.initial_value)
+
+        characteristic = StoredCharacteristic(
+            iid=get_instance_id(),
+            type=spec.type,
+            event_notifications_enabled=spec.event_notifications_enabled,
+            store=self,
+            slot=len(values) - 1,
+        )
+        self._characteristics[format].append(characteristic)
+        return characteristic
+
+    def read(self, format: str, slots: Iterable[int]) -> list[Any]:
+        """
+        Read the values of a number of slots of a format.
+        """
+
+        values = self.arrays[format]
+        if format == "bool":
+            return [bool(values[slot]) for slot in slots]
+        return [values[slot] for slot in slots]
+
+    def write(self, format: str, slots: Sequence[int], values: Sequence[Any]) -> int:
+        """
+        Write the values of a number of slots of a format, and return how
+        many of them changed. The values are assigned in one step where
+        possible, with NumPy if it's installed and as a slice for a range of
+        slots otherwise. The characteristics whose value changed are passed
+        to the listeners in a single call, rather than each of them being
+        notified on its own.
+
+        All values are validated before any of them is written, and a
+        ValueError is raised if any of them is invalid.
+        """
+
+        if len(slots) != len(values):
+            raise ValueError("The number of slots and values don't match")
+
+        characteristics = self._characteristics[format]
+        values = validate_many(
+            ((characteristics[slot].type, value) for slot, value in zip(slots, values)),
+            coerce=True,
+        )
+        if errors := [value for value in values if isinstance(value, ValueError)]:
+            raise errors[0]
+
+        stored = self.arrays[format]
+        changed: list[int]
+        if _numpy is not None:
+            view = _numpy.frombuffer(stored, dtype=stored.typecode)
+            indexes = _numpy.asarray(slots, dtype=_numpy.intp)
+            new = _numpy.asarray(values, dtype=stored.typecode)
+            mask = view[indexes] != new
+            view[indexes[mask]] = new[mask]
+            changed = indexes[mask].tolist()
+            # Release the buffer, so that the array can grow again
+            del view
+        elif isinstance(slots, range) and slots.step == 1:
+            new_values = array(stored.typecode, values)
+            old_values = stored[slots.start : slots.stop]
+            changed = [
+                slot
+                for slot, old, new_value in zip(slots, old_values, new_values)
+                if old != new_value
+            ]
+            stored[slots.start : slots.stop] = new_values
+        else:
+            changed = []
+            for slot, value in zip(slots, values):
+                if stored[slot] != value:
+                    stored[slot] = value
+                    changed.append(slot)
+
+        if changed:
+            updated = [characteristics[slot] for slot in changed]
+            for listener in self.listeners:
+                listener(format, updated)
+        return len(changed)
+
+    def view(self, format: str) -> Any:
+        """
+        Get all values of a format, indexed by slot, without copying them.
+        This is a NumPy array if NumPy is installed, and a memoryview
+        otherwise.
+
+        Changes made through the view aren't notified, and no characteristics
+        of the format can be added while the view is alive.
+        """
+
+        values = self.arrays[format]
+        if _numpy is not None:
+            return _numpy.frombuffer(values, dtype=values.typecode)
+        return memoryview(values)
@@ -0,0 +1,166 @@
+"""
+Templates for creating many identical accessories.
+
+Bridges often expose thousands of accessories that only differ in their aid
+and in a few values, like their name and serial number. An AccessoryTemplate
+works out the instance IDs and everything else that's shared by these
+accessories once, so that creating each of them only allocates its own
+services and characteristics.
+"""
+
+from typing import Any, Iterable, Mapping, NamedTuple, Sequence
+
+from .base import (
+    Accessory,
+    Characteristic,
+    CharacteristicType,
+    Service,
+    ServiceSpec,
+    ServiceType,
+    _layout_index,
+)
+
+_create_characteristic = Characteristic._create
+_create_service = Service._create
+_create_accessory = Accessory._create
+
+
+class _CharacteristicPlan(NamedTuple):
+    iid: int
+    type: CharacteristicType[Any]
+    event_notifications_enabled: bool
+    initial_value: Any
+
+
+class _ServicePlan(NamedTuple):
+    iid: int
+    type: ServiceType
+    primary: bool
+    hidden: bool
+    characteristics: tuple[_CharacteristicPlan, ...]
+    type_index: dict[int, int]
+
+
+class AccessoryTemplate:
+    """
+    A template for accessories with the given services. Instance IDs are
+    assigned in order, starting at 1, as when creating the services from their
+    specs with a counter.
+    """
+
+    def __init__(self, services: Sequence[ServiceSpec]) -> None:
+        iid = 0
+        plans = []
+        for spec in services:
+            iid += 1
+            service_iid = iid
+            characteristics = []
+            for char_spec in spec.characteristics:
+                iid += 1
+                characteristics.append(
+                    _CharacteristicPlan(
+                        iid,
+                        char_spec.type,
+                        char_spec.event_notifications_enabled,
+                        char_spec.initial_value,
+                    )
+                )
+            plans.append(
+                _ServicePlan(
+                    service_iid,
+                    spec.type,
+                    spec.primary,
+                    spec.hidden,
+                    tuple(characteristics),
+                    _layout_index(
+                        tuple(char.type.uuid.int for char in characteristics)
+                    ),
+                )
+            )
+        self._services = tuple(plans)
+        self._characteristics = {
+            char.iid: char for plan in plans for char in plan.characteristics
+        }
+        self._index = _layout_index(tuple(plan.type.uuid.int for plan in plans))
+
+    def iid(
+        self,
+        service_type: ServiceType,
+        char_type: CharacteristicType[Any] | None = None,
+    ) -> int:
+        """
+        Get the instance ID of the first service of a type, or of the first
+        characteristic of a type in that service.
+        """
+
+        for service in self._services:
+            if service.type == service_type:
+                if char_type is None:
+                    return service.iid
+                for characteristic in service.characteristics:
+                    if characteristic.type == char_type:
+                        return characteristic.iid
+                raise KeyError(f'Service has no "{char_type}" characteristic')
+        raise KeyError(f'Template has no "{service_type}" service')
+
+    def create(self, aid: int, values: Mapping[int, Any] | None = None) -> Accessory:
+        """
+        Create an accessory, with the initial values of the characteristics
+        with the given instance IDs replaced. Raises ValueError if any of
+        those values is invalid.
+        """
+
+        if values:
+            values = {
+                iid: self._get_characteristic(iid).type.coerce(value)
+                for iid, value in values.items()
+            }
+        # Instances are created through the fast constructors, as everything
+        # the regular ones work out is already known
+        services = []
+        for plan in self._services:
+            characteristics = tuple(
+                [
+                    _create_characteristic(
+                        char.iid,
+                        char.type,
+                        char.event_notifications_enabled,
+                        (
+                            values.get(char.iid, char.initial_value)
+                            if values
+                            else char.initial_value
+                        ),
+                    )
+                    for char in plan.characteristics
+                ]
+            )
+            services.append(
+                _create_service(
+                    plan.iid,
+                    plan.type,
+                    characteristics,
+                    plan.primary,
+                    plan.hidden,
+                    plan.type_index,
+                )
+            )
+        return _create_accessory(aid, tuple(services), self._index)
+
+    def create_many(
+        self,
+        aids: Iterable[int],
+        values: Iterable[Mapping[int, Any] | None] | None = None,
+    ) -> list[Accessory]:
+        """
+        Create an accessory for each aid, with the values for each of them
+        as for create().
+        """
+
+        if values is None:
+            return [self.create(aid) for aid in aids]
+        return [self.create(aid, v) for aid, v in zip(aids, values, strict=True)]
+
+    def _get_characteristic(self, iid: int) -> _CharacteristicPlan:
+        if (characteristic := self._characteristics.get(iid)) is None:
+            raise KeyError(f"Template has no characteristic with iid {iid}")
+        return characteristic
@@ -57,3 +57,31 @@ class Backend(Protocol):
         that they can be fully restored through load_accessories().
         """
         ...
+
+    async def load_instance_ids(self) -> dict[str, dict[str, int]]:
+        """
+        Load the instance IDs allocated to the services and characteristics
+        of each accessory, see hap.iids.
+        """
+        ...
+
+    async def store_instance_ids(self, instance_ids: dict[str, dict[str, int]]) -> None:
+        """
+        Store the instance IDs allocated to the services and characteristics
+        of each accessory.
+        """
+        ...
+
+    async def load_configuration(self) -> tuple[int, str] | None:
+        """
+        Load the configuration number and the digest of the attribute database
+        it was assigned for, if any were stored.
+        """
+        ...
+
+    async def store_configuration(self, number: int, digest: str) -> None:
+        """
+        Store the configuration number and the digest of the attribute
+        database it was assigned for.
+        """
+        ...
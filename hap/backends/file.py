@@ -5,7 +5,7 @@ from typing import cast
 
 from ..accessories import Accessory
 from .base import TypeManager
-from .memory import MemoryBackend, State
+from .memory import MemoryBackend, State, empty_state
 
 
 class FileBackend(MemoryBackend):
@@ -25,6 +25,28 @@ class FileBackend(MemoryBackend):
             await self.load_state()
         await super().store_accessory(accessory)
 
+    async def load_instance_ids(self) -> dict[str, dict[str, int]]:
+        if not self.has_loaded_state:
+            await self.load_state()
+        return await super().load_instance_ids()
+
+    async def store_instance_ids(self, instance_ids: dict[str, dict[str, int]]) -> None:
+        if not self.has_loaded_state:
+            await self.load_state()
+        await super().store_instance_ids(instance_ids)
+        await self.save_state()
+
+    async def load_configuration(self) -> tuple[int, str] | None:
+        if not self.has_loaded_state:
+            await self.load_state()
+        return await super().load_configuration()
+
+    async def store_configuration(self, number: int, digest: str) -> None:
+        if not self.has_loaded_state:
+            await self.load_state()
+        await super().store_configuration(number, digest)
+        await self.save_state()
+
     # Internal helpers
 
     async def load_state(self) -> None:
@@ -32,7 +54,8 @@ class FileBackend(MemoryBackend):
         async with self.lock:
             if self.has_loaded_state:
                 return
-            self._state = await loop.run_in_executor(None, self._load_state)
+            self.state = await loop.run_in_executor(None, self._load_state)
+            self.has_loaded_state = True
 
     async def save_state(self) -> None:
         loop = asyncio.get_running_loop()
@@ -42,9 +65,10 @@ class FileBackend(MemoryBackend):
     def _load_state(self) -> State:
         if self.path.exists():
             with open(self.path, "r") as f:
-                return cast(State, json.loads(f.read()))
+                # State saved by earlier versions lacks the newer keys
+                return cast(State, {**empty_state(), **json.loads(f.read())})
         else:
-            return {"accessories": {}}
+            return empty_state()
 
     def _save_state(self) -> None:
         with open(self.path, "w") as f:
@@ -19,13 +19,24 @@ class ServiceState(TypedDict):
     characteristics: list[CharacteristicState]
 
 
+class ConfigurationState(TypedDict):
+    number: int
+    digest: str
+
+
 class State(TypedDict):
     accessories: dict[int, list[ServiceState]]
+    instance_ids: dict[str, dict[str, int]]
+    configuration: ConfigurationState | None
+
+
+def empty_state() -> State:
+    return {"accessories": {}, "instance_ids": {}, "configuration": None}
 
 
 class MemoryBackend:
     def __init__(self) -> None:
-        self.state: State = {"accessories": {}}
+        self.state: State = empty_state()
 
     async def load_accessories(self, types: TypeManager) -> list[Accessory]:
         def hydrate_characteristic(
@@ -59,8 +70,10 @@ class MemoryBackend:
             )
 
         return [
+            # The aids are strings once the state went through JSON
             Accessory(
-                aid=aid, services=[hydrate_service(service) for service in services]
+                aid=int(aid),
+                services=[hydrate_service(service) for service in services],
             )
             for aid, services in self.state["accessories"].items()
         ]
@@ -84,3 +97,19 @@ class MemoryBackend:
             )
             for service in accessory.services
         ]
+
+    async def load_instance_ids(self) -> dict[str, dict[str, int]]:
+        return {aid: dict(ids) for aid, ids in self.state["instance_ids"].items()}
+
+    async def store_instance_ids(self, instance_ids: dict[str, dict[str, int]]) -> None:
+        self.state["instance_ids"] = {
+            aid: dict(ids) for aid, ids in instance_ids.items()
+        }
+
+    async def load_configuration(self) -> tuple[int, str] | None:
+        if (configuration := self.state["configuration"]) is None:
+            return None
+        return configuration["number"], configuration["digest"]
+
+    async def store_configuration(self, number: int, digest: str) -> None:
+        self.state["configuration"] = ConfigurationState(number=number, digest=digest)
@@ -0,0 +1,135 @@
+"""
+The accessory attribute database, that is the JSON document describing all
+accessories, services and characteristics that controllers fetch from
+/accessories.
+
+The serialized document is cached. It's only rebuilt when the structure
+changes, while a value change only replaces the fragment holding that value.
+The metadata of each characteristic type is encoded only once, and shared
+with characteristic reads.
+
+A digest of everything but the values identifies the structure of the
+database, which determines the configuration number announced to controllers.
+"""
+
+import hashlib
+from typing import Any, Sequence
+
+from .accessories import Accessory, BaseCharacteristic, Service
+from .accessories.base import Permission
+from .http.encoder import ALL_METADATA, encode_value, metadata_fragment, short_uuid
+
+
+class AttributeDatabase:
+    """
+    Cached serialization of the attribute database of a set of accessories.
+
+    The document is kept as a list of fragments, where the value of each
+    readable characteristic is a fragment of its own. That way a value change
+    only requires re-encoding that single value.
+    """
+
+    def __init__(self, accessories: Sequence[Accessory]) -> None:
+        self.accessories = accessories
+        self._fragments: list[bytes] | None = None
+        self._values: dict[tuple[int, int], int] = {}
+        self._serialized: bytes | None = None
+        self._digest: str | None = None
+
+    def serialize(self) -> bytes:
+        if self._serialized is None:
+            if self._fragments is None:
+                self._build()
+                assert self._fragments is not None
+            self._serialized = b"".join(self._fragments)
+        return self._serialized
+
+    def invalidate(self) -> None:
+        """
+        Throw away the cached document, e.g. when the structure has changed.
+        """
+
+        self._fragments = None
+        self._values = {}
+        self._serialized = None
+        self._digest = None
+
+    def digest(self) -> str:
+        """
+        Get a hash of the structure of the database, which only changes when
+        anything but the values of characteristics changes.
+        """
+
+        if self._digest is None:
+            if self._fragments is None:
+                self._build()
+                assert self._fragments is not None
+            values = set(self._values.values())
+            digest = hashlib.sha256()
+            for index, fragment in enumerate(self._fragments):
+                if index not in values:
+                    digest.update(fragment)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def update_value(self, aid: int, characteristic: BaseCharacteristic[Any]) -> None:
+        """
+        Update the cached value of a characteristic.
+        """
+
+        if self._fragments is None:
+            return
+        if (index := self._values.get((aid, characteristic.iid))) is not None:
+            self._fragments[index] = encode_value(
+                characteristic.value, characteristic.type.format
+            )
+            self._serialized = None
+
+    def _build(self) -> None:
+        fragments: list[bytes] = []
+        values: dict[tuple[int, int], int] = {}
+
+        # Static parts are collected here, and flushed as a single fragment
+        # whenever a value fragment is added
+        static = bytearray(b'{"accessories":[')
+
+        for i, accessory in enumerate(self.accessories):
+            if i:
+                static += b","
+            static += b'{"aid":%d,"services":[' % accessory.aid
+            for j, service in enumerate(accessory.services):
+                if j:
+                    static += b","
+                static += _service_head(service)
+                for k, characteristic in enumerate(service.characteristics):
+                    if k:
+                        static += b","
+                    static += b'{"iid":%d' % characteristic.iid
+                    static += metadata_fragment(characteristic.type, ALL_METADATA)
+                    if Permission.PAIRED_READ not in characteristic.type.permissions:
+                        static += b"}"
+                        continue
+
+                    static += b',"value":'
+                    fragments.append(bytes(static))
+                    values[(accessory.aid, characteristic.iid)] = len(fragments)
+                    fragments.append(
+                        encode_value(characteristic.value, characteristic.type.format)
+                    )
+                    static = bytearray(b"}")
+                static += b"]}"
+            static += b"]}"
+        static += b"]}"
+        fragments.append(bytes(static))
+
+        self._fragments = fragments
+        self._values = values
+
+
+def _service_head(service: Service) -> bytes:
+    return b'{"iid":%d,"type":"%s","primary":%s,"hidden":%s,"characteristics":[' % (
+        service.iid,
+        short_uuid(service.type.uuid).encode(),
+        b"true" if service.primary else b"false",
+        b"true" if service.hidden else b"false",
+    )
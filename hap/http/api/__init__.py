@@ -1,7 +1,18 @@
-from .accessories import index
+from ..routing import Route
+from .accessories import (
+    accessories,
+    index,
+    prepare,
+    read_characteristics,
+    write_characteristics,
+)
 from .pairing import pairing_setup
 
-HANDLERS = {
-    ("GET", "/"): index,
-    ("POST", "/pair-setup"): pairing_setup,
-}
+ROUTES = (
+    Route("/", index, methods=("GET",)),
+    Route("/accessories", accessories, methods=("GET",)),
+    Route("/characteristics", read_characteristics, methods=("GET",)),
+    Route("/characteristics", write_characteristics, methods=("PUT",)),
+    Route("/pair-setup", pairing_setup, methods=("POST",)),
+    Route("/prepare", prepare, methods=("PUT",)),
+)
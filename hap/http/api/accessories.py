@@ -1,21 +1,124 @@
+from typing import Any
+
+from ...server import Status, Write
+from ..encoder import ReadFlags, dumps
 from ..request import Request
-from ..response import BadRequest, JSONResponse, Response
+from ..response import BadRequest, HAPResponse, JSONResponse, Response
+
+# Query parameters that request optional fields when reading characteristics
+READ_FLAGS = {
+    "meta": ReadFlags.META,
+    "perms": ReadFlags.PERMS,
+    "type": ReadFlags.TYPE,
+    "ev": ReadFlags.EV,
+}
 
 
 async def index(_: Request) -> JSONResponse:
     return JSONResponse(data={"foo": "bar"})
 
 
-async def accessories(_: Request) -> Response:
-    return JSONResponse(data={"accessories": []})
+async def accessories(request: Request) -> Response:
+    return HAPResponse(await request.server.get_attribute_database())
 
 
-async def characteristics(request: Request) -> Response:
-    if "id" not in request.query:
+async def read_characteristics(request: Request) -> Response:
+    query = request.query
+    if "id" not in query:
         return BadRequest(b'The "id" query parameter must be specified')
 
-    ids = ",".split(",".join(request.query["ids"]))
+    try:
+        ids = parse_ids(query["id"])
+    except ValueError:
+        return BadRequest(b'The "id" query parameter is invalid')
+
+    flags = ReadFlags(0)
+    for name, flag in READ_FLAGS.items():
+        if query.get(name, ("0",))[0] == "1":
+            flags |= flag
+
+    events = None
+    if ReadFlags.EV in flags and request.connection is not None:
+        events = request.events.subscriptions(request.connection)
+
+    success, body = await request.server.get_characteristics(
+        ids, flags, request.deadline, events
+    )
+    return HAPResponse(body, status=200 if success else 207)
+
+
+async def write_characteristics(request: Request) -> Response:
+    try:
+        data = request.json()
+        writes = parse_writes(data)
+        pid = data.get("pid")
+        if pid is not None and not is_pid(pid):
+            raise ValueError("Invalid pid")
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return BadRequest(b"Invalid characteristic writes")
+
+    connection = request.connection
+    success, body, statuses = await request.server.put_characteristics(
+        writes, pid, request.deadline, connection.id if connection else None
+    )
+
+    if connection is not None and any(write.ev is not None for write in writes):
+        subscribe: list[tuple[int, int]] = []
+        unsubscribe: list[tuple[int, int]] = []
+        for write, status in zip(writes, statuses):
+            if status == Status.SUCCESS and write.ev is not None:
+                (subscribe if write.ev else unsubscribe).append((write.aid, write.iid))
+        await request.events.subscribe(connection, subscribe)
+        await request.events.unsubscribe(connection, unsubscribe)
+
+    return HAPResponse(body, status=204 if success else 207)
+
+
+async def prepare(request: Request) -> Response:
+    try:
+        data = request.json()
+        ttl, pid = data["ttl"], data["pid"]
+        if not isinstance(ttl, int) or ttl <= 0 or not is_pid(pid):
+            raise ValueError("Invalid timed write request")
+    except (ValueError, TypeError, KeyError):
+        return BadRequest(b"Invalid timed write request")
+
+    # The TTL is given in milliseconds
+    status = await request.server.prepare_write(pid, ttl / 1000)
+    return HAPResponse(dumps({"status": int(status)}))
+
+
+def is_pid(value: Any) -> bool:
+    return isinstance(value, int) and 0 <= value < 2**64
+
+
+def parse_ids(values: list[str]) -> list[tuple[int, int]]:
+    """
+    Parse the values of the id query parameter, each of which is a comma
+    separated list of characteristics like "1.10,1.11,2.10".
+    """
+
+    ids = []
+    for value in values:
+        for id in value.split(","):
+            aid, _, iid = id.partition(".")
+            ids.append((int(aid), int(iid)))
     if not ids:
-        return JSONResponse(data=[])
+        raise ValueError("No characteristics")
+    return ids
+
+
+def parse_writes(data: Any) -> list[Write]:
+    """
+    Parse the body of a characteristic write request.
+    """
 
-    raise NotImplementedError
+    writes = []
+    for item in data["characteristics"]:
+        aid, iid, ev = item["aid"], item["iid"], item.get("ev")
+        if not isinstance(aid, int) or not isinstance(iid, int):
+            raise ValueError("Invalid characteristic ID")
+        if ev is not None and not isinstance(ev, bool):
+            raise ValueError("Invalid ev value")
+        writes.append(Write(aid, iid, item.get("value"), ev))
+    return writes
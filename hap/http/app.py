@@ -3,30 +3,44 @@ This module implements a simple ASGI application that handles incoming requests
 from the home controller.
 """
 
-from typing import Awaitable
+import asyncio
+from typing import TYPE_CHECKING
 
-from .api import HANDLERS
+from .api import ROUTES
+from .events import EventHub
 from .request import Request
 from .response import Response
+from .routing import Router
 
-RESPONSE_404 = Response(status=404, body=b"", content_type="text/plain")
+if TYPE_CHECKING:
+    from ..ipc import StateClient
+    from ..server import AccessoryServer
 
 
 class App:
-    async def __call__(self, request: Request) -> Response:
-
-        response = self.handle(request)
-        if not isinstance(response, Response):
-            response = await response
-
-        return response
+    def __init__(
+        self,
+        server: "AccessoryServer | StateClient | None" = None,
+        router: Router | None = None,
+        budget: float | None = 10.0,
+        events: EventHub | None = None,
+    ) -> None:
+        # The accessory state, either held locally or by a state owner process
+        # when running with multiple worker processes
+        self.server = server
+        # Event notifications, which can be tuned by passing a custom hub
+        self.events = events if events is not None else EventHub(server)
+        self.router = router if router is not None else Router(ROUTES)
+        # The time in seconds a request may take, which bounds how long reads
+        # and writes wait for devices
+        self.budget = budget
 
-    def handle(self, request: Request) -> Awaitable[Response] | Response:
+    async def __call__(self, request: Request) -> Response:
 
-        method = "GET" if request.method == "HEAD" else request.method
+        request.app = self
+        if self.budget is not None:
+            request.deadline = asyncio.get_running_loop().time() + self.budget
 
         # Find the handler for this request and call it
-        if handler := HANDLERS.get((method, request.path), None):
-            return handler(request)
-
-        return RESPONSE_404
+        handler = self.router.resolve(request.method, request.path)
+        return await handler(request)
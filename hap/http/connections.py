@@ -0,0 +1,261 @@
+"""
+Bookkeeping for the controller connections of an accessory server.
+"""
+
+import asyncio
+import itertools
+import logging
+from asyncio import ALL_COMPLETED, StreamWriter
+from collections import OrderedDict
+from typing import Any
+
+from ..timers import TimerWheel
+
+logger = logging.getLogger("hap.http")
+
+
+class Connection:
+    """
+    A single controller connection and its counters.
+    """
+
+    __slots__ = (
+        "id",
+        "peer",
+        "writer",
+        "task",
+        "created_at",
+        "last_activity",
+        "bytes_received",
+        "bytes_sent",
+        "requests",
+        "events_sent",
+        "events_suppressed",
+        "_busy",
+        "_subscribed",
+        "_manager",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        writer: StreamWriter,
+        task: asyncio.Task[Any] | None,
+        now: float,
+        manager: "ConnectionManager | None" = None,
+    ) -> None:
+        self.id = id
+        self.peer: Any = writer.get_extra_info("peername")
+        self.writer = writer
+        self.task = task
+        self.created_at = now
+        self.last_activity = now
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.requests = 0
+        self.events_sent = 0
+        self.events_suppressed = 0
+        self._busy = False
+        self._subscribed = False
+        self._manager = manager
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__qualname__} id={self.id} peer={self.peer} "
+            f"requests={self.requests} bytes_received={self.bytes_received} "
+            f"bytes_sent={self.bytes_sent} busy={self.busy}>"
+        )
+
+    @property
+    def busy(self) -> bool:
+        """
+        Whether the connection is in the middle of handling a request.
+        """
+
+        return self._busy
+
+    @busy.setter
+    def busy(self, busy: bool) -> None:
+        if busy != self._busy:
+            self._busy = busy
+            if self._manager is not None:
+                self._manager._on_busy_changed(self)
+
+    @property
+    def subscribed(self) -> bool:
+        """
+        Whether the connection is subscribed to events of any characteristic.
+        """
+
+        return self._subscribed
+
+    @subscribed.setter
+    def subscribed(self, subscribed: bool) -> None:
+        if subscribed != self._subscribed:
+            self._subscribed = subscribed
+            if self._manager is not None:
+                self._manager._update_evictable(self)
+
+
+class ConnectionManager:
+    """
+    Keeps track of all open connections, enforces a maximum number of
+    concurrent connections and closes connections that have been idle for too
+    long.
+
+    Connections are kept ordered by their last activity, so when the limit is
+    reached the connection that has been idle the longest can be evicted in
+    constant time to make room for a new one. Connections that are in the
+    middle of handling a request are never evicted, and neither evicted nor
+    closed for being idle while they're subscribed to events, since the
+    controller then relies on them to learn about changes.
+
+    The number of busy connections and the connections that can be evicted
+    are kept up to date as connections change state, so neither counting
+    nor evicting connections has to look at all of them.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 32,
+        idle_timeout: float = 300.0,
+        timer_resolution: float = 1.0,
+    ) -> None:
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.connections: OrderedDict[int, Connection] = OrderedDict()
+        self.rejected = 0
+        self.evicted = 0
+        self.reaped = 0
+
+        # Connections that are neither busy nor subscribed, ordered by their
+        # last activity like all connections
+        self._evictable: OrderedDict[int, Connection] = OrderedDict()
+        self._busy_count = 0
+
+        self._ids = itertools.count(1)
+        self._timers = TimerWheel(self._on_idle_timeout, resolution=timer_resolution)
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    @property
+    def active_count(self) -> int:
+        return self._busy_count
+
+    @property
+    def idle_count(self) -> int:
+        return len(self.connections) - self.active_count
+
+    def open(self, writer: StreamWriter) -> Connection | None:
+        """
+        Register a new connection. Returns None if the connection limit has
+        been reached and no idle connection could be evicted, in which case
+        the caller should close the connection.
+        """
+
+        if len(self.connections) >= self.max_connections and not self._evict():
+            self.rejected += 1
+            return None
+
+        loop = asyncio.get_running_loop()
+        connection = Connection(
+            next(self._ids), writer, asyncio.current_task(), loop.time(), self
+        )
+        self.connections[connection.id] = connection
+        self._evictable[connection.id] = connection
+        self._timers.schedule(connection.id, self.idle_timeout)
+        return connection
+
+    def close(self, connection: Connection) -> None:
+        """
+        Unregister and close a connection. Calling this more than once for the
+        same connection is safe.
+        """
+
+        if self.connections.pop(connection.id, None) is None:
+            return
+
+        self._evictable.pop(connection.id, None)
+        if connection.busy:
+            self._busy_count -= 1
+        self._timers.cancel(connection.id)
+        if not connection.writer.is_closing():
+            connection.writer.close()
+
+    def touch(self, connection: Connection) -> None:
+        """
+        Record activity on a connection.
+        """
+
+        connection.last_activity = asyncio.get_running_loop().time()
+        if connection.id in self.connections:
+            self.connections.move_to_end(connection.id)
+            if connection.id in self._evictable:
+                self._evictable.move_to_end(connection.id)
+
+    async def close_all(self, timeout: float = 1.0) -> None:
+        """
+        Close all open connections and wait for their handlers to exit.
+        Connections that are busy handling a request are given some time to
+        finish before their handlers are cancelled.
+        """
+
+        self._timers.clear()
+        tasks = [
+            connection.task
+            for connection in self.connections.values()
+            if connection.task and connection.task is not asyncio.current_task()
+        ]
+        for connection in list(self.connections.values()):
+            if not connection.busy:
+                self.close(connection)
+
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending, return_when=ALL_COMPLETED)
+
+    # Internal helpers
+
+    def _evict(self) -> bool:
+        # Connections are ordered by last activity, so the first evictable
+        # connection is the one that has been idle the longest
+        if victim := next(iter(self._evictable.values()), None):
+            logger.info("Connection limit reached, evicting %s", victim)
+            self.evicted += 1
+            self.close(victim)
+            return True
+        return False
+
+    def _on_busy_changed(self, connection: Connection) -> None:
+        if connection.id in self.connections:
+            self._busy_count += 1 if connection.busy else -1
+            self._update_evictable(connection)
+
+    def _update_evictable(self, connection: Connection) -> None:
+        if connection.id not in self.connections:
+            return
+        if connection.busy or connection.subscribed:
+            self._evictable.pop(connection.id, None)
+        else:
+            self._evictable[connection.id] = connection
+
+    def _on_idle_timeout(self, id: int) -> None:
+        if (connection := self.connections.get(id)) is None:
+            return
+
+        now = asyncio.get_running_loop().time()
+        remaining = connection.last_activity + self.idle_timeout - now
+        if connection.busy or connection.subscribed or remaining > 0:
+            # Activity is only recorded on the connection itself, so re-arm
+            # the timer for whatever is left of the idle period
+            self._timers.schedule(id, max(remaining, 0) or self.idle_timeout)
+            return
+
+        logger.info("Closing idle connection %s", connection)
+        self.reaped += 1
+        self.close(connection)
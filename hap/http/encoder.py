@@ -0,0 +1,275 @@
+"""
+Encoding of HAP JSON payloads.
+
+HAP responses come in a few fixed shapes: lists of characteristic reads,
+multi-status lists and the attribute database. Rather than building dicts and
+passing them through a generic JSON encoder, these are written straight into
+a bytearray, with values rendered according to the format of their
+characteristic.
+
+Anything else goes through ``dumps()``, which uses orjson when it's installed
+and the standard library's json module otherwise.
+"""
+
+import base64
+import enum
+import importlib
+import json
+from functools import lru_cache
+from typing import Any, Callable, Collection, Iterable
+from uuid import UUID
+
+from ..accessories import BaseCharacteristic, CharacteristicType
+from ..accessories.base import INTEGER_RANGES, Permission, _intern
+
+# Apple's pre-defined types share a base UUID and can be shortened
+APPLE_UUID_SUFFIX = "-0000-1000-8000-0026BB765291"
+
+
+class ReadFlags(enum.IntFlag):
+    """
+    The optional fields requested when reading characteristics, from the
+    meta, perms, type and ev query parameters.
+    """
+
+    META = 1
+    PERMS = 2
+    TYPE = 4
+    EV = 8
+
+
+ALL_METADATA = ReadFlags.META | ReadFlags.PERMS | ReadFlags.TYPE
+
+
+def _encode_bytes(value: Any) -> str:
+    # Binary values, i.e. the data and tlv8 formats, are base64 encoded
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+try:
+    _orjson: Any = importlib.import_module("orjson")
+except ImportError:
+    _orjson = None
+
+_encoder = json.JSONEncoder(separators=(",", ":"), default=_encode_bytes)
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode any JSON serializable value as compact JSON.
+    """
+
+    if _orjson is not None:
+        data: bytes = _orjson.dumps(value, default=_encode_bytes)
+        return data
+    return _encoder.encode(value).encode()
+
+
+# Values
+
+
+def _encode_bool(value: Any) -> bytes:
+    return b"true" if value else b"false"
+
+
+def _encode_int(value: Any) -> bytes:
+    return b"%d" % value if type(value) is int else dumps(value)
+
+
+def _encode_float(value: Any) -> bytes:
+    if type(value) is float:
+        return repr(value).encode()
+    return _encode_int(value)
+
+
+def _encode_data(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return b'"%s"' % base64.b64encode(value)
+    return dumps(value)
+
+
+_VALUE_ENCODERS: dict[str, Callable[[Any], bytes]] = {
+    "bool": _encode_bool,
+    **{format: _encode_int for format in INTEGER_RANGES},
+    "float": _encode_float,
+    "data": _encode_data,
+    "tlv8": _encode_data,
+}
+
+
+# Encoders by the type of values, for values whose format isn't known
+_TYPE_ENCODERS: dict[type, Callable[[Any], bytes]] = {
+    bool: _encode_bool,
+    int: _encode_int,
+    float: _encode_float,
+    bytes: _encode_data,
+    type(None): lambda value: b"null",
+}
+
+
+def encode_value(value: Any, format: str) -> bytes:
+    """
+    Encode a characteristic value of the given format.
+    """
+
+    if value is None:
+        return b"null"
+    return _VALUE_ENCODERS.get(format, dumps)(value)
+
+
+def encode_number(value: int | float) -> bytes:
+    return b"%d" % value if type(value) is int else repr(float(value)).encode()
+
+
+# Metadata
+
+
+@lru_cache(maxsize=None)
+def short_uuid(uuid: UUID) -> str:
+    """
+    Get the shortest allowed representation of a service or characteristic
+    type UUID, as used in the HAP JSON documents.
+    """
+
+    value = str(uuid).upper()
+    if value.endswith(APPLE_UUID_SUFFIX):
+        return value[:8].lstrip("0") or "0"
+    return value
+
+
+@lru_cache(maxsize=None)
+def encode_perms(permissions: tuple[Permission, ...]) -> bytes:
+    return b"[%s]" % b",".join(b'"%s"' % p.value.encode() for p in permissions)
+
+
+def encode_metadata(char_type: CharacteristicType[Any], flags: ReadFlags) -> bytes:
+    """
+    Encode the metadata fields of a characteristic type for the META, PERMS
+    and TYPE flags, as a JSON fragment to add to an object.
+    """
+
+    buffer = bytearray()
+    if ReadFlags.TYPE in flags:
+        buffer += b',"type":"%s"' % short_uuid(char_type.uuid).encode()
+    if ReadFlags.PERMS in flags:
+        buffer += b',"perms":' + encode_perms(char_type.permissions)
+    if ReadFlags.META not in flags:
+        return bytes(buffer)
+
+    buffer += b',"format":' + dumps(char_type.format)
+    if char_type.description is not None:
+        buffer += b',"description":' + dumps(char_type.description)
+    if char_type.unit is not None:
+        buffer += b',"unit":' + dumps(char_type.unit)
+    if char_type.min_value is not None:
+        buffer += b',"minValue":' + encode_number(char_type.min_value)
+    if char_type.max_value is not None:
+        buffer += b',"maxValue":' + encode_number(char_type.max_value)
+    if char_type.min_step is not None:
+        buffer += b',"minStep":' + encode_number(char_type.min_step)
+    if char_type.max_length is not None:
+        buffer += b',"maxLen":%d' % char_type.max_length
+    if char_type.max_data_length is not None:
+        buffer += b',"maxDataLen":%d' % char_type.max_data_length
+    if char_type.valid_values is not None:
+        buffer += b',"valid-values":[%s]' % b",".join(
+            encode_value(value, char_type.format) for value in char_type.valid_values
+        )
+    if char_type.valid_values_range is not None:
+        buffer += b',"valid-values-range":[%s]' % b",".join(
+            encode_value(value, char_type.format)
+            for value in char_type.valid_values_range
+        )
+    return bytes(buffer)
+
+
+# Metadata fragments by the id of their characteristic type, cached like the
+# interned specs in hap.accessories.base
+_fragments: dict[int, tuple[CharacteristicType[Any], dict[ReadFlags, bytes]]] = {}
+
+
+def metadata_fragment(char_type: CharacteristicType[Any], flags: ReadFlags) -> bytes:
+    """
+    Get the encoded metadata of a characteristic type, like encode_metadata(),
+    but computed only once per type and combination of flags.
+    """
+
+    if (entry := _fragments.get(id(char_type))) is None:
+        fragments: dict[ReadFlags, bytes] = {}
+        entry = _intern(_fragments, id(char_type), (char_type, fragments))
+    if (fragment := entry[1].get(flags)) is None:
+        fragment = entry[1][flags] = encode_metadata(char_type, flags)
+    return fragment
+
+
+# Responses
+
+
+def encode_reads(
+    reads: Iterable[tuple[int, int, BaseCharacteristic[Any] | None, int]],
+    flags: ReadFlags,
+    with_status: bool,
+    events: Collection[tuple[int, int]] | None = None,
+) -> bytes:
+    """
+    Encode the result of reading characteristics, given as tuples of the
+    accessory ID, instance ID, characteristic (if it exists) and status.
+    Values are only included for successful reads.
+
+    The ev field is set for the characteristics in events, or from their
+    event_notifications_enabled attribute if not given.
+    """
+
+    metadata_flags = flags & ~ReadFlags.EV
+    ev = ReadFlags.EV in flags
+
+    buffer = bytearray(b'{"characteristics":[')
+    for i, (aid, iid, characteristic, status) in enumerate(reads):
+        if i:
+            buffer += b","
+        buffer += b'{"aid":%d,"iid":%d' % (aid, iid)
+        if characteristic is not None:
+            if not status:
+                buffer += b',"value":' + encode_value(
+                    characteristic.value, characteristic.type.format
+                )
+            if metadata_flags:
+                buffer += metadata_fragment(characteristic.type, metadata_flags)
+            if ev:
+                enabled = (
+                    (aid, iid) in events
+                    if events is not None
+                    else characteristic.event_notifications_enabled
+                )
+                buffer += b',"ev":true' if enabled else b',"ev":false'
+        if with_status:
+            buffer += b',"status":%d' % status
+        buffer += b"}"
+    buffer += b"]}"
+    return bytes(buffer)
+
+
+def encode_statuses(statuses: Iterable[tuple[int, int, int]]) -> bytes:
+    """
+    Encode a multi-status response, given as tuples of the accessory ID,
+    instance ID and status.
+    """
+
+    return b'{"characteristics":[%s]}' % b",".join(
+        b'{"aid":%d,"iid":%d,"status":%d}' % entry for entry in statuses
+    )
+
+
+def encode_events(updates: Iterable[tuple[int, int, Any]]) -> bytes:
+    """
+    Encode the body of an event notification, given the accessory ID,
+    instance ID and new value of each changed characteristic.
+    """
+
+    return b'{"characteristics":[%s]}' % b",".join(
+        b'{"aid":%d,"iid":%d,"value":%s}'
+        % (aid, iid, _TYPE_ENCODERS.get(type(value), dumps)(value))
+        for aid, iid, value in updates
+    )
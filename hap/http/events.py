@@ -0,0 +1,215 @@
+"""
+Event notifications to controller connections.
+
+Controllers subscribe to changes of characteristics by writing their ev field.
+Subscriptions are kept per connection and indexed by characteristic, so a
+change only has to look at the connections that subscribed to it.
+"""
+
+import asyncio
+import math
+from typing import TYPE_CHECKING, Any, Iterable
+
+from ..ipc import StateClient
+from ..server import Update
+from .connections import Connection
+from .encoder import encode_events
+
+if TYPE_CHECKING:
+    from ..server import AccessoryServer
+
+Key = tuple[int, int]
+
+EVENT_HEAD = (
+    b"EVENT/1.0 200 OK\r\n"
+    b"Content-Type: application/hap+json\r\n"
+    b"Content-Length: %d\r\n"
+    b"\r\n"
+)
+
+
+class EventHub:
+    """
+    Keeps track of the characteristics each connection subscribed to, and
+    sends EVENT messages to those connections when the characteristics change.
+
+    Changes are pushed by the accessory server, or by the state owner when
+    running in a worker process. In the latter case the state owner is told
+    which characteristics any connection of this worker subscribed to.
+
+    Changes are queued per connection and sent window seconds after the first
+    one, so changes in between are merged into a single message, keeping only
+    the latest value of each characteristic. A window of zero merges the
+    changes made in the same event loop iteration. On top of that, events for
+    a characteristic are sent to a connection at most once per minimum
+    interval, which defaults to min_interval and can be set per
+    characteristic in min_intervals.
+    """
+
+    def __init__(
+        self,
+        server: "AccessoryServer | StateClient | None" = None,
+        *,
+        window: float = 0.0,
+        min_interval: float = 0.0,
+    ) -> None:
+        self.server = server
+        self.window = window
+        self.min_interval = min_interval
+        self.min_intervals: dict[Key, float] = {}
+        self.sent = 0
+        self.suppressed = 0
+        self._subscribers: dict[Key, set[Connection]] = {}
+        self._subscriptions: dict[Connection, set[Key]] = {}
+
+        # Changes not sent yet and when each characteristic was last sent,
+        # per connection
+        self._pending: dict[Connection, dict[Key, Any]] = {}
+        self._sent_at: dict[Connection, dict[Key, float]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_at = 0.0
+
+        if isinstance(server, StateClient):
+            server.on_event = self.publish
+        elif server is not None:
+            server.listeners.append(self.publish)
+
+    def subscriptions(self, connection: Connection) -> frozenset[Key]:
+        """
+        Get the characteristics a connection is subscribed to.
+        """
+
+        return frozenset(self._subscriptions.get(connection, ()))
+
+    async def subscribe(self, connection: Connection, ids: Iterable[Key]) -> None:
+        subscriptions = self._subscriptions.setdefault(connection, set())
+        added = []
+        for key in ids:
+            if (subscribers := self._subscribers.get(key)) is None:
+                subscribers = self._subscribers[key] = set()
+                added.append(key)
+            subscribers.add(connection)
+            subscriptions.add(key)
+        connection.subscribed = bool(subscriptions)
+
+        if added and isinstance(self.server, StateClient):
+            await self.server.subscribe(added)
+
+    async def unsubscribe(self, connection: Connection, ids: Iterable[Key]) -> None:
+        if (subscriptions := self._subscriptions.get(connection)) is None:
+            return
+
+        pending = self._pending.get(connection, {})
+        sent_at = self._sent_at.get(connection, {})
+        removed = []
+        for key in ids:
+            if key not in subscriptions:
+                continue
+            subscriptions.remove(key)
+            pending.pop(key, None)
+            sent_at.pop(key, None)
+            subscribers = self._subscribers[key]
+            subscribers.remove(connection)
+            if not subscribers:
+                del self._subscribers[key]
+                removed.append(key)
+        if not subscriptions:
+            connection.subscribed = False
+            del self._subscriptions[connection]
+            self._pending.pop(connection, None)
+            self._sent_at.pop(connection, None)
+
+        if removed and isinstance(self.server, StateClient):
+            await self.server.unsubscribe(removed)
+
+    async def drop(self, connection: Connection) -> None:
+        """
+        Remove all subscriptions of a connection, e.g. once it's closed.
+        """
+
+        await self.unsubscribe(
+            connection, list(self._subscriptions.get(connection, ()))
+        )
+
+    def publish(self, updates: list[Update], origin: Any = None) -> None:
+        """
+        Queue changed characteristics for their subscribers, except for the
+        connection with the ID origin, that made the changes itself.
+        """
+
+        queued = False
+        for aid, iid, value in updates:
+            key = (aid, iid)
+            for connection in self._subscribers.get(key, ()):
+                if connection.id == origin:
+                    # Whatever was queued is older than the connection's own
+                    # change, so it mustn't be sent after it
+                    if (pending := self._pending.get(connection)) and key in pending:
+                        del pending[key]
+                        self._suppress(connection)
+                    continue
+
+                pending = self._pending.setdefault(connection, {})
+                if key in pending:
+                    self._suppress(connection)
+                pending[key] = value
+                queued = True
+
+        if queued:
+            self._schedule(asyncio.get_running_loop().time() + self.window)
+
+    # Internal helpers
+
+    def _suppress(self, connection: Connection) -> None:
+        connection.events_suppressed += 1
+        self.suppressed += 1
+
+    def _schedule(self, when: float) -> None:
+        if self._flush_handle is not None:
+            if self._flush_at <= when:
+                return
+            self._flush_handle.cancel()
+        self._flush_at = when
+        self._flush_handle = asyncio.get_running_loop().call_at(when, self._flush)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        now = asyncio.get_running_loop().time()
+        retry_at = math.inf
+
+        # Connections with the same changes due share a single message
+        messages: dict[tuple[tuple[Key, Any], ...], bytes] = {}
+        for connection, pending in list(self._pending.items()):
+            if not pending or connection.writer.is_closing():
+                del self._pending[connection]
+                continue
+
+            sent_at = self._sent_at.setdefault(connection, {})
+            due = []
+            for key, value in pending.items():
+                interval = self.min_intervals.get(key, self.min_interval)
+                if interval and (last := sent_at.get(key)) is not None:
+                    if now < last + interval:
+                        retry_at = min(retry_at, last + interval)
+                        continue
+                due.append((key, value))
+            if not due:
+                continue
+
+            for key, _ in due:
+                del pending[key]
+                sent_at[key] = now
+            if not pending:
+                del self._pending[connection]
+
+            message_key = tuple(due)
+            if (message := messages.get(message_key)) is None:
+                body = encode_events((aid, iid, value) for (aid, iid), value in due)
+                message = messages[message_key] = EVENT_HEAD % len(body) + body
+            connection.writer.write(message)
+            connection.bytes_sent += len(message)
+            connection.events_sent += 1
+            self.sent += 1
+
+        if retry_at < math.inf:
+            self._schedule(retry_at)
@@ -1,33 +1,124 @@
 import json
-from dataclasses import dataclass, field
-from functools import cached_property
-from typing import Any
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Sequence
+from urllib.parse import parse_qs, unquote
 
 from .. import tlv
 from ..crypto.srp import Server as SRPServer
 
+if TYPE_CHECKING:
+    from ..ipc import StateClient
+    from ..server import AccessoryServer
+    from .app import App
+    from .connections import Connection
+    from .events import EventHub
+
 
 @dataclass
 class Session:
     srp: SRPServer | None = None
 
 
-@dataclass(kw_only=True)
 class Request:
-    method: str
-    path: str
-    body: bytes
-    query: dict[str, list[str]] = field(default_factory=dict)
-    headers: tuple[tuple[bytes, bytes], ...] = ()
+    """
+    An incoming request.
+
+    The request target and headers are kept as received, and the path, query
+    parameters and header lookups are only decoded when they're first used.
+    """
+
+    __slots__ = (
+        "method",
+        "target",
+        "headers",
+        "body",
+        "session",
+        "connection",
+        "app",
+        "deadline",
+        "_path",
+        "_query",
+        "_header_index",
+    )
+
+    def __init__(
+        self,
+        *,
+        method: str,
+        target: bytes,
+        body: bytes,
+        session: Session,
+        headers: Sequence[tuple[bytes, bytes]] = (),
+        connection: "Connection | None" = None,
+    ) -> None:
+        self.method = method
+        self.target = target
+        self.headers = headers
+        self.body = body
+        self.session = session
+        self.connection = connection
+        self.app: App | None = None
+        # When handling the request should be given up on, in event loop time
+        self.deadline: float | None = None
+        self._path: str | None = None
+        self._query: dict[str, list[str]] | None = None
+        self._header_index: dict[bytes, bytes] | None = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__qualname__} {self.method} {self.target!r}>"
+
+    @property
+    def server(self) -> "AccessoryServer | StateClient":
+        """
+        The accessory server of the app handling the request.
+        """
+
+        if self.app is None or self.app.server is None:
+            raise LookupError("The request is not handled by an accessory server")
+        return self.app.server
+
+    @property
+    def events(self) -> "EventHub":
+        """
+        The event notifications of the app handling the request.
+        """
+
+        if self.app is None:
+            raise LookupError("The request is not handled by an app")
+        return self.app.events
 
-    session: Session
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            path = self.target.partition(b"?")[0].decode()
+            self._path = unquote(path) if "%" in path else path
+        return self._path
 
-    @cached_property
+    @property
+    def query_string(self) -> bytes:
+        return self.target.partition(b"?")[2]
+
+    @property
+    def query(self) -> dict[str, list[str]]:
+        if self._query is None:
+            self._query = parse_query(self.query_string)
+        return self._query
+
+    def header(self, name: bytes) -> bytes | None:
+        """
+        Get the value of a header by its lowercase name. If the header is
+        repeated, the first value is returned.
+        """
+
+        if self._header_index is None:
+            self._header_index = {
+                key.lower(): value for key, value in reversed(self.headers)
+            }
+        return self._header_index.get(name)
+
+    @property
     def content_type(self) -> bytes | None:
-        return next(
-            (value for key, value in self.headers if key == b"content-type"),
-            None,
-        )
+        return self.header(b"content-type")
 
     def tlv(self) -> list[tlv.TLV[Any]]:
         if self.content_type != b"application/pairing+tlv8":
@@ -36,7 +127,25 @@ class Request:
         return tlv.decode(self.body)
 
     def json(self) -> Any:
-        if self.content_type != b"application/json":
+        if self.content_type not in (b"application/json", b"application/hap+json"):
             raise ValueError("Request does not contain JSON data")
 
         return json.loads(self.body)
+
+
+def parse_query(query_string: bytes) -> dict[str, list[str]]:
+    """
+    Parse a query string. Query strings without any escaped characters, like
+    the "id=1.2,1.3&ev=1" queries used for characteristics, are split directly
+    rather than going through urllib's parsing.
+    """
+
+    if b"%" in query_string or b"+" in query_string:
+        return parse_qs(query_string.decode(), keep_blank_values=True)
+
+    query: dict[str, list[str]] = {}
+    for pair in query_string.decode().split("&"):
+        if pair:
+            key, _, value = pair.partition("=")
+            query.setdefault(key, []).append(value)
+    return query
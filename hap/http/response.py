@@ -1,7 +1,7 @@
-import json
 from typing import Any
 
 from .. import tlv
+from .encoder import dumps
 
 
 class Response:
@@ -19,6 +19,15 @@ class Response:
             self.headers += headers.items()
 
 
+class HAPResponse(Response):
+    """
+    A response with an already encoded HAP JSON body.
+    """
+
+    def __init__(self, body: bytes, status: int = 200) -> None:
+        super().__init__(body, status=status, content_type="application/hap+json")
+
+
 class BadRequest(Response):
     def __init__(self, body: bytes) -> None:
         super().__init__(body, status=400, content_type="text/plain")
@@ -31,9 +40,7 @@ class UnprocessableEntity(Response):
 
 class JSONResponse(Response):
     def __init__(self, data: Any, status: int = 200) -> None:
-        super().__init__(
-            json.dumps(data).encode(), status=status, content_type="application/json"
-        )
+        super().__init__(dumps(data), status=status, content_type="application/json")
 
 
 class TLVResponse(Response):
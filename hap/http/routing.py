@@ -0,0 +1,133 @@
+"""
+Routing of requests to handlers.
+
+Routes are compiled into a single dispatch table that maps (method, path) to
+a handler with all its middleware already applied, so dispatching a request
+is a single dictionary lookup no matter how many routes and middleware there
+are.
+"""
+
+from functools import partial
+from typing import Awaitable, Callable, Iterable, NamedTuple, Protocol
+
+from .request import Request
+from .response import Response
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class Middleware(Protocol):
+    """
+    A middleware is called with the request and the next handler in the chain,
+    which it must be able to take as the handler keyword argument.
+    """
+
+    def __call__(self, request: Request, *, handler: Handler) -> Awaitable[Response]:
+        ...
+
+
+RESPONSE_404 = Response(status=404, body=b"", content_type="text/plain")
+
+
+class Route(NamedTuple):
+    path: str
+    handler: Handler
+    methods: tuple[str, ...] = ("GET",)
+    middleware: tuple[Middleware, ...] = ()
+
+
+class Router:
+    """
+    A collection of routes and an ordered chain of middleware.
+
+    Middleware are async callables that take the request and the next handler
+    in the chain, and are applied in the order they're added, so the first
+    middleware is the outermost one. Routes can add their own middleware,
+    which are applied inside the router's middleware.
+    """
+
+    def __init__(
+        self, routes: Iterable[Route] = (), middleware: Iterable[Middleware] = ()
+    ) -> None:
+        self.routes: list[Route] = list(routes)
+        self.middleware: list[Middleware] = list(middleware)
+        self._table: dict[tuple[str, str], Handler] | None = None
+        self._method_not_allowed: dict[str, Handler] = {}
+        self._not_found: Handler | None = None
+
+    def add(
+        self,
+        path: str,
+        handler: Handler,
+        methods: Iterable[str] = ("GET",),
+        middleware: Iterable[Middleware] = (),
+    ) -> None:
+        self.routes.append(Route(path, handler, tuple(methods), tuple(middleware)))
+        self._table = None
+
+    def use(self, middleware: Middleware) -> None:
+        """
+        Add a middleware to the end of the chain.
+        """
+
+        self.middleware.append(middleware)
+        self._table = None
+
+    def compile(self) -> None:
+        """
+        Build the dispatch table. This is done automatically on the first
+        request after the routes or middleware have changed.
+        """
+
+        table: dict[tuple[str, str], Handler] = {}
+        allowed: dict[str, set[str]] = {}
+
+        for route in self.routes:
+            handler = self._wrap(route.handler, route.middleware)
+            for method in route.methods:
+                table[(method, route.path)] = handler
+                allowed.setdefault(route.path, set()).add(method)
+
+                # HEAD requests are handled as GET requests
+                if method == "GET":
+                    table.setdefault(("HEAD", route.path), handler)
+                    allowed[route.path].add("HEAD")
+
+        self._method_not_allowed = {
+            path: self._wrap(partial(_method_not_allowed, ", ".join(sorted(methods))))
+            for path, methods in allowed.items()
+        }
+        self._not_found = self._wrap(_not_found)
+        self._table = table
+
+    def resolve(self, method: str, path: str) -> Handler:
+        """
+        Find the handler for a request. Requests without a matching route are
+        given a handler that responds with 404 or 405, as appropriate.
+        """
+
+        if self._table is None:
+            self.compile()
+            assert self._table is not None
+
+        if handler := self._table.get((method, path)):
+            return handler
+
+        if handler := self._method_not_allowed.get(path):
+            return handler
+
+        assert self._not_found is not None
+        return self._not_found
+
+    def _wrap(self, handler: Handler, middleware: Iterable[Middleware] = ()) -> Handler:
+        for wrapper in reversed((*self.middleware, *middleware)):
+            handler = partial(wrapper, handler=handler)
+        return handler
+
+
+async def _not_found(request: Request) -> Response:
+    return RESPONSE_404
+
+
+async def _method_not_allowed(allow: str, request: Request) -> Response:
+    return Response(status=405, body=b"", content_type="text/plain", allow=allow)
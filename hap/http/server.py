@@ -1,13 +1,15 @@
 import asyncio
 import contextlib
+import importlib
 import logging
-from asyncio import ALL_COMPLETED, StreamReader, StreamWriter
+import socket
+from asyncio import StreamReader, StreamWriter
 from typing import AsyncIterator
-from urllib.parse import parse_qs, unquote
 
 import h11
 
 from .app import App
+from .connections import Connection, ConnectionManager
 from .request import Request, Session
 from .response import Response
 
@@ -15,11 +17,19 @@ logger = logging.getLogger("hap.http")
 
 
 async def handle_connection(
-    reader: StreamReader, writer: StreamWriter, *, app: App
+    reader: StreamReader,
+    writer: StreamWriter,
+    *,
+    app: App,
+    client: Connection | None = None,
+    manager: ConnectionManager | None = None,
 ) -> None:
     """
     Handle an incoming connection. This coroutine will run for as long as the
     connection is alive.
+
+    If a client connection and its manager are given, the client's counters
+    and activity are kept up to date while the connection is being handled.
     """
 
     # Every new connection starts out with a clean connection and session state
@@ -31,7 +41,12 @@ async def handle_connection(
         while True:
             event = connection.next_event()
             if event is h11.NEED_DATA:
-                data = await asyncio.wait_for(reader.read(1024), timeout=1000)
+                # Idle connections are closed by their manager
+                data = await reader.read(1024)
+                if client:
+                    client.bytes_received += len(data)
+                    if manager:
+                        manager.touch(client)
                 connection.receive_data(data)
                 continue
 
@@ -63,9 +78,12 @@ async def handle_connection(
         ]
 
         try:
-            for event in events:
-                if data := connection.send(event):
-                    writer.write(data)
+            # Write the whole response at once, so it can go out in a single
+            # segment rather than one for the head and one for the body
+            data = b"".join(connection.send(event) or b"" for event in events)
+            writer.write(data)
+            if client:
+                client.bytes_sent += len(data)
             await writer.drain()
         except Exception:
             connection.send_failed()
@@ -94,16 +112,19 @@ async def handle_connection(
         """Handle a received request"""
         body = await read_body()
 
-        path, _, query_string = event.target.partition(b"?")
         request = Request(
             method=event.method.decode(),
-            path=unquote(path.decode()),
-            query=parse_qs(query_string.decode(), keep_blank_values=True),
-            headers=tuple(event.headers),
+            target=event.target,
+            headers=event.headers,
             body=body,
             session=session,
+            connection=client,
         )
 
+        if client:
+            client.requests += 1
+            client.busy = True
+
         # Call the application to handle the request
         try:
             response = await app(request)
@@ -112,7 +133,13 @@ async def handle_connection(
             response = Response(body=b"", status=500, content_type="text/html")
 
         # Send the response
-        await send(response)
+        try:
+            await send(response)
+        finally:
+            if client:
+                client.busy = False
+                if manager:
+                    manager.touch(client)
 
         connection.start_next_cycle()
 
@@ -135,40 +162,71 @@ async def handle_connection(
         await maybe_send_error(
             status=e.error_status_hint, body=b"Unexpected data received"
         )
-    except asyncio.TimeoutError:
-        logger.info("Timeout error, closing connection")
-        await maybe_send_error(status=408, body=b"Timeout")
     except Exception:
         logger.exception("An error occured")
         await maybe_send_error(status=500, body=b"An error occured")
     finally:
-        if writer.can_write_eof():
+        if client:
+            try:
+                await app.events.drop(client)
+            except Exception:
+                logger.exception("Failed to drop event subscriptions")
+
+        # The connection might already have been closed by the connection
+        # manager, in which case there's nothing more to write
+        if writer.can_write_eof() and not writer.is_closing():
             writer.write_eof()
             await writer.drain()
 
 
 @contextlib.asynccontextmanager
 async def serve(
-    *, host: str = "127.0.0.1", port: int = 8080
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    app: App | None = None,
+    connections: ConnectionManager | None = None,
+    reuse_port: bool = False,
+    nodelay: bool = True,
+    keepalive: bool = True,
 ) -> AsyncIterator[asyncio.Server]:
+    """
+    Serve the application on the given host and port. Open connections are
+    tracked by the given connection manager, or a default one if not set.
+
+    Set reuse_port to let multiple processes accept connections on the same
+    port, see hap.http.workers. The nodelay and keepalive flags control the
+    TCP_NODELAY and SO_KEEPALIVE options of accepted sockets.
+
+    The event loop to serve on is picked when the loop is created, see
+    install_event_loop_policy().
+    """
 
-    app = App()
-    tasks = []
+    application = app if app is not None else App()
+    manager = connections if connections is not None else ConnectionManager()
 
     async def connection_made(reader: StreamReader, writer: StreamWriter) -> None:
-        if task := asyncio.current_task():
-            tasks.append(task)
-            task.set_name(f"Request handler {len(tasks)}")
+        if (connection := manager.open(writer)) is None:
+            logger.warning("Connection limit reached, rejecting connection")
+            writer.close()
+            return
+
+        if connection.task:
+            connection.task.set_name(f"Request handler {connection.id}")
+        if sock := writer.get_extra_info("socket"):
+            configure_socket(sock, nodelay=nodelay, keepalive=keepalive)
         try:
-            await handle_connection(reader, writer, app=app)
+            await handle_connection(
+                reader, writer, app=application, client=connection, manager=manager
+            )
         except Exception:
             logger.exception("An error occured while handling a request")
+        finally:
+            manager.close(connection)
 
-        # Remove task again when we're done
-        if task:
-            tasks.remove(task)
-
-    server = await asyncio.start_server(connection_made, host, port)
+    server = await asyncio.start_server(
+        connection_made, host, port, reuse_port=reuse_port or None
+    )
 
     try:
         async with server:
@@ -177,10 +235,56 @@ async def serve(
     except asyncio.CancelledError:
         pass
     finally:
-        for task in tasks:
-            task.cancel()
-        if tasks:
-            await asyncio.wait(tasks, return_when=ALL_COMPLETED)
+        await manager.close_all()
+
+
+def configure_socket(sock: socket.socket, *, nodelay: bool, keepalive: bool) -> None:
+    """
+    Tune an accepted socket for small, latency sensitive request/response
+    traffic.
+    """
+
+    if sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(nodelay))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, int(keepalive))
+    if keepalive and hasattr(socket, "TCP_KEEPIDLE"):
+        # Detect dead controllers within a couple of minutes, rather than the
+        # system default of two hours
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 6)
+
+
+EVENT_LOOPS = ("auto", "asyncio", "uvloop")
+
+
+def install_event_loop_policy(loop: str = "auto") -> str:
+    """
+    Install the event loop policy to use for new event loops, and return the
+    name of the event loop that will be used. This must be called before the
+    event loop is started, e.g. before calling asyncio.run().
+
+    "auto" uses uvloop if it's installed and the default asyncio event loop
+    if not, while "uvloop" requires uvloop to be installed.
+    """
+
+    if loop not in EVENT_LOOPS:
+        raise ValueError(f"Unknown event loop: {loop}")
+
+    if loop != "asyncio":
+        try:
+            uvloop = importlib.import_module("uvloop")
+        except ImportError:
+            if loop == "uvloop":
+                raise
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            return "uvloop"
+
+    asyncio.set_event_loop_policy(None)
+    return "asyncio"
 
 
 async def main() -> None:
@@ -190,4 +294,5 @@ async def main() -> None:
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
+    logger.info("Using the %s event loop", install_event_loop_policy())
     asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Multi-process serving of an accessory server.
+
+The accessory server and all of its state is owned by the main process, while
+a number of worker processes accept controller connections on a shared port.
+The workers do all the HTTP framing and parsing and forward characteristic
+reads, writes and event subscriptions to the state owner, see hap.ipc.
+"""
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import tempfile
+from multiprocessing.process import BaseProcess
+from typing import AsyncIterator
+
+from ..ipc import StateClient, StateOwner
+from ..server import AccessoryServer
+from .app import App
+from .server import serve
+
+logger = logging.getLogger("hap.http")
+
+
+@contextlib.asynccontextmanager
+async def serve_workers(
+    server: AccessoryServer,
+    *,
+    workers: int | None = None,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+) -> AsyncIterator[list[BaseProcess]]:
+    """
+    Serve the accessory server from a number of worker processes, defaulting
+    to one per CPU. This process stays the owner of the accessory state for as
+    long as the context manager is active.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    owner = StateOwner(server)
+
+    with tempfile.TemporaryDirectory(prefix="hap-") as directory:
+        path = os.path.join(directory, "state.sock")
+        state_server = await owner.start(path)
+
+        # Use spawn rather than fork, as forking a process with a running
+        # event loop is not safe
+        context = multiprocessing.get_context("spawn")
+        processes: list[BaseProcess] = [
+            context.Process(
+                target=run_worker,
+                args=(path, host, port),
+                name=f"hap-worker-{i}",
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            async with state_server:
+                yield processes
+        finally:
+            for process in processes:
+                process.terminate()
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *(loop.run_in_executor(None, process.join) for process in processes)
+            )
+
+
+def run_worker(path: str, host: str, port: int) -> None:
+    """
+    Entry point of the worker processes.
+    """
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_worker(path, host, port))
+
+
+async def _worker(path: str, host: str, port: int) -> None:
+    client = await StateClient.connect(path)
+    logger.info("Worker %d connected to state owner", os.getpid())
+    try:
+        async with serve(
+            host=host, port=port, app=App(server=client), reuse_port=True
+        ) as server:
+            await server.serve_forever()
+    finally:
+        await client.close()
@@ -0,0 +1,98 @@
+"""
+Stable instance IDs of services and characteristics.
+
+Controllers cache the attribute database, and identify services and
+characteristics by their aid and instance ID. If the instance IDs change,
+e.g. because a service was added to an accessory, controllers see a new
+configuration and have to fetch the whole database again.
+
+The InstanceIdAllocator assigns each service and characteristic an instance
+ID based on what it is, that is its service type and characteristic type and
+which occurrence of those types it is, and keeps it. The allocated IDs are
+persisted through the backend, so they're the same after a restart.
+"""
+
+from typing import Callable, Sequence
+
+from .accessories.base import ServiceSpec
+from .backends import Backend
+
+
+class InstanceIdAllocator:
+    """
+    Allocates instance IDs by their key, that is the aid, service type,
+    characteristic type and the index of the occurrence of those types.
+
+    Instance IDs of services and characteristics that no longer exist aren't
+    reused, new ones always get the next instance ID of their accessory.
+    Services and characteristics of the same type are told apart by their
+    order, so new ones should be added after the existing ones of their type.
+    """
+
+    def __init__(self, instance_ids: dict[str, dict[str, int]] | None = None) -> None:
+        # Instance IDs by their key, by aid
+        self.instance_ids = instance_ids if instance_ids is not None else {}
+
+        # Whether any instance IDs were allocated since they were loaded or saved
+        self.changed = False
+
+    @classmethod
+    async def load(cls, backend: Backend) -> "InstanceIdAllocator":
+        """
+        Create an allocator with the instance IDs stored in a backend.
+        """
+
+        return cls(await backend.load_instance_ids())
+
+    async def save(self, backend: Backend) -> None:
+        """
+        Store the instance IDs in a backend, if any were allocated.
+        """
+
+        if self.changed:
+            await backend.store_instance_ids(self.instance_ids)
+            self.changed = False
+
+    def allocate(self, aid: int, services: Sequence[ServiceSpec]) -> Callable[[], int]:
+        """
+        Allocate the instance IDs of an accessory with the given services. The
+        returned callable is passed as get_instance_id to Service.from_spec()
+        for each of the services, in order.
+        """
+
+        ids = self.instance_ids.setdefault(str(aid), {})
+        next_iid = max(ids.values(), default=0) + 1
+        allocated: list[int] = []
+
+        def get(key: str) -> None:
+            nonlocal next_iid
+            if (iid := ids.get(key)) is None:
+                iid = ids[key] = next_iid
+                next_iid += 1
+                self.changed = True
+            allocated.append(iid)
+
+        service_counts: dict[str, int] = {}
+        for spec in services:
+            service_key = _occurrence(service_counts, str(spec.type.uuid))
+            get(service_key)
+
+            char_counts: dict[str, int] = {}
+            for char_spec in spec.characteristics:
+                char_key = _occurrence(char_counts, str(char_spec.type.uuid))
+                get(f"{service_key}/{char_key}")
+
+        return iter(allocated).__next__
+
+    def forget(self, aid: int) -> None:
+        """
+        Forget the instance IDs of an accessory that was removed for good.
+        """
+
+        if self.instance_ids.pop(str(aid), None) is not None:
+            self.changed = True
+
+
+def _occurrence(counts: dict[str, int], uuid: str) -> str:
+    index = counts[uuid] = counts.get(uuid, -1) + 1
+    return f"{uuid}:{index}"
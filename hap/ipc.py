@@ -0,0 +1,523 @@
+"""
+A compact binary protocol for sharing accessory state between processes.
+
+In multi-process mode a single state owner process holds the accessory server
+and its state, while worker processes handle the controller connections. The
+workers forward characteristic reads, writes and event subscriptions to the
+owner over a Unix socket using this protocol.
+
+Every frame starts with a fixed size header with the operation, a request ID
+and the length of the payload. Requests are answered with a REPLY (or ERROR)
+frame carrying the same request ID, while EVENT frames are pushed from the
+owner. The request ID of an EVENT frame is the worker's connection that caused
+the change, if any, and zero otherwise.
+"""
+
+import asyncio
+import contextlib
+import enum
+import itertools
+import logging
+import struct
+from asyncio import StreamReader, StreamWriter
+from typing import Any, Callable, Collection, Iterable, NamedTuple
+
+from .http import encoder
+from .http.encoder import ReadFlags
+from .server import AccessoryServer, Status, Update, Write
+
+logger = logging.getLogger("hap.ipc")
+
+HEADER = struct.Struct("!BII")
+ID = struct.Struct("!QQ")
+STATUS = struct.Struct("!i")
+LENGTH = struct.Struct("!I")
+INT = struct.Struct("!q")
+UINT = struct.Struct("!Q")
+FLOAT = struct.Struct("!d")
+PREPARE = struct.Struct("!Qd")
+PID = struct.Struct("!?Q")
+ORIGIN = struct.Struct("!Q")
+# Read flags, whether subscribed IDs follow the read IDs, and the number of
+# read IDs
+READ = struct.Struct("!B?I")
+# Deadlines are sent as the time remaining, as the event loop clocks of the
+# processes aren't comparable
+DEADLINE = struct.Struct("!?d")
+
+# IDs are unsigned 64-bit integers. Any that don't fit, e.g. the negative IDs
+# of a malformed request, can't exist, but have to be reported back as given.
+# They're sent as an aid of MAX_ID followed by both IDs as strings.
+MAX_ID = 2**64 - 1
+ESCAPED_ID = ID.pack(MAX_ID, 0)
+
+
+class Op(enum.IntEnum):
+    SUBSCRIBE = 1
+    UNSUBSCRIBE = 2
+    EVENT = 3
+    REPLY = 4
+    ERROR = 5
+    DATABASE = 6
+    GET_CHARACTERISTICS = 7
+    PUT_CHARACTERISTICS = 8
+    PREPARE = 9
+
+
+class Tag(enum.IntEnum):
+    NONE = 0
+    FALSE = 1
+    TRUE = 2
+    INT = 3
+    FLOAT = 4
+    STR = 5
+    BYTES = 6
+    UINT = 7
+
+
+class ProtocolError(Exception):
+    pass
+
+
+# Encoding and decoding of payloads
+
+
+def encode_value(buffer: bytearray, value: Any) -> None:
+    if value is None:
+        buffer.append(Tag.NONE)
+    elif value is True:
+        buffer.append(Tag.TRUE)
+    elif value is False:
+        buffer.append(Tag.FALSE)
+    elif isinstance(value, int):
+        if -(2**63) <= value < 2**63:
+            buffer.append(Tag.INT)
+            buffer += INT.pack(value)
+        elif 0 <= value <= MAX_ID:
+            # Only valid for the uint64 format
+            buffer.append(Tag.UINT)
+            buffer += UINT.pack(value)
+        else:
+            raise ProtocolError(f"Integer out of range: {value}")
+    elif isinstance(value, float):
+        buffer.append(Tag.FLOAT)
+        buffer += FLOAT.pack(value)
+    elif isinstance(value, str):
+        try:
+            data = value.encode("utf-8")
+        except UnicodeEncodeError:
+            # Lone surrogates, which JSON allows in strings
+            raise ProtocolError("Unable to encode string") from None
+        buffer.append(Tag.STR)
+        buffer += LENGTH.pack(len(data))
+        buffer += data
+    elif isinstance(value, bytes):
+        buffer.append(Tag.BYTES)
+        buffer += LENGTH.pack(len(value))
+        buffer += value
+    else:
+        raise ProtocolError(f"Unable to encode value of type {type(value)}")
+
+
+def decode_value(data: bytes, offset: int) -> tuple[Any, int]:
+    match data[offset]:
+        case Tag.NONE:
+            return None, offset + 1
+        case Tag.TRUE:
+            return True, offset + 1
+        case Tag.FALSE:
+            return False, offset + 1
+        case Tag.INT:
+            return INT.unpack_from(data, offset + 1)[0], offset + 1 + INT.size
+        case Tag.UINT:
+            return UINT.unpack_from(data, offset + 1)[0], offset + 1 + UINT.size
+        case Tag.FLOAT:
+            return FLOAT.unpack_from(data, offset + 1)[0], offset + 1 + FLOAT.size
+        case Tag.STR | Tag.BYTES as tag:
+            (length,) = LENGTH.unpack_from(data, offset + 1)
+            start = offset + 1 + LENGTH.size
+            value = data[start : start + length]
+            return value.decode("utf-8") if tag == Tag.STR else value, start + length
+        case tag:
+            raise ProtocolError(f"Unknown value tag: {tag}")
+
+
+def encode_deadline(deadline: float | None) -> bytes:
+    if deadline is None:
+        return DEADLINE.pack(False, 0.0)
+    return DEADLINE.pack(True, deadline - asyncio.get_running_loop().time())
+
+
+def decode_deadline(data: bytes) -> float | None:
+    limited: bool
+    remaining: float
+    limited, remaining = DEADLINE.unpack_from(data)
+    if not limited:
+        return None
+    return asyncio.get_running_loop().time() + remaining
+
+
+def encode_id(buffer: bytearray, aid: int, iid: int) -> None:
+    if 0 <= aid < MAX_ID and 0 <= iid <= MAX_ID:
+        buffer += ID.pack(aid, iid)
+    else:
+        buffer += ESCAPED_ID
+        encode_value(buffer, str(aid))
+        encode_value(buffer, str(iid))
+
+
+def decode_id(data: bytes, offset: int) -> tuple[int, int, int]:
+    aid, iid = ID.unpack_from(data, offset)
+    offset += ID.size
+    if aid == MAX_ID:
+        aid, offset = decode_value(data, offset)
+        iid, offset = decode_value(data, offset)
+        return int(aid), int(iid), offset
+    return aid, iid, offset
+
+
+def encode_ids(ids: Iterable[tuple[int, int]]) -> bytes:
+    buffer = bytearray()
+    for aid, iid in ids:
+        encode_id(buffer, aid, iid)
+    return bytes(buffer)
+
+
+def decode_ids(
+    data: bytes, offset: int = 0, count: int | None = None
+) -> tuple[list[tuple[int, int]], int]:
+    """
+    Decode count IDs starting at offset, or all remaining ones if count is
+    None. Returns the IDs and the offset after them.
+    """
+
+    ids: list[tuple[int, int]] = []
+    while len(ids) != count and offset < len(data):
+        aid, iid, offset = decode_id(data, offset)
+        ids.append((aid, iid))
+    return ids, offset
+
+
+def encode_updates(updates: Iterable[Update]) -> bytes:
+    buffer = bytearray()
+    for aid, iid, value in updates:
+        encode_id(buffer, aid, iid)
+        encode_value(buffer, value)
+    return bytes(buffer)
+
+
+def decode_updates(data: bytes) -> list[Update]:
+    updates = []
+    offset = 0
+    while offset < len(data):
+        aid, iid, offset = decode_id(data, offset)
+        value, offset = decode_value(data, offset)
+        updates.append((aid, iid, value))
+    return updates
+
+
+def encode_writes(writes: Iterable[Write]) -> tuple[bytes, list[int]]:
+    """
+    Encode writes, leaving out those whose value can't be encoded, like lists,
+    which aren't valid for any format. Returns the encoded writes and the
+    indexes of the writes that were left out.
+    """
+
+    buffer = bytearray()
+    rejected = []
+    for index, (aid, iid, value, ev) in enumerate(writes):
+        start = len(buffer)
+        try:
+            encode_id(buffer, aid, iid)
+            encode_value(buffer, value)
+            encode_value(buffer, ev)
+        except ProtocolError:
+            del buffer[start:]
+            rejected.append(index)
+    return bytes(buffer), rejected
+
+
+def decode_writes(data: bytes) -> list[Write]:
+    writes = []
+    offset = 0
+    while offset < len(data):
+        aid, iid, offset = decode_id(data, offset)
+        value, offset = decode_value(data, offset)
+        ev, offset = decode_value(data, offset)
+        writes.append(Write(aid, iid, value, ev))
+    return writes
+
+
+def encode_statuses(statuses: Iterable[int]) -> bytes:
+    return b"".join(STATUS.pack(status) for status in statuses)
+
+
+def decode_statuses(data: bytes) -> list[Status]:
+    return [Status(status) for (status,) in STATUS.iter_unpack(data)]
+
+
+# Framing
+
+
+async def read_frame(reader: StreamReader) -> tuple[Op, int, bytes]:
+    op, request_id, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    payload = await reader.readexactly(length) if length else b""
+    return Op(op), request_id, payload
+
+
+def write_frame(writer: StreamWriter, op: Op, request_id: int, payload: bytes) -> None:
+    writer.write(HEADER.pack(op, request_id, len(payload)) + payload)
+
+
+# State owner
+
+
+class Origin(NamedTuple):
+    """
+    The worker connection that writes are performed for.
+    """
+
+    worker: StreamWriter
+    connection: int
+
+
+class StateOwner:
+    """
+    Serves the state of an accessory server to worker processes.
+    """
+
+    def __init__(self, server: AccessoryServer) -> None:
+        self.server = server
+        self.subscriptions: dict[StreamWriter, set[tuple[int, int]]] = {}
+        server.listeners.append(self.publish)
+
+    async def start(self, path: str) -> asyncio.AbstractServer:
+        return await asyncio.start_unix_server(self.handle, path)
+
+    async def handle(self, reader: StreamReader, writer: StreamWriter) -> None:
+        subscriptions = self.subscriptions[writer] = set()
+
+        # Requests are handled concurrently, so a slow write doesn't hold up
+        # other requests from the same worker
+        tasks: set[asyncio.Task[None]] = set()
+        try:
+            while True:
+                try:
+                    op, request_id, payload = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                task = asyncio.create_task(
+                    self.reply(writer, op, request_id, payload, subscriptions)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+            del self.subscriptions[writer]
+            writer.close()
+
+    async def reply(
+        self,
+        writer: StreamWriter,
+        op: Op,
+        request_id: int,
+        payload: bytes,
+        subscriptions: set[tuple[int, int]],
+    ) -> None:
+        try:
+            reply = await self.dispatch(writer, op, payload, subscriptions)
+        except Exception as e:
+            logger.exception("Failed to handle %s request", op.name)
+            write_frame(writer, Op.ERROR, request_id, str(e).encode())
+        else:
+            write_frame(writer, Op.REPLY, request_id, reply)
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
+
+    async def dispatch(
+        self,
+        writer: StreamWriter,
+        op: Op,
+        payload: bytes,
+        subscriptions: set[tuple[int, int]],
+    ) -> bytes:
+        match op:
+            case Op.SUBSCRIBE:
+                subscriptions.update(decode_ids(payload)[0])
+                return b""
+            case Op.UNSUBSCRIBE:
+                subscriptions.difference_update(decode_ids(payload)[0])
+                return b""
+            case Op.DATABASE:
+                return await self.server.get_attribute_database()
+            case Op.GET_CHARACTERISTICS:
+                deadline = decode_deadline(payload)
+                flags, has_events, count = READ.unpack_from(payload, DEADLINE.size)
+                ids, offset = decode_ids(payload, DEADLINE.size + READ.size, count)
+                success, body = await self.server.get_characteristics(
+                    ids,
+                    ReadFlags(flags),
+                    deadline,
+                    set(decode_ids(payload, offset)[0]) if has_events else None,
+                )
+                return bytes([success]) + body
+            case Op.PUT_CHARACTERISTICS:
+                deadline = decode_deadline(payload)
+                timed, pid = PID.unpack_from(payload, DEADLINE.size)
+                (connection,) = ORIGIN.unpack_from(payload, DEADLINE.size + PID.size)
+                # Only the statuses are sent back, the worker encodes the
+                # response itself
+                _, _, statuses = await self.server.put_characteristics(
+                    decode_writes(payload[DEADLINE.size + PID.size + ORIGIN.size :]),
+                    pid if timed else None,
+                    deadline,
+                    Origin(writer, connection) if connection else None,
+                )
+                return encode_statuses(statuses)
+            case Op.PREPARE:
+                status = await self.server.prepare_write(*PREPARE.unpack(payload))
+                return STATUS.pack(status)
+            case _:
+                raise ProtocolError(f"Unexpected operation: {op.name}")
+
+    def publish(self, updates: Iterable[Update], origin: Any = None) -> None:
+        """
+        Push value changes to all workers that have subscribed to them. The
+        worker the changes originate from is told which of its connections
+        made them.
+        """
+
+        updates = list(updates)
+        for writer, subscriptions in self.subscriptions.items():
+            if events := [
+                (aid, iid, value)
+                for aid, iid, value in updates
+                if (aid, iid) in subscriptions
+            ]:
+                connection = 0
+                if isinstance(origin, Origin) and origin.worker is writer:
+                    connection = origin.connection
+                write_frame(writer, Op.EVENT, connection, encode_updates(events))
+
+
+# Worker client
+
+
+class StateClient:
+    """
+    Client used by worker processes to access the state held by the owner.
+    """
+
+    def __init__(self, reader: StreamReader, writer: StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        # Called with value changes, and the ID of the connection of this
+        # worker that made them, if any
+        self.on_event: Callable[[list[Update], int | None], None] | None = None
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future[bytes]] = {}
+        self._task = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, path: str) -> "StateClient":
+        reader, writer = await asyncio.open_unix_connection(path)
+        return cls(reader, writer)
+
+    async def close(self) -> None:
+        self._task.cancel()
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def get_attribute_database(self) -> bytes:
+        return await self._request(Op.DATABASE, b"")
+
+    async def get_characteristics(
+        self,
+        ids: Iterable[tuple[int, int]],
+        flags: ReadFlags = ReadFlags(0),
+        deadline: float | None = None,
+        events: Collection[tuple[int, int]] | None = None,
+    ) -> tuple[bool, bytes]:
+        ids = list(ids)
+        payload = (
+            encode_deadline(deadline)
+            + READ.pack(flags, events is not None, len(ids))
+            + encode_ids(ids)
+            + encode_ids(events or ())
+        )
+        reply = await self._request(Op.GET_CHARACTERISTICS, payload)
+        return bool(reply[0]), reply[1:]
+
+    async def prepare_write(self, pid: int, ttl: float) -> Status:
+        reply = await self._request(Op.PREPARE, PREPARE.pack(pid, ttl))
+        return Status(STATUS.unpack(reply)[0])
+
+    async def put_characteristics(
+        self,
+        writes: Iterable[Write],
+        pid: int | None = None,
+        deadline: float | None = None,
+        origin: int | None = None,
+    ) -> tuple[bool, bytes, list[Status]]:
+        writes = list(writes)
+        encoded, rejected = encode_writes(writes)
+        payload = (
+            encode_deadline(deadline)
+            + PID.pack(pid is not None, pid or 0)
+            + ORIGIN.pack(origin or 0)
+            + encoded
+        )
+        statuses = decode_statuses(await self._request(Op.PUT_CHARACTERISTICS, payload))
+        for index in rejected:
+            statuses.insert(index, Status.INVALID_VALUE)
+        if all(status == Status.SUCCESS for status in statuses):
+            return True, b"", statuses
+        return (
+            False,
+            encoder.encode_statuses(
+                (write.aid, write.iid, status)
+                for write, status in zip(writes, statuses)
+            ),
+            statuses,
+        )
+
+    async def subscribe(self, ids: Iterable[tuple[int, int]]) -> None:
+        await self._request(Op.SUBSCRIBE, encode_ids(ids))
+
+    async def unsubscribe(self, ids: Iterable[tuple[int, int]]) -> None:
+        await self._request(Op.UNSUBSCRIBE, encode_ids(ids))
+
+    # Internal helpers
+
+    async def _request(self, op: Op, payload: bytes) -> bytes:
+        request_id = next(self._ids)
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        write_frame(self.writer, op, request_id, payload)
+        await self.writer.drain()
+        return await future
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                op, request_id, payload = await read_frame(self.reader)
+                if op is Op.EVENT:
+                    if self.on_event:
+                        self.on_event(decode_updates(payload), request_id or None)
+                    continue
+
+                if (future := self._pending.pop(request_id, None)) is None:
+                    logger.warning("Unexpected reply for request %d", request_id)
+                elif op is Op.ERROR:
+                    future.set_exception(ProtocolError(payload.decode()))
+                else:
+                    future.set_result(payload)
+        except asyncio.IncompleteReadError:
+            logger.error("Connection to the state owner was lost")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ProtocolError("Connection lost"))
+            self._pending.clear()
@@ -0,0 +1,100 @@
+"""
+Read-through caching of characteristic values from read providers.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from .accessories import BaseCharacteristic
+
+logger = logging.getLogger("hap.providers")
+
+Key = tuple[int, int]
+
+
+class ProviderCache:
+    """
+    Keeps track of when the value of each characteristic was last read from
+    its provider, and of the reads that are in progress.
+
+    Concurrent reads of the same characteristic share a single call to the
+    provider, whether they wait for it or are served a stale value while it
+    runs in the background.
+    """
+
+    def __init__(self) -> None:
+        self._read_at: dict[Key, float] = {}
+        self._reads: dict[Key, asyncio.Task[Any]] = {}
+
+    def use_cached(self, key: Key, characteristic: BaseCharacteristic[Any]) -> bool:
+        """
+        Check whether the cached value of a characteristic can be served. A
+        stale value that can still be served is refreshed in the background.
+        """
+
+        provider = characteristic.provider
+        assert provider is not None
+
+        if (read_at := self._read_at.get(key)) is None:
+            return False
+
+        age = asyncio.get_running_loop().time() - read_at
+        if age < provider.max_age:
+            return True
+        if age < provider.max_age + provider.stale_while_revalidate:
+            self.refresh(key, characteristic)
+            return True
+        return False
+
+    async def read(self, key: Key, characteristic: BaseCharacteristic[Any]) -> Any:
+        """
+        Get the value of a characteristic, reading it from its provider if
+        the cached value can't be served. Raises the exception of the provider
+        if the value had to be read and that failed.
+        """
+
+        if self.use_cached(key, characteristic):
+            return characteristic.value
+
+        # Don't cancel the read for everyone else if this caller goes away
+        return await asyncio.shield(self.refresh(key, characteristic))
+
+    def refresh(
+        self, key: Key, characteristic: BaseCharacteristic[Any]
+    ) -> asyncio.Task[Any]:
+        """
+        Start reading the value of a characteristic from its provider, unless
+        that's already in progress.
+        """
+
+        if (task := self._reads.get(key)) is None:
+            task = self._reads[key] = asyncio.create_task(
+                self._read(key, characteristic)
+            )
+            task.add_done_callback(lambda task: self._on_read_done(key, task))
+        return task
+
+    def forget(self, key: Key) -> None:
+        """
+        Forget the cached state of a characteristic, e.g. once it's removed.
+        """
+
+        self._read_at.pop(key, None)
+        if (task := self._reads.pop(key, None)) is not None:
+            task.cancel()
+
+    # Internal helpers
+
+    async def _read(self, key: Key, characteristic: BaseCharacteristic[Any]) -> Any:
+        assert characteristic.provider is not None
+        value = await characteristic.provider.handler()
+        characteristic.value = value
+        self._read_at[key] = asyncio.get_running_loop().time()
+        return value
+
+    def _on_read_done(self, key: Key, task: asyncio.Task[Any]) -> None:
+        if self._reads.get(key) is task:
+            del self._reads[key]
+        if not task.cancelled() and (exception := task.exception()):
+            logger.warning("Failed to read %s.%s: %r", *key, exception)
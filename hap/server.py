@@ -1,7 +1,60 @@
-from typing import Any
+import asyncio
+import enum
+import logging
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Callable, Collection, Iterable, NamedTuple, Sequence
 
-from .accessories import Accessory, Characteristic, Service
+from .accessories import Accessory, BaseCharacteristic, Service
+from .accessories.base import Permission, validate_many
+from .accessories.store import StoredCharacteristic, ValueStore
 from .backends import Backend
+from .database import AttributeDatabase
+from .http.encoder import ReadFlags, encode_reads, encode_statuses
+from .providers import ProviderCache
+from .timers import TimerWheel
+
+logger = logging.getLogger("hap.server")
+
+# A value change of a characteristic, as its accessory ID, instance ID and value
+Update = tuple[int, int, Any]
+
+# Called with value changes and the origin of the writes that caused them
+Listener = Callable[[list[Update], Any], None]
+
+# The origin of the writes being performed, e.g. the controller connection
+_origin: ContextVar[Any] = ContextVar("origin", default=None)
+
+
+class Status(enum.IntEnum):
+    """
+    HAP status codes, reported per characteristic when reading or writing.
+    """
+
+    SUCCESS = 0
+    INSUFFICIENT_PRIVILEGES = -70401
+    UNABLE_TO_COMMUNICATE = -70402
+    BUSY = -70403
+    READ_ONLY = -70404
+    WRITE_ONLY = -70405
+    NOTIFICATION_NOT_SUPPORTED = -70406
+    OUT_OF_RESOURCES = -70407
+    TIMED_OUT = -70408
+    RESOURCE_DOES_NOT_EXIST = -70409
+    INVALID_VALUE = -70410
+    INSUFFICIENT_AUTHORIZATION = -70411
+
+
+class Write(NamedTuple):
+    """
+    A write of a characteristic by a controller, which can set its value,
+    enable or disable event notifications, or both.
+    """
+
+    aid: int
+    iid: int
+    value: Any = None
+    ev: bool | None = None
 
 
 class AccessoryServer:
@@ -12,18 +65,441 @@ class AccessoryServer:
     def __init__(self, backend: Backend) -> None:
         self.accessories: list[Accessory] = []
         self.backend = backend
+        self.database = AttributeDatabase(self.accessories)
+
+        # All characteristics by their accessory and instance ID
+        self._characteristics: dict[tuple[int, int], BaseCharacteristic[Any]] = {}
+
+        # Deadlines of prepared timed writes by their pid. Expired pids are
+        # rejected based on their deadline, the timer wheel only cleans them up.
+        self._prepared: dict[int, float] = {}
+        self._prepared_timers = TimerWheel(self._on_prepare_expired, resolution=1.0)
+
+        # Cached values of characteristics with a read provider
+        self._providers = ProviderCache()
+
+        # Announced to controllers, and bumped whenever the structure of the
+        # attribute database changes, see update_configuration()
+        self.configuration_number: int | None = None
+
+        # Called with the value changes of each batch, see flush_updates()
+        self.listeners: list[Listener] = []
+
+        # Characteristics whose value changed since the last flush, and the
+        # origin of the latest change
+        self._dirty: dict[tuple[int, int], tuple[BaseCharacteristic[Any], Any]] = {}
+        self._flush_handle: asyncio.Handle | None = None
+
+        # Aids of the stored characteristics, by their store, format and slot,
+        # to record the changes of bulk writes, see ValueStore.write()
+        self._stored_aids: dict[ValueStore, dict[str, dict[int, int]]] = {}
 
     def add_accessory(self, accessory: Accessory) -> None:
         """ """
 
         self.accessories.append(accessory)
+        for service in accessory.services:
+            # Shared by the characteristics of the service
+            on_update = partial(self.on_characteristic_updated, accessory, service)
+            for characteristic in service.characteristics:
+                characteristic._on_update = on_update
+                self._characteristics[
+                    (accessory.aid, characteristic.iid)
+                ] = characteristic
+                if isinstance(characteristic, StoredCharacteristic):
+                    self._add_stored(accessory.aid, characteristic)
+        self.database.invalidate()
+
+    def remove_accessory(self, aid: int) -> None:
+        """
+        Remove an accessory from the server.
+        """
+
+        for accessory in self.accessories:
+            if accessory.aid == aid:
+                break
+        else:
+            raise KeyError(f"No accessory with aid {aid}")
+
+        self.accessories.remove(accessory)
+        for service in accessory.services:
+            for characteristic in service.characteristics:
+                characteristic._on_update = None
+                del self._characteristics[(aid, characteristic.iid)]
+                self._providers.forget((aid, characteristic.iid))
+                if isinstance(characteristic, StoredCharacteristic):
+                    self._stored_aids[characteristic.store][
+                        characteristic.type.format
+                    ].pop(characteristic.slot, None)
+        self.database.invalidate()
+
+    async def get_attribute_database(self) -> bytes:
+        """
+        Get the serialized attribute database of all accessories.
+        """
+
+        self.flush_updates()
+        return self.database.serialize()
+
+    async def update_configuration(self) -> int:
+        """
+        Get the configuration number, bumping it if the structure of the
+        attribute database changed since the number was stored. Restarts with
+        the same accessories keep the same number, so that controllers don't
+        fetch the whole database again.
+        """
+
+        digest = self.database.digest()
+        stored = await self.backend.load_configuration()
+        if stored is not None and stored[1] == digest:
+            number = stored[0]
+        else:
+            # Numbers wrap around to 1 after 65535
+            number = stored[0] % 65535 + 1 if stored is not None else 1
+            await self.backend.store_configuration(number, digest)
+        self.configuration_number = number
+        return number
+
+    async def get_characteristics(
+        self,
+        ids: Iterable[tuple[int, int]],
+        flags: ReadFlags = ReadFlags(0),
+        deadline: float | None = None,
+        events: Collection[tuple[int, int]] | None = None,
+    ) -> tuple[bool, bytes]:
+        """
+        Read a batch of characteristics, returning whether all of them could
+        be read and the serialized result. If any of the reads failed, every
+        entry in the result carries its own status.
+
+        The ev field reports whether each characteristic is in events, the
+        characteristics the reader is subscribed to. Without those, it falls
+        back to the event_notifications_enabled default of the characteristic.
+
+        Characteristics with a read provider whose cached value can't be
+        served are read from their providers concurrently. Reads that haven't
+        finished by the deadline, in event loop time, or within the timeout of
+        their provider are reported as unable to communicate.
+        """
+
+        reads: list[tuple[int, int, BaseCharacteristic[Any] | None, int]] = []
+        provided: list[tuple[int, BaseCharacteristic[Any], float | None]] = []
+        for aid, iid in ids:
+            if (characteristic := self._characteristics.get((aid, iid))) is None:
+                status = Status.RESOURCE_DOES_NOT_EXIST
+            elif Permission.PAIRED_READ not in characteristic.type.permissions:
+                status = Status.WRITE_ONLY
+            else:
+                status = Status.SUCCESS
+                provider = characteristic.provider
+                if provider is not None and not self._providers.use_cached(
+                    (aid, iid), characteristic
+                ):
+                    provided.append((len(reads), characteristic, provider.timeout))
+            reads.append((aid, iid, characteristic, status))
+
+        if provided:
+            tasks = [
+                asyncio.ensure_future(
+                    asyncio.wait_for(
+                        self._providers.read(reads[index][:2], characteristic),
+                        timeout,
+                    )
+                )
+                for index, characteristic, timeout in provided
+            ]
+            await _wait_until(tasks, deadline)
+            for (index, characteristic, _), task in zip(provided, tasks):
+                if task.cancelled() or task.exception() is not None:
+                    aid, iid = reads[index][:2]
+                    reads[index] = (
+                        aid,
+                        iid,
+                        characteristic,
+                        Status.UNABLE_TO_COMMUNICATE,
+                    )
+
+        success = all(status == Status.SUCCESS for *_, status in reads)
+        return success, encode_reads(reads, flags, not success, events)
+
+    async def prepare_write(self, pid: int, ttl: float) -> Status:
+        """
+        Prepare a timed write, that is a write with the same pid that's
+        performed within ttl seconds.
+        """
+
+        self._prepared[pid] = asyncio.get_running_loop().time() + ttl
+        self._prepared_timers.schedule(pid, ttl)
+        return Status.SUCCESS
+
+    async def put_characteristics(
+        self,
+        writes: Iterable[Write],
+        pid: int | None = None,
+        deadline: float | None = None,
+        origin: Any = None,
+    ) -> tuple[bool, bytes, list[Status]]:
+        """
+        Write a batch of characteristics, returning whether all writes
+        succeeded, the serialized status of each write if not, and the
+        statuses themselves.
+
+        Event notification subscriptions are kept by the caller, the ev field
+        of writes is only checked here. The origin of the writes, e.g. the
+        controller connection, is passed on to the listeners so they can
+        skip notifying it of its own changes.
+
+        All writes are validated before any of them is performed. The write
+        handlers of different accessories then run concurrently, while the
+        writes to a single accessory are performed in order.
+
+        Writes with a pid are timed writes, which are only performed if they
+        were prepared and haven't expired yet. Characteristics that require
+        timed writes can't be written without one.
+
+        Write handlers that are still running at the deadline, in event loop
+        time, are cancelled. Those writes and any writes queued behind them
+        are reported as unable to communicate. A write handler that runs
+        longer than the write_timeout of its characteristic only fails its
+        own write.
+        """
+
+        writes = list(writes)
+        timed = pid is not None and self._take_prepared(pid)
+
+        statuses: list[Status] = []
+        by_accessory: dict[int, list[tuple[int, BaseCharacteristic[Any], Any]]] = {}
+        for index, write in enumerate(writes):
+            if pid is not None and not timed:
+                status, characteristic, value = Status.INVALID_VALUE, None, None
+            else:
+                status, characteristic, value = self._validate_write(write, timed)
+            if status == Status.SUCCESS and write.value is not None:
+                assert characteristic is not None
+                by_accessory.setdefault(write.aid, []).append(
+                    (index, characteristic, value)
+                )
+
+                # Until the write has actually been performed
+                status = Status.UNABLE_TO_COMMUNICATE
+            statuses.append(status)
+
+        if by_accessory:
+            # The tasks performing the writes inherit the origin
+            token = _origin.set(origin)
+            try:
+                tasks = [
+                    asyncio.ensure_future(
+                        self._perform_writes(accessory_writes, statuses)
+                    )
+                    for accessory_writes in by_accessory.values()
+                ]
+            finally:
+                _origin.reset(token)
+            await _wait_until(tasks, deadline)
+
+        if all(status == Status.SUCCESS for status in statuses):
+            return True, b"", statuses
+        return (
+            False,
+            encode_statuses(
+                (write.aid, write.iid, status)
+                for write, status in zip(writes, statuses)
+            ),
+            statuses,
+        )
+
+    def get_characteristic(self, aid: int, iid: int) -> BaseCharacteristic[Any] | None:
+        """
+        Look up a characteristic by its accessory and instance ID.
+        """
+
+        return self._characteristics.get((aid, iid))
+
+    def apply_updates(self, updates: Iterable[Update]) -> list[tuple[int, int, Status]]:
+        """
+        Set the values of many characteristics at once, e.g. when mirroring
+        an external system, and return the updates that were rejected along
+        with their status.
+
+        Values are set by the accessories themselves, so they're coerced
+        rather than checked against the permissions of controllers. Updates
+        that don't change the value are dropped, and the changes are flushed
+        to the listeners once the whole batch has been applied.
+        """
+
+        resolved: list[tuple[int, int, BaseCharacteristic[Any]]] = []
+        values: list[tuple[Any, Any]] = []
+        rejected: list[tuple[int, int, Status]] = []
+        characteristics = self._characteristics
+        for aid, iid, value in updates:
+            if (characteristic := characteristics.get((aid, iid))) is None:
+                rejected.append((aid, iid, Status.RESOURCE_DOES_NOT_EXIST))
+            else:
+                resolved.append((aid, iid, characteristic))
+                values.append((characteristic.type, value))
+
+        origin = _origin.get()
+        dirty = self._dirty
+        for (aid, iid, characteristic), value in zip(
+            resolved, validate_many(values, coerce=True)
+        ):
+            if isinstance(value, ValueError):
+                rejected.append((aid, iid, Status.INVALID_VALUE))
+            elif characteristic.value != value:
+                characteristic._set_value(value)
+                dirty[(aid, iid)] = (characteristic, origin)
+
+        self.flush_updates()
+        return rejected
 
     def on_characteristic_updated(
         self,
         accessory: Accessory,
         service: Service,
-        characteristic: Characteristic[Any],
+        characteristic: BaseCharacteristic[Any],
     ) -> None:
         """
         Callback when a characteristic has been updated.
+
+        The change is only recorded, and all changes made during an iteration
+        of the event loop are flushed together once it's done. Outside of an
+        event loop, changes are flushed right away.
+        """
+
+        self._dirty[(accessory.aid, characteristic.iid)] = (
+            characteristic,
+            _origin.get(),
+        )
+        self._schedule_flush()
+
+    def flush_updates(self) -> None:
+        """
+        Apply the recorded value changes to the attribute database, and pass
+        them on to the listeners. Each listener is called once per origin of
+        the changes, with the latest value of each changed characteristic.
         """
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+
+        batches: dict[Any, list[Update]] = {}
+        for (aid, iid), (characteristic, origin) in dirty.items():
+            if self._characteristics.get((aid, iid)) is not characteristic:
+                # Removed since it changed
+                continue
+            self.database.update_value(aid, characteristic)
+            batches.setdefault(origin, []).append((aid, iid, characteristic.value))
+
+        for origin, updates in batches.items():
+            for listener in self.listeners:
+                try:
+                    listener(updates, origin)
+                except Exception:
+                    logger.exception("Listener failed to handle updates")
+
+    # Internal helpers
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush_updates()
+                return
+            self._flush_handle = loop.call_soon(self.flush_updates)
+
+    def _add_stored(self, aid: int, characteristic: StoredCharacteristic) -> None:
+        store = characteristic.store
+        if (aids := self._stored_aids.get(store)) is None:
+            aids = self._stored_aids[store] = {}
+            store.listeners.append(partial(self._on_stored_written, aids))
+        aids.setdefault(characteristic.type.format, {})[characteristic.slot] = aid
+
+    def _on_stored_written(
+        self,
+        aids: dict[str, dict[int, int]],
+        format: str,
+        characteristics: list[StoredCharacteristic],
+    ) -> None:
+        # Record the changes of a bulk write to a store, like
+        # on_characteristic_updated() does for each of them
+        if (slot_aids := aids.get(format)) is None:
+            return
+        origin = _origin.get()
+        dirty = self._dirty
+        for characteristic in characteristics:
+            if (aid := slot_aids.get(characteristic.slot)) is not None:
+                dirty[(aid, characteristic.iid)] = (characteristic, origin)
+        self._schedule_flush()
+
+    def _on_prepare_expired(self, pid: int) -> None:
+        del self._prepared[pid]
+
+    def _take_prepared(self, pid: int) -> bool:
+        # A prepared write can only be used once
+        deadline = self._prepared.pop(pid, None)
+        self._prepared_timers.cancel(pid)
+        return deadline is not None and asyncio.get_running_loop().time() < deadline
+
+    def _validate_write(
+        self, write: Write, timed: bool = False
+    ) -> tuple[Status, BaseCharacteristic[Any] | None, Any]:
+        if (characteristic := self.get_characteristic(write.aid, write.iid)) is None:
+            return Status.RESOURCE_DOES_NOT_EXIST, None, None
+
+        permissions = characteristic.type.permissions
+        if write.ev is not None and Permission.NOTIFY not in permissions:
+            return Status.NOTIFICATION_NOT_SUPPORTED, characteristic, None
+        if write.value is None:
+            return Status.SUCCESS, characteristic, None
+        if Permission.PAIRED_WRITE not in permissions:
+            return Status.READ_ONLY, characteristic, None
+        if Permission.TIMED_WRITE in permissions and not timed:
+            return Status.INVALID_VALUE, characteristic, None
+        try:
+            value = characteristic.type.validate(write.value)
+        except ValueError:
+            return Status.INVALID_VALUE, characteristic, None
+        return Status.SUCCESS, characteristic, value
+
+    async def _perform_writes(
+        self,
+        writes: list[tuple[int, BaseCharacteristic[Any], Any]],
+        statuses: list[Status],
+    ) -> None:
+        for index, characteristic, value in writes:
+            if characteristic.write_handler is not None:
+                try:
+                    await asyncio.wait_for(
+                        characteristic.write_handler(value),
+                        characteristic.write_timeout,
+                    )
+                except Exception:
+                    logger.exception("Failed to write %s", characteristic)
+                    continue
+            characteristic.value = value
+            statuses[index] = Status.SUCCESS
+
+
+async def _wait_until(
+    tasks: Sequence[asyncio.Future[Any]], deadline: float | None
+) -> None:
+    """
+    Wait for tasks to finish, cancelling those still running at the deadline.
+    """
+
+    timeout = None
+    if deadline is not None:
+        timeout = max(deadline - asyncio.get_running_loop().time(), 0)
+    try:
+        await asyncio.wait(tasks, timeout=timeout)
+    finally:
+        if pending := [task for task in tasks if not task.done()]:
+            for task in pending:
+                task.cancel()
+            await asyncio.wait(pending)
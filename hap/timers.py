@@ -0,0 +1,108 @@
+"""
+A hashed timer wheel for tracking large numbers of coarse-grained timeouts.
+
+Scheduling and cancelling a timer is O(1) and the whole wheel is driven by a
+single event loop timer, so it's cheap to keep thousands of timeouts around
+compared to having one ``loop.call_later()`` handle for each of them.
+"""
+
+import asyncio
+import math
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimerWheel(Generic[K]):
+    """
+    Timer wheel that calls ``callback`` with the key of each expired timer.
+
+    Timers are bucketed into slots of ``resolution`` seconds, so a timer may
+    fire up to one resolution later than requested. Timers further in the
+    future than a full rotation of the wheel simply stay in their slot until
+    their deadline has passed.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[K], None],
+        *,
+        resolution: float = 1.0,
+        size: int = 64,
+    ) -> None:
+        self.callback = callback
+        self.resolution = resolution
+        self.size = size
+        self._slots: list[dict[K, float]] = [{} for _ in range(size)]
+        self._entries: dict[K, int] = {}
+        self._cursor = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def schedule(self, key: K, delay: float) -> None:
+        """
+        Schedule a timer for key, replacing any existing timer for it.
+        """
+
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+
+        self.cancel(key)
+
+        # The current slot might have been entered up to a full resolution
+        # ago, so add an extra tick to make sure the deadline has passed by
+        # the time the slot is visited
+        ticks = max(0, math.ceil(delay / self.resolution)) + 1
+        index = (self._cursor + ticks) % self.size
+        self._slots[index][key] = self._loop.time() + delay
+        self._entries[key] = index
+
+        if self._handle is None:
+            self._handle = self._loop.call_later(self.resolution, self._tick)
+
+    def cancel(self, key: K) -> None:
+        """
+        Cancel the timer for key, if any.
+        """
+
+        if (index := self._entries.pop(key, None)) is not None:
+            del self._slots[index][key]
+
+    def clear(self) -> None:
+        """
+        Cancel all timers and stop the wheel.
+        """
+
+        for slot in self._slots:
+            slot.clear()
+        self._entries.clear()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _tick(self) -> None:
+        assert self._loop is not None
+
+        self._cursor = (self._cursor + 1) % self.size
+        slot = self._slots[self._cursor]
+
+        # Allow for some clock jitter, as the loop timer might fire slightly
+        # ahead of the deadlines it's responsible for.
+        now = self._loop.time() + self.resolution / 2
+        if expired := [key for key, deadline in slot.items() if deadline <= now]:
+            for key in expired:
+                del slot[key]
+                del self._entries[key]
+            for key in expired:
+                self.callback(key)
+
+        if self._entries:
+            self._handle = self._loop.call_later(self.resolution, self._tick)
+        else:
+            self._handle = None
@@ -5,15 +5,20 @@ import pytest
 from hap.accessories import (
     Accessory,
     AccessoryInformation,
+    Brightness,
     FirmwareRevision,
     Identify,
+    Lightbulb,
     Manufacturer,
     Model,
     Name,
+    On,
     SerialNumber,
     Service,
 )
 from hap.backends.base import TypeManager
+from hap.backends.memory import MemoryBackend
+from hap.server import AccessoryServer
 
 pytest.register_assert_rewrite("tests.fixtures")
 
@@ -52,6 +57,41 @@ def accessory(service: Service) -> Accessory:
     return Accessory(aid=1, services=[service])
 
 
+@pytest.fixture
+def lightbulb(get_instance_id: Callable[[], int]) -> Accessory:
+    return Accessory(
+        aid=2,
+        services=[
+            Service.from_spec(
+                AccessoryInformation(
+                    FirmwareRevision("0.0.1"),
+                    Identify(),
+                    Manufacturer("Drugis Corp."),
+                    Model("Test bulb"),
+                    Name("Test bulb"),
+                    SerialNumber("456"),
+                ),
+                get_instance_id,
+            ),
+            Service.from_spec(
+                Lightbulb(On(False), Brightness(50), primary=True), get_instance_id
+            ),
+        ],
+    )
+
+
+@pytest.fixture
+def accessory_server(accessory: Accessory, lightbulb: Accessory) -> AccessoryServer:
+    """
+    An accessory server with a bare accessory (aid 1) and a light bulb (aid 2).
+    """
+
+    server = AccessoryServer(MemoryBackend())
+    server.add_accessory(accessory)
+    server.add_accessory(lightbulb)
+    return server
+
+
 @pytest.fixture
 def type_manager() -> TypeManager:
     return TypeManager()
@@ -5,6 +5,7 @@ from typing import Any, Iterable
 from hap.http.app import App
 from hap.http.request import Request, Session
 from hap.http.response import Response
+from hap.server import AccessoryServer
 from hap.tlv import TLV
 from hap.tlv import encode as encode_tlv
 
@@ -14,8 +15,8 @@ class Client:
     Client for the HTTP server.
     """
 
-    def __init__(self) -> None:
-        self.app = App()
+    def __init__(self, server: AccessoryServer | None = None) -> None:
+        self.app = App(server=server)
         self.session = Session()
 
     def request(
@@ -40,7 +41,7 @@ class Client:
 
         request = Request(
             method=method,
-            path=path,
+            target=path.encode(),
             headers=tuple(
                 (key.encode(), value.encode()) for key, value in headers.items()
             ),
@@ -63,3 +64,12 @@ class Client:
         tlv: Iterable[TLV[Any]] | None = None,
     ) -> Response:
         return self.request("POST", path, headers=headers, json=json, tlv=tlv)
+
+    def put(
+        self,
+        path: str,
+        *,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+    ) -> Response:
+        return self.request("PUT", path, headers=headers, json=json)
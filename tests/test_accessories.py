@@ -1,4 +1,33 @@
-from hap.accessories import CurrentTemperature, TemperatureSensor
+import itertools
+from typing import Any
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+import pytest
+
+from hap.accessories import (
+    Accessory,
+    AccessoryInformation,
+    AirQuality,
+    Brightness,
+    Characteristic,
+    CharacteristicType,
+    CurrentTemperature,
+    FirmwareRevision,
+    Identify,
+    Lightbulb,
+    LockControlPoint,
+    Manufacturer,
+    Model,
+    Name,
+    On,
+    ReadProvider,
+    SerialNumber,
+    Service,
+    TemperatureSensor,
+    base,
+    validate_many,
+)
 
 
 def test_current_temperature() -> None:
@@ -32,3 +61,185 @@ def test_temperature_sensor() -> None:
 
     char_spec = service_spec.characteristics[0]
     assert char_spec.type is CurrentTemperature
+
+
+def test_interned_specs() -> None:
+    assert CurrentTemperature(20.0) is CurrentTemperature(20.0)
+    assert CurrentTemperature(20.0) is not CurrentTemperature(20)
+    assert Brightness(1) is not Brightness(True)
+    assert TemperatureSensor(CurrentTemperature(20.0)) is TemperatureSensor(
+        CurrentTemperature(20.0)
+    )
+    assert TemperatureSensor(CurrentTemperature(20.0)) is not TemperatureSensor(
+        CurrentTemperature(20.0), primary=True
+    )
+
+
+def test_unique_specs_not_interned() -> None:
+    shared = On(False)
+    assert On(False) is shared
+    for i in range(base.MAX_INTERNED + 1000):
+        AccessoryInformation(
+            FirmwareRevision("1.0"),
+            Identify(),
+            Manufacturer("Acme"),
+            Model("Bulb"),
+            Name(f"Unique bulb {i}"),
+            SerialNumber(str(i)),
+        )
+
+    # Specs defined only once don't push out the shared ones
+    assert On(False) is shared
+    assert not any(
+        spec.type is Name and str(spec.initial_value).startswith("Unique")
+        for spec in base._characteristic_specs.values()
+    )
+    assert len(base._new_characteristic_specs) <= base.MAX_NEW
+    assert len(base._new_service_specs) <= base.MAX_NEW
+
+
+@pytest.mark.parametrize("attempt", [1, 2])
+def test_service_spec_checks(attempt: int) -> None:
+    # Checks are memoized, but still fail every time
+    with pytest.raises(ValueError, match="Missing"):
+        Lightbulb(Brightness())
+    with pytest.raises(ValueError, match="Unsupported"):
+        TemperatureSensor(CurrentTemperature(), On())
+
+
+@pytest.mark.parametrize(
+    "char_type, value, expected",
+    [
+        (On, True, True),
+        (On, 0, False),
+        (Brightness, 100, 100),
+        (CurrentTemperature, 21.5, 21.5),
+        (CurrentTemperature, 20, 20),
+        (Brightness._replace(min_step=5), 23, 25),
+        (AirQuality, 5, 5),
+        (Name, "Lamp", "Lamp"),
+        (LockControlPoint, "AQI=", b"\x01\x02"),
+    ],
+)
+def test_validate(
+    char_type: CharacteristicType[Any], value: Any, expected: Any
+) -> None:
+    assert char_type.validate(value) == expected
+
+
+@pytest.mark.parametrize(
+    "char_type, value",
+    [
+        (On, 2),
+        (On, "true"),
+        (Brightness, 101),
+        (Brightness, 50.5),
+        (Brightness, True),
+        (CurrentTemperature, "20"),
+        (CurrentTemperature, float("nan")),
+        (CurrentTemperature, 100.2),
+        (AirQuality, 6),
+        (Name, "x" * 65),
+        (LockControlPoint, "not base64"),
+    ],
+)
+def test_validate_invalid(char_type: CharacteristicType[Any], value: Any) -> None:
+    with pytest.raises(ValueError):
+        char_type.validate(value)
+
+
+def test_coerce() -> None:
+    assert LockControlPoint.coerce(b"\x01\x02") == b"\x01\x02"
+    with pytest.raises(ValueError):
+        LockControlPoint.coerce("AQI=")
+    assert Brightness._replace(min_step=10).coerce(44) == 40
+
+
+def test_validators_bounded() -> None:
+    # Types created on the fly don't make the cache of validators grow forever
+    for step in range(1, base.MAX_INTERNED + 100):
+        assert Brightness._replace(min_step=step).coerce(0) == 0
+    assert len(base._validators) <= base.MAX_INTERNED
+
+
+def test_set_invalid_value(lightbulb: Accessory) -> None:
+    _, brightness = lightbulb[Lightbulb].characteristics
+    with pytest.raises(ValueError):
+        brightness.value = 101
+    assert brightness.value == 50
+
+
+def test_validate_many(lightbulb: Accessory) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    values = validate_many(
+        [(on.type, 1), (brightness.type, 101), (brightness.type, 20)]
+    )
+    assert values[0] is True
+    assert isinstance(values[1], ValueError)
+    assert values[2] == 20
+
+    (error,) = validate_many([(brightness.type, 20.5)], coerce=True)
+    assert isinstance(error, ValueError)
+
+
+def test_getitem(lightbulb: Accessory) -> None:
+    service = lightbulb[Lightbulb]
+    on, brightness = service.characteristics
+    assert service[on.type] is on
+    assert service[brightness.type] is brightness
+
+    # Equal types that aren't the same object are found as well
+    assert service[brightness.type._replace()] is brightness
+
+    service[brightness.type] = 20
+    assert brightness.value == 20
+
+
+def test_getitem_missing(lightbulb: Accessory) -> None:
+    service = lightbulb[Lightbulb]
+    _, brightness = service.characteristics
+    with pytest.raises(KeyError):
+        service[brightness.type._replace(uuid=UUID(int=1))]
+    with pytest.raises(KeyError):
+        lightbulb[TemperatureSensor]
+
+
+def test_getitem_same_uuid(lightbulb: Accessory) -> None:
+    service = lightbulb[Lightbulb]
+    on, brightness = service.characteristics
+
+    # A different type with the same UUID isn't mistaken for the indexed one
+    other = brightness.type._replace(description="Other")
+    with pytest.raises(KeyError):
+        service[other]
+    duplicate = Service(
+        iid=10,
+        type=service.type,
+        characteristics=[on, Characteristic(11, other, False, 1)],
+        primary=False,
+        hidden=False,
+    )
+    assert duplicate[other].iid == 11
+
+
+def test_compact_model(lightbulb: Accessory) -> None:
+    service = lightbulb[Lightbulb]
+    on, brightness = service.characteristics
+    for instance in (lightbulb, service, on):
+        assert not hasattr(instance, "__dict__")
+
+    # Rarely used state is only allocated once it's set
+    assert on._extras is None
+    assert on.write_handler is None and on.provider is None
+    on.provider = ReadProvider(handler=AsyncMock(return_value=True))
+    assert on._extras is not None
+    assert on.write_handler is None
+    assert brightness._extras is None
+
+
+def test_shared_index(lightbulb: Accessory) -> None:
+    service = lightbulb[Lightbulb]
+    copy = Service.from_spec(
+        Lightbulb(On(), Brightness(), primary=True), itertools.count(100).__next__
+    )
+    assert copy._index is service._index
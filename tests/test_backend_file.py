@@ -16,3 +16,16 @@ def test_file_backend(
     assert asyncio.run(backend.load_accessories(type_manager)) == []
     asyncio.run(backend.store_accessory(accessory))
     assert asyncio.run(backend.load_accessories(type_manager)) == [accessory]
+
+
+def test_file_backend_persists(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+
+    backend = FileBackend(path=path)
+    asyncio.run(backend.store_instance_ids({"2": {"a": 1}}))
+    asyncio.run(backend.store_configuration(3, "digest"))
+
+    # Both are on disk without saving the state explicitly
+    restarted = FileBackend(path=path)
+    assert asyncio.run(restarted.load_instance_ids()) == {"2": {"a": 1}}
+    assert asyncio.run(restarted.load_configuration()) == (3, "digest")
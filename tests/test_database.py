@@ -0,0 +1,167 @@
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from hap.accessories import Accessory, Lightbulb
+from hap.server import AccessoryServer, Status, Update
+
+from .fixtures import Client
+
+
+def test_attribute_database(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    data = json.loads(accessory_server.database.serialize())
+    accessories = data["accessories"]
+    assert [accessory["aid"] for accessory in accessories] == [1, 2]
+
+    information, light = accessories[1]["services"]
+    assert information["type"] == "3E"
+    assert light["type"] == "43"
+    assert light["primary"] is True
+    assert light["hidden"] is False
+
+    on, brightness = light["characteristics"]
+    assert on == {
+        "iid": lightbulb[Lightbulb].characteristics[0].iid,
+        "type": "25",
+        "perms": ["pr", "pw", "ev"],
+        "format": "bool",
+        "description": "On",
+        "value": False,
+    }
+    assert brightness["value"] == 50
+    assert brightness["minValue"] == 0
+    assert brightness["maxValue"] == 100
+    assert brightness["unit"] == "percentage"
+
+    # Write only characteristics don't have a value
+    identify = information["characteristics"][1]
+    assert identify["type"] == "14"
+    assert "value" not in identify
+
+
+def test_attribute_database_is_cached(accessory_server: AccessoryServer) -> None:
+    database = accessory_server.database
+    assert database.serialize() is database.serialize()
+
+
+def test_value_update(accessory_server: AccessoryServer, lightbulb: Accessory) -> None:
+    database = accessory_server.database
+    before = database.serialize()
+
+    on, brightness = lightbulb[Lightbulb].characteristics
+    on.value = True
+    brightness.value = 100
+
+    after = database.serialize()
+    assert after is not before
+    assert after == before.replace(b'"value":false', b'"value":true').replace(
+        b'"value":50', b'"value":100'
+    )
+
+
+@pytest.mark.asyncio
+async def test_batched_updates(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    batches: list[tuple[list[Update], Any]] = []
+    accessory_server.listeners.append(
+        lambda updates, origin: batches.append((updates, origin))
+    )
+    before = accessory_server.database.serialize()
+
+    # Changes made during an iteration of the event loop are flushed once,
+    # with the latest value of each characteristic
+    on, brightness = lightbulb[Lightbulb].characteristics
+    for value in range(1000):
+        brightness.value = value % 101
+    on.value = True
+    assert batches == []
+    assert accessory_server.database.serialize() is before
+
+    await asyncio.sleep(0)
+    assert batches == [([(2, brightness.iid, 90), (2, on.iid, True)], None)]
+
+    # Pending changes are flushed before the database is served
+    brightness.value = 20
+    data = json.loads(await accessory_server.get_attribute_database())
+    assert data["accessories"][1]["services"][1]["characteristics"][1]["value"] == 20
+
+
+def test_apply_updates(accessory_server: AccessoryServer, lightbulb: Accessory) -> None:
+    batches: list[list[Update]] = []
+    accessory_server.listeners.append(lambda updates, _: batches.append(updates))
+    on, brightness = lightbulb[Lightbulb].characteristics
+
+    rejected = accessory_server.apply_updates(
+        [
+            (2, on.iid, False),  # Unchanged
+            (2, brightness.iid, 20),
+            (2, brightness.iid, 101),
+            (2, 99, 1),
+            (2, brightness.iid, 30),
+        ]
+    )
+    assert rejected == [
+        (2, 99, Status.RESOURCE_DOES_NOT_EXIST),
+        (2, brightness.iid, Status.INVALID_VALUE),
+    ]
+
+    # The listeners are called once, only with the values that changed
+    assert batches == [[(2, brightness.iid, 30)]]
+    assert brightness.value == 30
+    data = json.loads(accessory_server.database.serialize())
+    assert data["accessories"][1]["services"][1]["characteristics"][1]["value"] == 30
+
+    assert accessory_server.apply_updates([(2, brightness.iid, 30)]) == []
+    assert len(batches) == 1
+
+
+def test_structure_change(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    database = accessory_server.database
+    database.serialize()
+
+    accessory_server.remove_accessory(lightbulb.aid)
+    data = json.loads(database.serialize())
+    assert [accessory["aid"] for accessory in data["accessories"]] == [1]
+
+    # Values of removed accessories no longer affect the database
+    lightbulb[Lightbulb].characteristics[0].value = True
+    assert json.loads(database.serialize()) == data
+
+
+def test_configuration_number(
+    accessory: Accessory, accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    backend = accessory_server.backend
+    assert asyncio.run(accessory_server.update_configuration()) == 1
+
+    # Value changes and restarts with the same accessories keep the number
+    lightbulb[Lightbulb].characteristics[0].value = True
+    assert asyncio.run(accessory_server.update_configuration()) == 1
+    restarted = AccessoryServer(backend)
+    restarted.add_accessory(accessory)
+    restarted.add_accessory(lightbulb)
+    assert asyncio.run(restarted.update_configuration()) == 1
+
+    # Structural changes bump it
+    restarted.remove_accessory(lightbulb.aid)
+    assert asyncio.run(restarted.update_configuration()) == 2
+    assert restarted.configuration_number == 2
+
+    # After 65535 it wraps around to 1
+    asyncio.run(backend.store_configuration(65535, "other"))
+    assert asyncio.run(restarted.update_configuration()) == 1
+
+
+def test_get_accessories(accessory_server: AccessoryServer) -> None:
+    client = Client(accessory_server)
+    response = client.get("/accessories")
+    assert response.status == 200
+    assert ("content-type", "application/hap+json") in response.headers
+    assert response.body == accessory_server.database.serialize()
@@ -0,0 +1,84 @@
+import itertools
+
+from hap.accessories import (
+    Accessory,
+    AccessoryTemplate,
+    Brightness,
+    Lightbulb,
+    Name,
+    On,
+    Service,
+    diff_accessories,
+)
+from hap.accessories.base import ServiceSpec
+from hap.iids import InstanceIdAllocator
+
+
+def create_accessory(aid: int, specs: list[ServiceSpec]) -> Accessory:
+    iids = itertools.count(1)
+    return Accessory(
+        aid=aid, services=[Service.from_spec(spec, iids.__next__) for spec in specs]
+    )
+
+
+def test_no_changes() -> None:
+    template = AccessoryTemplate([Lightbulb(On(False), Brightness(50))])
+    old = template.create_many([2, 3])
+    new = template.create_many([2, 3])
+    assert diff_accessories(old, new).empty
+    assert diff_accessories(old, old, values=True).empty
+
+
+def test_accessories() -> None:
+    template = AccessoryTemplate([Lightbulb(On(False))])
+    old = template.create_many([2, 3])
+    new = template.create_many([3, 4])
+    result = diff_accessories(old, new)
+    assert result.added == [(4, None)]
+    assert result.removed == [(2, None)]
+    assert result.changed == []
+
+
+def test_services_and_characteristics() -> None:
+    # Stable instance IDs keep the diff minimal
+    allocator = InstanceIdAllocator()
+
+    def create(specs: list[ServiceSpec]) -> Accessory:
+        get_instance_id = allocator.allocate(2, specs)
+        return Accessory(
+            aid=2, services=[Service.from_spec(spec, get_instance_id) for spec in specs]
+        )
+
+    old = create(
+        [
+            Lightbulb(On(False), Brightness(50)),
+            Lightbulb(On(False), primary=True),
+            Lightbulb(On(False)),
+        ]
+    )
+    new = create(
+        [
+            Lightbulb(On(False), Name("Lamp"), Brightness(50)),
+            Lightbulb(On(False)),
+        ]
+    )
+    result = diff_accessories([old], [new])
+    assert result.added == [(2, 8)]
+    assert result.removed == [(2, 6)]
+    assert result.changed == [(2, 4)]
+
+
+def test_changed_type() -> None:
+    old = create_accessory(2, [Lightbulb(On(False), Brightness(50))])
+    new = create_accessory(2, [Lightbulb(On(False), Name("Lamp"))])
+    result = diff_accessories([old], [new])
+    assert (result.added, result.removed, result.changed) == ([], [], [(2, 3)])
+
+
+def test_values() -> None:
+    template = AccessoryTemplate([Lightbulb(On(False), Brightness(50))])
+    old = template.create_many([2])
+    new = template.create_many([2])
+    new[0][Lightbulb].characteristics[1].value = 20
+    assert diff_accessories(old, new).empty
+    assert diff_accessories(old, new, values=True).changed == [(2, 3)]
@@ -0,0 +1,379 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+import pytest
+
+from hap.accessories import (
+    Accessory,
+    Characteristic,
+    CharacteristicType,
+    Lightbulb,
+    LockMechanism,
+    Service,
+)
+from hap.accessories.base import Permission
+from hap.http.api.accessories import parse_ids
+from hap.server import AccessoryServer, Status, Write
+
+from .fixtures import Client
+
+
+def test_parse_ids() -> None:
+    assert parse_ids(["1.10,2.11", "3.12"]) == [(1, 10), (2, 11), (3, 12)]
+
+    for value in ("", "1", "1.", "a.1", "1.2,"):
+        with pytest.raises(ValueError):
+            parse_ids([value])
+
+
+def test_read(accessory_server: AccessoryServer, lightbulb: Accessory) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    client = Client(accessory_server)
+
+    response = client.get(f"/characteristics?id=2.{on.iid},2.{brightness.iid}")
+    assert response.status == 200
+    assert ("content-type", "application/hap+json") in response.headers
+    assert json.loads(response.body) == {
+        "characteristics": [
+            {"aid": 2, "iid": on.iid, "value": False},
+            {"aid": 2, "iid": brightness.iid, "value": 50},
+        ]
+    }
+
+
+def test_read_flags(accessory_server: AccessoryServer, lightbulb: Accessory) -> None:
+    _, brightness = lightbulb[Lightbulb].characteristics
+    client = Client(accessory_server)
+
+    response = client.get(f"/characteristics?id=2.{brightness.iid}&type=1&perms=1")
+    (entry,) = json.loads(response.body)["characteristics"]
+    assert entry == {
+        "aid": 2,
+        "iid": brightness.iid,
+        "value": 50,
+        "type": "8",
+        "perms": ["pr", "pw", "ev"],
+    }
+
+    response = client.get(f"/characteristics?id=2.{brightness.iid}&meta=1&ev=1")
+    (entry,) = json.loads(response.body)["characteristics"]
+    assert entry["format"] == "int32"
+    assert entry["unit"] == "percentage"
+    assert entry["minValue"] == 0
+    assert entry["ev"] is False
+    assert "type" not in entry
+
+
+def test_read_multi_status(
+    accessory_server: AccessoryServer, accessory: Accessory, lightbulb: Accessory
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    identify = accessory.services[0].characteristics[1]
+    client = Client(accessory_server)
+
+    response = client.get(f"/characteristics?id=2.{on.iid},1.{identify.iid},5.{on.iid}")
+    assert response.status == 207
+    assert json.loads(response.body) == {
+        "characteristics": [
+            {"aid": 2, "iid": on.iid, "value": False, "status": Status.SUCCESS},
+            {"aid": 1, "iid": identify.iid, "status": Status.WRITE_ONLY},
+            {"aid": 5, "iid": on.iid, "status": Status.RESOURCE_DOES_NOT_EXIST},
+        ]
+    }
+
+
+def test_read_invalid_ids(accessory_server: AccessoryServer) -> None:
+    client = Client(accessory_server)
+    assert client.get("/characteristics").status == 400
+    assert client.get("/characteristics?id=1.x").status == 400
+
+
+def test_removed_accessory(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    assert accessory_server.get_characteristic(2, on.iid) is on
+
+    accessory_server.remove_accessory(2)
+    assert accessory_server.get_characteristic(2, on.iid) is None
+
+
+def test_write(accessory_server: AccessoryServer, lightbulb: Accessory) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    client = Client(accessory_server)
+
+    response = client.put(
+        "/characteristics",
+        json={
+            "characteristics": [
+                {"aid": 2, "iid": on.iid, "value": 1},
+                {"aid": 2, "iid": brightness.iid, "value": 20, "ev": True},
+            ]
+        },
+    )
+    assert response.status == 204
+    assert on.value is True
+    assert brightness.value == 20
+
+
+def test_write_multi_status(
+    accessory_server: AccessoryServer, accessory: Accessory, lightbulb: Accessory
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    name = accessory.services[0].characteristics[4]
+    client = Client(accessory_server)
+
+    response = client.put(
+        "/characteristics",
+        json={
+            "characteristics": [
+                {"aid": 2, "iid": on.iid, "value": True},
+                {"aid": 2, "iid": brightness.iid, "value": 101},
+                {"aid": 1, "iid": name.iid, "value": "New name"},
+                {"aid": 5, "iid": on.iid, "value": True},
+            ]
+        },
+    )
+    assert response.status == 207
+    assert json.loads(response.body)["characteristics"] == [
+        {"aid": 2, "iid": on.iid, "status": Status.SUCCESS},
+        {"aid": 2, "iid": brightness.iid, "status": Status.INVALID_VALUE},
+        {"aid": 1, "iid": name.iid, "status": Status.READ_ONLY},
+        {"aid": 5, "iid": on.iid, "status": Status.RESOURCE_DOES_NOT_EXIST},
+    ]
+    assert on.value is True
+    assert brightness.value == 50
+
+
+def test_subscribe_without_notify(
+    accessory_server: AccessoryServer, accessory: Accessory, lightbulb: Accessory
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    name = accessory.services[0].characteristics[4]
+    client = Client(accessory_server)
+
+    response = client.put(
+        "/characteristics",
+        json={
+            "characteristics": [
+                {"aid": 2, "iid": on.iid, "ev": True},
+                {"aid": 1, "iid": name.iid, "ev": True},
+            ]
+        },
+    )
+    assert response.status == 207
+    assert json.loads(response.body)["characteristics"] == [
+        {"aid": 2, "iid": on.iid, "status": Status.SUCCESS},
+        {"aid": 1, "iid": name.iid, "status": Status.NOTIFICATION_NOT_SUPPORTED},
+    ]
+
+
+def test_write_handlers(
+    accessory_server: AccessoryServer, accessory: Accessory, lightbulb: Accessory
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    identify = accessory.services[0].characteristics[1]
+    calls: list[str] = []
+
+    def handler(name: str) -> Callable[[Any], Awaitable[None]]:
+        async def write(value: Any) -> None:
+            calls.append(f"{name} start")
+            await asyncio.sleep(0)
+            calls.append(f"{name} end")
+
+        return write
+
+    on.write_handler = handler("on")
+    brightness.write_handler = handler("brightness")
+    identify.write_handler = handler("identify")
+
+    response = Client(accessory_server).put(
+        "/characteristics",
+        json={
+            "characteristics": [
+                {"aid": 2, "iid": on.iid, "value": True},
+                {"aid": 1, "iid": identify.iid, "value": True},
+                {"aid": 2, "iid": brightness.iid, "value": 10},
+            ]
+        },
+    )
+    assert response.status == 204
+
+    # Writes to different accessories overlap, while the writes to a single
+    # accessory happen in order
+    assert calls.index("identify start") < calls.index("on end")
+    assert calls.index("on end") < calls.index("brightness start")
+
+
+def test_write_handler_failure(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+
+    async def fail(value: Any) -> None:
+        raise ConnectionError("The bulb is unreachable")
+
+    on.write_handler = fail
+    response = Client(accessory_server).put(
+        "/characteristics",
+        json={"characteristics": [{"aid": 2, "iid": on.iid, "value": True}]},
+    )
+    assert response.status == 207
+    assert json.loads(response.body)["characteristics"] == [
+        {"aid": 2, "iid": on.iid, "status": Status.UNABLE_TO_COMMUNICATE},
+    ]
+    assert on.value is False
+
+
+def test_write_deadline(
+    accessory_server: AccessoryServer, accessory: Accessory, lightbulb: Accessory
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    identify = accessory.services[0].characteristics[1]
+    cancelled = []
+
+    async def hang(value: Any) -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+
+    on.write_handler = hang
+    client = Client(accessory_server)
+    client.app.budget = 0.05
+    response = client.put(
+        "/characteristics",
+        json={
+            "characteristics": [
+                {"aid": 2, "iid": on.iid, "value": True},
+                {"aid": 2, "iid": brightness.iid, "value": 10},
+                {"aid": 1, "iid": identify.iid, "value": True},
+            ]
+        },
+    )
+
+    # The hanging write is cancelled, along with the write queued behind it,
+    # while the write to another accessory still succeeds
+    assert response.status == 207
+    assert json.loads(response.body)["characteristics"] == [
+        {"aid": 2, "iid": on.iid, "status": Status.UNABLE_TO_COMMUNICATE},
+        {"aid": 2, "iid": brightness.iid, "status": Status.UNABLE_TO_COMMUNICATE},
+        {"aid": 1, "iid": identify.iid, "status": Status.SUCCESS},
+    ]
+    assert cancelled == [True]
+    assert on.value is False
+    assert brightness.value == 50
+
+
+def test_write_timeout(accessory_server: AccessoryServer, lightbulb: Accessory) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+
+    async def hang(value: Any) -> None:
+        await asyncio.sleep(10)
+
+    on.write_handler = hang
+    on.write_timeout = 0.01
+    response = Client(accessory_server).put(
+        "/characteristics",
+        json={
+            "characteristics": [
+                {"aid": 2, "iid": on.iid, "value": True},
+                {"aid": 2, "iid": brightness.iid, "value": 10},
+            ]
+        },
+    )
+
+    # Only the write that timed out fails, the one queued behind it still
+    # succeeds within the budget of the request
+    assert response.status == 207
+    assert json.loads(response.body)["characteristics"] == [
+        {"aid": 2, "iid": on.iid, "status": Status.UNABLE_TO_COMMUNICATE},
+        {"aid": 2, "iid": brightness.iid, "status": Status.SUCCESS},
+    ]
+    assert on.value is False
+    assert brightness.value == 10
+
+
+def test_write_invalid_body(accessory_server: AccessoryServer) -> None:
+    client = Client(accessory_server)
+    assert client.put("/characteristics", json={}).status == 400
+    assert client.put("/characteristics", json=[1]).status == 400
+    assert (
+        client.put(
+            "/characteristics", json={"characteristics": [{"aid": "1", "iid": 2}]}
+        ).status
+        == 400
+    )
+
+
+@pytest.fixture
+def lock_control(accessory_server: AccessoryServer) -> Characteristic[int]:
+    """
+    A characteristic on accessory 3 that requires timed writes.
+    """
+
+    char_type = CharacteristicType[int](
+        UUID("00000000-0000-1000-8000-000000000001"),
+        permissions=(Permission.PAIRED_WRITE, Permission.TIMED_WRITE),
+        format="uint8",
+    )
+    characteristic = Characteristic.from_spec(char_type(0), lambda: 2)
+    service = Service(1, LockMechanism, [characteristic], primary=True, hidden=False)
+    accessory_server.add_accessory(Accessory(aid=3, services=[service]))
+    return characteristic
+
+
+def test_timed_write(
+    accessory_server: AccessoryServer, lock_control: Characteristic[int]
+) -> None:
+    client = Client(accessory_server)
+    write = {"characteristics": [{"aid": 3, "iid": 2, "value": 1}], "pid": 42}
+
+    response = client.put("/prepare", json={"ttl": 5000, "pid": 42})
+    assert response.status == 200
+    assert json.loads(response.body) == {"status": Status.SUCCESS}
+
+    assert client.put("/characteristics", json=write).status == 204
+    assert lock_control.value == 1
+
+    # A prepared write can only be used once
+    response = client.put("/characteristics", json=write)
+    assert response.status == 207
+    assert json.loads(response.body)["characteristics"] == [
+        {"aid": 3, "iid": 2, "status": Status.INVALID_VALUE}
+    ]
+
+
+def test_timed_write_required(
+    accessory_server: AccessoryServer, lock_control: Characteristic[int]
+) -> None:
+    response = Client(accessory_server).put(
+        "/characteristics", json={"characteristics": [{"aid": 3, "iid": 2, "value": 1}]}
+    )
+    assert response.status == 207
+    assert json.loads(response.body)["characteristics"] == [
+        {"aid": 3, "iid": 2, "status": Status.INVALID_VALUE}
+    ]
+    assert lock_control.value == 0
+
+
+@pytest.mark.asyncio
+async def test_timed_write_expired(
+    accessory_server: AccessoryServer, lock_control: Characteristic[int]
+) -> None:
+    assert await accessory_server.prepare_write(42, 0.01) == Status.SUCCESS
+    await asyncio.sleep(0.02)
+
+    success, _, _ = await accessory_server.put_characteristics([Write(3, 2, 1)], pid=42)
+    assert not success
+    assert lock_control.value == 0
+
+
+def test_prepare_invalid(accessory_server: AccessoryServer) -> None:
+    client = Client(accessory_server)
+    assert client.put("/prepare", json={"ttl": 1000}).status == 400
+    assert client.put("/prepare", json={"ttl": 0, "pid": 1}).status == 400
+    assert client.put("/prepare", json={"ttl": 1000, "pid": -1}).status == 400
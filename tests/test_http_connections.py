@@ -0,0 +1,90 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from hap.http.connections import ConnectionManager
+from hap.http.server import serve
+
+pytestmark = pytest.mark.asyncio
+
+REQUEST = b"GET / HTTP/1.1\r\nHost: example.com\r\n\r\n"
+
+
+async def test_connection_counters(unused_tcp_port: int) -> None:
+    manager = ConnectionManager()
+    async with serve(port=unused_tcp_port, connections=manager):
+        reader, writer = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        writer.write(REQUEST)
+        await writer.drain()
+        response = await reader.readuntil(b'{"foo":"bar"}')
+
+        assert len(manager) == 1
+        assert manager.idle_count == 1
+        assert manager.active_count == 0
+        (connection,) = manager.connections.values()
+        assert connection.requests == 1
+        assert connection.bytes_received == len(REQUEST)
+        assert connection.bytes_sent == len(response)
+
+        writer.close()
+
+
+async def test_evict_oldest_idle_connection(unused_tcp_port: int) -> None:
+    manager = ConnectionManager(max_connections=2)
+    async with serve(port=unused_tcp_port, connections=manager):
+        streams = []
+        for _ in range(3):
+            streams.append(await asyncio.open_connection("127.0.0.1", unused_tcp_port))
+            await asyncio.sleep(0.01)
+        (first_reader, _), (second_reader, _), _ = streams
+
+        # The first connection is the oldest idle one, so it's evicted
+        assert await asyncio.wait_for(first_reader.read(), timeout=1) == b""
+        assert len(manager) == 2
+        assert manager.evicted == 1
+        assert not second_reader.at_eof()
+
+        for _, writer in streams:
+            writer.close()
+
+
+async def test_reap_idle_connections(unused_tcp_port: int) -> None:
+    manager = ConnectionManager(idle_timeout=0.05, timer_resolution=0.01)
+    async with serve(port=unused_tcp_port, connections=manager):
+        reader, writer = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await asyncio.sleep(0.01)
+        assert len(manager) == 1
+
+        assert await asyncio.wait_for(reader.read(), timeout=1) == b""
+        await asyncio.sleep(0.01)
+        assert len(manager) == 0
+        assert manager.reaped == 1
+
+        writer.close()
+
+
+async def test_busy_and_evictable_bookkeeping() -> None:
+    manager = ConnectionManager(max_connections=3)
+    first, second, third = [manager.open(Mock()) for _ in range(3)]
+    assert first and second and third
+
+    first.busy = True
+    second.subscribed = True
+    assert (manager.active_count, manager.idle_count) == (1, 2)
+
+    # Only the connection that's neither busy nor subscribed can be evicted
+    fourth = manager.open(Mock())
+    assert fourth is not None
+    assert third.id not in manager.connections
+    fourth.busy = True
+    assert manager.open(Mock()) is None
+    assert manager.rejected == 1
+
+    # Busy connections that are closed no longer count
+    first.busy = False
+    manager.touch(first)
+    first.busy = True
+    manager.close(first)
+    first.busy = False
+    assert (len(manager), manager.active_count) == (2, 1)
@@ -0,0 +1,101 @@
+import json
+from typing import Any
+from uuid import UUID
+
+import pytest
+
+from hap.accessories import Accessory, Brightness, Lightbulb
+from hap.http import encoder
+from hap.http.encoder import (
+    ALL_METADATA,
+    ReadFlags,
+    dumps,
+    encode_events,
+    encode_statuses,
+    encode_value,
+    metadata_fragment,
+    short_uuid,
+)
+
+
+def test_short_uuid() -> None:
+    assert short_uuid(UUID("0000003E-0000-1000-8000-0026BB765291")) == "3E"
+    assert short_uuid(UUID("00000000-0000-1000-8000-0026BB765291")) == "0"
+    assert (
+        short_uuid(UUID("0000003e-0000-1000-8000-0026bb765292"))
+        == "0000003E-0000-1000-8000-0026BB765292"
+    )
+
+
+@pytest.mark.parametrize(
+    "value, format, expected",
+    [
+        (None, "bool", b"null"),
+        (True, "bool", b"true"),
+        (0, "bool", b"false"),
+        (255, "uint8", b"255"),
+        (-5, "int32", b"-5"),
+        (21.5, "float", b"21.5"),
+        (20, "float", b"20"),
+        ("Lamp ✨", "string", b'"Lamp \\u2728"'),
+        (b"\x01\x02", "tlv8", b'"AQI="'),
+    ],
+)
+def test_encode_value(value: Any, format: str, expected: bytes) -> None:
+    assert json.loads(encode_value(value, format)) == json.loads(expected)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps(use_orjson: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(encoder, "_orjson", None)
+    elif encoder._orjson is None:
+        pytest.skip("orjson is not installed")
+
+    data = {"characteristics": [{"aid": 1, "iid": 2, "value": 0.5}], "a": None}
+    assert json.loads(dumps(data)) == data
+    assert b" " not in dumps(data)
+    assert dumps(b"\x01\x02") == b'"AQI="'
+
+
+def test_metadata_fragment(lightbulb: Accessory) -> None:
+    char_type = lightbulb[Lightbulb].characteristics[1].type
+    assert char_type is Brightness
+
+    fragment = metadata_fragment(char_type, ReadFlags.TYPE | ReadFlags.PERMS)
+    assert fragment == b',"type":"8","perms":["pr","pw","ev"]'
+    assert metadata_fragment(char_type, ReadFlags.TYPE | ReadFlags.PERMS) is fragment
+    assert metadata_fragment(char_type, ReadFlags(0)) == b""
+
+    metadata = json.loads(b"{" + metadata_fragment(char_type, ALL_METADATA)[1:] + b"}")
+    assert metadata == {
+        "type": "8",
+        "perms": ["pr", "pw", "ev"],
+        "format": "int32",
+        "description": "Brightness",
+        "unit": "percentage",
+        "minValue": 0,
+        "maxValue": 100,
+        "minStep": 1,
+    }
+
+
+def test_encode_statuses() -> None:
+    assert json.loads(encode_statuses([(1, 2, 0), (1, 3, -70402)])) == {
+        "characteristics": [
+            {"aid": 1, "iid": 2, "status": 0},
+            {"aid": 1, "iid": 3, "status": -70402},
+        ]
+    }
+
+
+def test_encode_events() -> None:
+    body = encode_events([(1, 2, True), (1, 3, 21.5), (2, 4, b"\x00"), (2, 5, "on")])
+    assert json.loads(body) == {
+        "characteristics": [
+            {"aid": 1, "iid": 2, "value": True},
+            {"aid": 1, "iid": 3, "value": 21.5},
+            {"aid": 2, "iid": 4, "value": "AA=="},
+            {"aid": 2, "iid": 5, "value": "on"},
+        ]
+    }
@@ -0,0 +1,311 @@
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from hap.accessories import Accessory, Lightbulb
+from hap.http import events
+from hap.http.app import App
+from hap.http.connections import ConnectionManager
+from hap.http.encoder import encode_events
+from hap.http.events import EventHub
+from hap.http.server import serve
+from hap.server import AccessoryServer
+
+pytestmark = pytest.mark.asyncio
+
+Stream = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+async def request(
+    stream: Stream, method: str, target: str, data: Any = None
+) -> tuple[bytes, Any]:
+    reader, writer = stream
+    body = json.dumps(data).encode() if data is not None else b""
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nHost: hap\r\n".encode()
+        + b"Content-Type: application/hap+json\r\n"
+        + b"Content-Length: %d\r\n\r\n" % len(body)
+        + body
+    )
+    await writer.drain()
+    return await read_message(reader)
+
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[bytes, Any]:
+    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=1)
+    status_line, *header_lines = head.decode().split("\r\n")
+    headers = dict(line.lower().split(": ", 1) for line in header_lines if line)
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status_line.encode(), json.loads(body) if body else None
+
+
+async def subscribe(stream: Stream, aid: int, iid: int) -> None:
+    status_line, _ = await request(
+        stream,
+        "PUT",
+        "/characteristics",
+        {"characteristics": [{"aid": aid, "iid": iid, "ev": True}]},
+    )
+    assert status_line == b"HTTP/1.1 204 "
+
+
+async def assert_no_message(stream: Stream) -> None:
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(stream[0].read(1), timeout=0.05)
+
+
+async def test_events(
+    accessory_server: AccessoryServer, lightbulb: Accessory, unused_tcp_port: int
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    async with serve(port=unused_tcp_port, app=App(server=accessory_server)):
+        subscriber = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        writer = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        bystander = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await subscribe(subscriber, 2, on.iid)
+        await subscribe(writer, 2, on.iid)
+
+        status_line, _ = await request(
+            writer,
+            "PUT",
+            "/characteristics",
+            {"characteristics": [{"aid": 2, "iid": on.iid, "value": True}]},
+        )
+        assert status_line == b"HTTP/1.1 204 "
+
+        # The subscriber is notified, but not the connection that made the
+        # change or one that didn't subscribe
+        assert await read_message(subscriber[0]) == (
+            b"EVENT/1.0 200 OK",
+            {"characteristics": [{"aid": 2, "iid": on.iid, "value": True}]},
+        )
+        await assert_no_message(writer)
+        await assert_no_message(bystander)
+
+        # Changes made by the accessory itself go to all subscribers
+        on.value = False
+        for stream in (subscriber, writer):
+            _, body = await read_message(stream[0])
+            assert body["characteristics"][0]["value"] is False
+
+        for _, stream_writer in (subscriber, writer, bystander):
+            stream_writer.close()
+
+
+async def test_unsubscribe(
+    accessory_server: AccessoryServer, lightbulb: Accessory, unused_tcp_port: int
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    app = App(server=accessory_server)
+    async with serve(port=unused_tcp_port, app=app):
+        subscriber = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await subscribe(subscriber, 2, on.iid)
+        await request(
+            subscriber,
+            "PUT",
+            "/characteristics",
+            {"characteristics": [{"aid": 2, "iid": on.iid, "ev": False}]},
+        )
+
+        on.value = True
+        await assert_no_message(subscriber)
+
+        # Closing a connection drops its subscriptions
+        await subscribe(subscriber, 2, on.iid)
+        subscriber[1].close()
+        await asyncio.sleep(0.01)
+        on.value = False
+        await asyncio.sleep(0.01)
+        assert app.events.sent == 0
+
+
+async def test_read_ev(
+    accessory_server: AccessoryServer, lightbulb: Accessory, unused_tcp_port: int
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    async with serve(port=unused_tcp_port, app=App(server=accessory_server)):
+        subscriber = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        other = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await subscribe(subscriber, 2, on.iid)
+
+        target = f"/characteristics?id=2.{on.iid}&ev=1"
+        _, body = await request(subscriber, "GET", target)
+        assert body["characteristics"][0]["ev"] is True
+        _, body = await request(other, "GET", target)
+        assert body["characteristics"][0]["ev"] is False
+
+        subscriber[1].close()
+        other[1].close()
+
+
+async def test_serialized_once(
+    accessory_server: AccessoryServer,
+    lightbulb: Accessory,
+    unused_tcp_port: int,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    encoded = []
+
+    def count_encode_events(updates: Any) -> bytes:
+        encoded.append(updates)
+        return encode_events(updates)
+
+    monkeypatch.setattr(events, "encode_events", count_encode_events)
+    async with serve(port=unused_tcp_port, app=App(server=accessory_server)):
+        subscribers = [
+            await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+            for _ in range(3)
+        ]
+        for subscriber in subscribers:
+            await subscribe(subscriber, 2, on.iid)
+
+        on.value = True
+        for reader, _ in subscribers:
+            _, body = await read_message(reader)
+            assert body["characteristics"][0]["value"] is True
+        assert len(encoded) == 1
+
+        for _, writer in subscribers:
+            writer.close()
+
+
+async def test_coalescing(
+    accessory_server: AccessoryServer, lightbulb: Accessory, unused_tcp_port: int
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    hub = EventHub(accessory_server, window=0.05)
+    manager = ConnectionManager()
+    app = App(server=accessory_server, events=hub)
+    async with serve(port=unused_tcp_port, app=app, connections=manager):
+        subscriber = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await subscribe(subscriber, 2, on.iid)
+        await subscribe(subscriber, 2, brightness.iid)
+
+        # Changes within the window are sent together, with only the latest
+        # value of each characteristic
+        on.value = True
+        await asyncio.sleep(0)
+        brightness.value = 10
+        on.value = False
+        assert await read_message(subscriber[0]) == (
+            b"EVENT/1.0 200 OK",
+            {
+                "characteristics": [
+                    {"aid": 2, "iid": on.iid, "value": False},
+                    {"aid": 2, "iid": brightness.iid, "value": 10},
+                ]
+            },
+        )
+        assert (hub.sent, hub.suppressed) == (1, 1)
+        (connection,) = manager.connections.values()
+        assert (connection.events_sent, connection.events_suppressed) == (1, 1)
+
+        subscriber[1].close()
+
+
+async def test_min_interval(
+    accessory_server: AccessoryServer, lightbulb: Accessory, unused_tcp_port: int
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    hub = EventHub(accessory_server)
+    hub.min_intervals[(2, brightness.iid)] = 0.2
+    app = App(server=accessory_server, events=hub)
+    async with serve(port=unused_tcp_port, app=app):
+        subscriber = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await subscribe(subscriber, 2, on.iid)
+        await subscribe(subscriber, 2, brightness.iid)
+
+        brightness.value = 10
+        _, body = await read_message(subscriber[0])
+        assert body["characteristics"] == [
+            {"aid": 2, "iid": brightness.iid, "value": 10}
+        ]
+
+        # Further changes are held back until the interval has passed, while
+        # other characteristics aren't affected
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for value in (20, 30, 40):
+            brightness.value = value
+            await asyncio.sleep(0.01)
+        on.value = True
+        _, body = await read_message(subscriber[0])
+        assert body["characteristics"] == [{"aid": 2, "iid": on.iid, "value": True}]
+
+        _, body = await read_message(subscriber[0])
+        assert body["characteristics"] == [
+            {"aid": 2, "iid": brightness.iid, "value": 40}
+        ]
+        assert loop.time() - start >= 0.15
+        assert (hub.sent, hub.suppressed) == (3, 2)
+
+        subscriber[1].close()
+
+
+async def test_own_change_replaces_queued(
+    accessory_server: AccessoryServer, lightbulb: Accessory, unused_tcp_port: int
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    hub = EventHub(accessory_server, window=0.05)
+    app = App(server=accessory_server, events=hub)
+    async with serve(port=unused_tcp_port, app=app):
+        subscriber = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await subscribe(subscriber, 2, on.iid)
+
+        # The queued change is older than the connection's own write, so it's
+        # not sent at all
+        on.value = True
+        await request(
+            subscriber,
+            "PUT",
+            "/characteristics",
+            {"characteristics": [{"aid": 2, "iid": on.iid, "value": False}]},
+        )
+        await assert_no_message(subscriber)
+        assert (hub.sent, hub.suppressed) == (0, 1)
+
+        subscriber[1].close()
+
+
+async def test_subscribed_connections_kept_open(
+    accessory_server: AccessoryServer, lightbulb: Accessory, unused_tcp_port: int
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    manager = ConnectionManager(
+        max_connections=2, idle_timeout=0.05, timer_resolution=0.01
+    )
+    app = App(server=accessory_server)
+    async with serve(port=unused_tcp_port, app=app, connections=manager):
+        subscriber = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await subscribe(subscriber, 2, on.iid)
+        idle = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await asyncio.sleep(0.01)
+
+        # The subscriber is the oldest connection, but the idle one is evicted
+        other = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        assert await asyncio.wait_for(idle[0].read(), timeout=1) == b""
+        assert manager.evicted == 1
+
+        # Only the connection without subscriptions is closed once idle
+        assert await asyncio.wait_for(other[0].read(), timeout=1) == b""
+        await asyncio.sleep(0.1)
+        assert manager.reaped == 1
+        on.value = True
+        _, body = await read_message(subscriber[0])
+        assert body["characteristics"] == [{"aid": 2, "iid": on.iid, "value": True}]
+
+        # Once it unsubscribes, it's closed when idle as well
+        await request(
+            subscriber,
+            "PUT",
+            "/characteristics",
+            {"characteristics": [{"aid": 2, "iid": on.iid, "ev": False}]},
+        )
+        assert await asyncio.wait_for(subscriber[0].read(), timeout=1) == b""
+        assert manager.reaped == 2
+
+        for _, writer in (subscriber, idle, other):
+            writer.close()
@@ -0,0 +1,63 @@
+from urllib.parse import parse_qs
+
+import pytest
+
+from hap.http.request import Request, Session, parse_query
+
+
+def make_request(
+    target: bytes, headers: tuple[tuple[bytes, bytes], ...] = ()
+) -> Request:
+    return Request(
+        method="GET", target=target, headers=headers, body=b"", session=Session()
+    )
+
+
+@pytest.mark.parametrize(
+    "query_string",
+    [
+        b"",
+        b"id=1.2,1.3",
+        b"id=1.2,1.3&meta=1&perms=1&type=1&ev=1",
+        b"a=1&a=2&&b",
+        b"id=1.2%2C1.3",
+        b"name=hello+world",
+    ],
+)
+def test_parse_query(query_string: bytes) -> None:
+    assert parse_query(query_string) == parse_qs(
+        query_string.decode(), keep_blank_values=True
+    )
+
+
+def test_path_and_query() -> None:
+    request = make_request(b"/foo%20bar?id=1.2,1.3&ev=1")
+    assert request.path == "/foo bar"
+    assert request.query_string == b"id=1.2,1.3&ev=1"
+    assert request.query == {"id": ["1.2,1.3"], "ev": ["1"]}
+
+
+def test_query_is_parsed_lazily() -> None:
+    request = make_request(b"/characteristics?id=1.2")
+    assert request._query is None
+    assert request.query is request.query
+
+
+def test_headers() -> None:
+    request = make_request(
+        b"/",
+        headers=(
+            (b"Content-Type", b"application/json"),
+            (b"x-foo", b"1"),
+            (b"X-Foo", b"2"),
+        ),
+    )
+    assert request.content_type == b"application/json"
+    assert request.header(b"x-foo") == b"1"
+    assert request.header(b"x-bar") is None
+
+
+def test_slots() -> None:
+    request = make_request(b"/")
+    with pytest.raises(AttributeError):
+        request.foo = "bar"  # type: ignore[attr-defined]
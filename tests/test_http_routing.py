@@ -0,0 +1,82 @@
+import asyncio
+
+from hap.http.request import Request, Session
+from hap.http.response import JSONResponse, Response
+from hap.http.routing import Handler, Middleware, Router
+
+from .fixtures import Client
+
+
+def dispatch(router: Router, method: str, path: str) -> Response:
+    async def run() -> Response:
+        request = Request(
+            method=method, target=path.encode(), body=b"", session=Session()
+        )
+        return await router.resolve(method, path)(request)
+
+    return asyncio.run(run())
+
+
+async def handler(request: Request) -> Response:
+    return JSONResponse(data=[request.method, request.path])
+
+
+def test_not_found(client: Client) -> None:
+    response = client.get("/does-not-exist")
+    assert response.status == 404
+
+
+def test_method_not_allowed(client: Client) -> None:
+    response = client.get("/pair-setup")
+    assert response.status == 405
+    assert ("allow", "POST") in response.headers
+
+
+def test_head_is_handled_as_get(client: Client) -> None:
+    assert client.request("HEAD", "/").status == 200
+
+
+def test_route_methods() -> None:
+    router = Router()
+    router.add("/characteristics", handler, methods=("GET", "PUT"))
+
+    response = dispatch(router, "PUT", "/characteristics")
+    assert response.body == b'["PUT","/characteristics"]'
+
+    response = dispatch(router, "POST", "/characteristics")
+    assert response.status == 405
+    assert ("allow", "GET, HEAD, PUT") in response.headers
+
+
+def test_middleware_order() -> None:
+    calls: list[str] = []
+
+    def middleware(name: str) -> Middleware:
+        async def wrapper(request: Request, *, handler: Handler) -> Response:
+            calls.append(f"{name} before")
+            response = await handler(request)
+            calls.append(f"{name} after")
+            return response
+
+        return wrapper
+
+    router = Router(middleware=[middleware("outer")])
+    router.add("/", handler, middleware=[middleware("route")])
+    router.use(middleware("inner"))
+
+    response = dispatch(router, "GET", "/")
+    assert response.status == 200
+    assert calls == [
+        "outer before",
+        "inner before",
+        "route before",
+        "route after",
+        "inner after",
+        "outer after",
+    ]
+
+    # Middleware also wrap the responses for unknown routes
+    calls.clear()
+    response = dispatch(router, "GET", "/foo")
+    assert response.status == 404
+    assert calls == ["outer before", "inner before", "inner after", "outer after"]
@@ -1,12 +1,13 @@
 import asyncio
+import socket
 
 import pytest
 
-from hap.http.server import serve
-
-pytestmark = pytest.mark.asyncio
+from hap.http.connections import ConnectionManager
+from hap.http.server import install_event_loop_policy, serve
 
 
+@pytest.mark.asyncio
 @pytest.mark.skip("Slow test due to timeout")
 async def test_timeout(unused_tcp_port: int) -> None:
     print("Starting server")
@@ -31,3 +32,38 @@ async def test_timeout(unused_tcp_port: int) -> None:
         assert response
 
     print("Done")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("nodelay,keepalive", [(True, True), (False, False)])
+async def test_socket_options(
+    unused_tcp_port: int, nodelay: bool, keepalive: bool
+) -> None:
+    manager = ConnectionManager()
+    async with serve(
+        port=unused_tcp_port,
+        connections=manager,
+        nodelay=nodelay,
+        keepalive=keepalive,
+    ):
+        _, writer = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        await asyncio.sleep(0.01)
+
+        (connection,) = manager.connections.values()
+        sock = connection.writer.get_extra_info("socket")
+        assert bool(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)) is nodelay
+        assert (
+            bool(sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)) is keepalive
+        )
+
+        writer.close()
+
+
+def test_install_event_loop_policy() -> None:
+    try:
+        assert install_event_loop_policy("asyncio") == "asyncio"
+        assert install_event_loop_policy("auto") in ("asyncio", "uvloop")
+        with pytest.raises(ValueError):
+            install_event_loop_policy("trio")
+    finally:
+        asyncio.set_event_loop_policy(None)
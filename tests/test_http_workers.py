@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from hap.http.workers import serve_workers
+from hap.server import AccessoryServer
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_serve_workers(
+    accessory_server: AccessoryServer, unused_tcp_port: int
+) -> None:
+    async with serve_workers(
+        accessory_server, workers=2, port=unused_tcp_port
+    ) as processes:
+        assert len(processes) == 2
+
+        # Wait for the workers to start listening
+        for _ in range(100):
+            try:
+                reader, writer = await asyncio.open_connection(
+                    "127.0.0.1", unused_tcp_port
+                )
+                break
+            except ConnectionRefusedError:
+                await asyncio.sleep(0.05)
+        else:
+            raise AssertionError("Workers did not start")
+
+        writer.write(b"GET / HTTP/1.1\r\nHost: example.com\r\n\r\n")
+        await writer.drain()
+        response = await asyncio.wait_for(reader.readuntil(b'{"foo":"bar"}'), 5)
+        assert response.startswith(b"HTTP/1.1 200 ")
+        writer.close()
+
+    assert all(not process.is_alive() for process in processes)
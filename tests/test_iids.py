@@ -0,0 +1,110 @@
+import asyncio
+from pathlib import Path
+
+from hap.accessories import (
+    Accessory,
+    AccessoryInformation,
+    Brightness,
+    FirmwareRevision,
+    Identify,
+    Lightbulb,
+    Manufacturer,
+    Model,
+    Name,
+    On,
+    SerialNumber,
+    Service,
+)
+from hap.accessories.base import ServiceSpec
+from hap.backends.file import FileBackend
+from hap.backends.memory import MemoryBackend
+from hap.iids import InstanceIdAllocator
+
+INFORMATION = AccessoryInformation(
+    FirmwareRevision("1.0"),
+    Identify(),
+    Manufacturer("Acme"),
+    Model("Bulb"),
+    Name("Bulb"),
+    SerialNumber("0"),
+)
+
+
+def create_accessory(
+    allocator: InstanceIdAllocator, aid: int, services: list[ServiceSpec]
+) -> Accessory:
+    get_instance_id = allocator.allocate(aid, services)
+    return Accessory(
+        aid=aid,
+        services=[Service.from_spec(spec, get_instance_id) for spec in services],
+    )
+
+
+def iids(accessory: Accessory) -> list[list[int]]:
+    return [
+        [service.iid] + [char.iid for char in service.characteristics]
+        for service in accessory.services
+    ]
+
+
+def test_allocate() -> None:
+    allocator = InstanceIdAllocator()
+    accessory = create_accessory(
+        allocator, 2, [INFORMATION, Lightbulb(On(), primary=True)]
+    )
+    assert iids(accessory) == [[1, 2, 3, 4, 5, 6, 7], [8, 9]]
+    assert allocator.changed
+
+    # Services and characteristics keep their instance IDs when others are
+    # added, and new ones get the next free instance IDs
+    accessory = create_accessory(
+        allocator,
+        2,
+        [
+            INFORMATION,
+            Lightbulb(On(), Brightness(), primary=True),
+            Lightbulb(On(), Brightness()),
+        ],
+    )
+    assert iids(accessory) == [[1, 2, 3, 4, 5, 6, 7], [8, 9, 10], [11, 12, 13]]
+
+    # Instance IDs of removed services aren't reused
+    accessory = create_accessory(allocator, 2, [INFORMATION, Lightbulb(On())])
+    assert iids(accessory) == [[1, 2, 3, 4, 5, 6, 7], [8, 9]]
+    accessory = create_accessory(
+        allocator, 2, [INFORMATION, Lightbulb(On()), Lightbulb(On())]
+    )
+    assert iids(accessory) == [[1, 2, 3, 4, 5, 6, 7], [8, 9], [11, 12]]
+
+    # Other accessories have their own instance IDs
+    accessory = create_accessory(allocator, 3, [Lightbulb(On(), primary=True)])
+    assert iids(accessory) == [[1, 2]]
+
+
+def test_persisted(tmp_path: Path) -> None:
+    async def start() -> list[list[int]]:
+        backend = FileBackend(path=tmp_path / "state.json")
+        allocator = await InstanceIdAllocator.load(backend)
+        services = [INFORMATION, Lightbulb(On(), primary=True)]
+        if allocator.instance_ids:
+            # Added after the first start
+            services.append(Lightbulb(On(), Brightness()))
+        accessory = create_accessory(allocator, 2, services)
+        await allocator.save(backend)
+        assert not allocator.changed
+        return iids(accessory)
+
+    assert asyncio.run(start()) == [[1, 2, 3, 4, 5, 6, 7], [8, 9]]
+    assert asyncio.run(start()) == [[1, 2, 3, 4, 5, 6, 7], [8, 9], [10, 11, 12]]
+
+
+def test_forget() -> None:
+    backend = MemoryBackend()
+    allocator = InstanceIdAllocator()
+    create_accessory(allocator, 2, [INFORMATION])
+    asyncio.run(allocator.save(backend))
+
+    allocator.forget(2)
+    assert allocator.changed
+    asyncio.run(allocator.save(backend))
+    assert asyncio.run(backend.load_instance_ids()) == {}
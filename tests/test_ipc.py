@@ -0,0 +1,295 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from hap import ipc
+from hap.accessories import Accessory, Lightbulb, Name
+from hap.http.encoder import ReadFlags
+from hap.ipc import StateClient, StateOwner
+from hap.server import AccessoryServer, Status, Update, Write
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        True,
+        False,
+        0,
+        -1,
+        2**40,
+        -(2**63),
+        2**64 - 1,
+        21.5,
+        "",
+        "✨",
+        b"\x00",
+    ],
+)
+async def test_value_roundtrip(value: Any) -> None:
+    data = ipc.encode_updates([(1, 2**40, value), (3, 4, "tail")])
+    assert ipc.decode_updates(data) == [(1, 2**40, value), (3, 4, "tail")]
+
+
+async def test_events(
+    accessory_server: AccessoryServer, lightbulb: Accessory, tmp_path: Path
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        writer = await StateClient.connect(path)
+        subscriber = await StateClient.connect(path)
+
+        events: list[Update] = []
+        subscriber.on_event = lambda updates, origin: events.extend(updates)
+        await subscriber.subscribe([(2, on.iid)])
+
+        await writer.put_characteristics(
+            [Write(2, on.iid, True), Write(2, brightness.iid, 10)]
+        )
+        await asyncio.sleep(0.01)
+        assert events == [(2, on.iid, True)]
+
+        await subscriber.unsubscribe([(2, on.iid)])
+        await writer.put_characteristics([Write(2, on.iid, False)])
+        await asyncio.sleep(0.01)
+        assert events == [(2, on.iid, True)]
+
+        await writer.close()
+        await subscriber.close()
+
+
+async def test_write_read_only(
+    accessory_server: AccessoryServer, accessory: Accessory, tmp_path: Path
+) -> None:
+    name = next(
+        char for char in accessory.services[0].characteristics if char.type is Name
+    )
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        client = await StateClient.connect(path)
+        assert await client.put_characteristics([Write(1, name.iid, "New name")]) == (
+            False,
+            b'{"characteristics":[{"aid":1,"iid":%d,"status":%d}]}'
+            % (name.iid, Status.READ_ONLY),
+            [Status.READ_ONLY],
+        )
+        await client.close()
+
+
+async def test_attribute_database(
+    accessory_server: AccessoryServer, tmp_path: Path
+) -> None:
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        client = await StateClient.connect(path)
+        assert (
+            await client.get_attribute_database()
+            == accessory_server.database.serialize()
+        )
+        await client.close()
+
+
+async def test_get_characteristics(
+    accessory_server: AccessoryServer, lightbulb: Accessory, tmp_path: Path
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    ids = [(2, on.iid), (2, brightness.iid), (3, 1)]
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        client = await StateClient.connect(path)
+        assert await client.get_characteristics(
+            ids, ReadFlags.TYPE
+        ) == await accessory_server.get_characteristics(ids, ReadFlags.TYPE)
+        await client.close()
+
+
+async def test_get_characteristics_invalid_ids(
+    accessory_server: AccessoryServer, lightbulb: Accessory, tmp_path: Path
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    ids = [
+        (2, on.iid),
+        (-1, on.iid),
+        (2, 2**64),
+        (2**64 - 1, 1),
+        (2**70, -(2**70)),
+    ]
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        client = await StateClient.connect(path)
+        success, body = await client.get_characteristics(ids, events={(2, on.iid)})
+        assert (success, body) == await accessory_server.get_characteristics(ids)
+        assert [
+            (entry["aid"], entry["iid"], entry["status"])
+            for entry in json.loads(body)["characteristics"][1:]
+        ] == [(aid, iid, Status.RESOURCE_DOES_NOT_EXIST) for aid, iid in ids[1:]]
+        await client.close()
+
+
+async def test_put_characteristics(
+    accessory_server: AccessoryServer, lightbulb: Accessory, tmp_path: Path
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        client = await StateClient.connect(path)
+        assert await client.put_characteristics(
+            [Write(2, on.iid, True), Write(2, brightness.iid, ev=True)]
+        ) == (True, b"", [Status.SUCCESS, Status.SUCCESS])
+        assert on.value is True
+
+        # The same response and statuses as writing to the server directly
+        writes = [Write(2, on.iid, "on"), Write(3, 1, True), Write(2, on.iid, False)]
+        success, body, statuses = await client.put_characteristics(writes)
+        assert not success
+        assert statuses == [
+            Status.INVALID_VALUE,
+            Status.RESOURCE_DOES_NOT_EXIST,
+            Status.SUCCESS,
+        ]
+        assert (success, body, statuses) == (
+            await accessory_server.put_characteristics(writes)
+        )
+        await client.close()
+
+
+async def test_put_characteristics_invalid(
+    accessory_server: AccessoryServer, lightbulb: Accessory, tmp_path: Path
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    writes = [
+        Write(2, brightness.iid, [10]),
+        Write(2, brightness.iid, {"value": 10}),
+        Write(2, brightness.iid, 2**64),
+        Write(2, brightness.iid, -(2**64)),
+        Write(2, brightness.iid, "\ud800"),
+        Write(-1, on.iid, True),
+        Write(2, 2**64, True),
+        Write(2, on.iid, True),
+    ]
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        client = await StateClient.connect(path)
+
+        # Values that can't be sent to the state owner are invalid, and IDs
+        # that don't fit don't exist, while the other writes are performed
+        success, body, statuses = await client.put_characteristics(writes)
+        assert statuses == [Status.INVALID_VALUE] * 5 + [
+            Status.RESOURCE_DOES_NOT_EXIST,
+            Status.RESOURCE_DOES_NOT_EXIST,
+            Status.SUCCESS,
+        ]
+        assert on.value is True
+        assert (success, body, statuses) == (
+            await accessory_server.put_characteristics(writes)
+        )
+        await client.close()
+
+
+async def test_timed_write(
+    accessory_server: AccessoryServer, lightbulb: Accessory, tmp_path: Path
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        client = await StateClient.connect(path)
+        assert await client.prepare_write(2**64 - 1, 5.0) == Status.SUCCESS
+        assert await client.put_characteristics(
+            [Write(2, on.iid, True)], pid=2**64 - 1
+        ) == (True, b"", [Status.SUCCESS])
+        success, _, _ = await client.put_characteristics(
+            [Write(2, on.iid, False)], pid=2**64 - 1
+        )
+        assert not success
+        assert on.value is True
+        await client.close()
+
+
+async def test_deadline(
+    accessory_server: AccessoryServer, lightbulb: Accessory, tmp_path: Path
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    path = str(tmp_path / "state.sock")
+
+    async def hang(value: Any) -> None:
+        await asyncio.sleep(10)
+
+    on.write_handler = hang
+    async with await StateOwner(accessory_server).start(path):
+        client = await StateClient.connect(path)
+        loop = asyncio.get_running_loop()
+        success, body, _ = await client.put_characteristics(
+            [Write(2, on.iid, True)], deadline=loop.time() + 0.01
+        )
+        assert not success
+        assert json.loads(body)["characteristics"][0]["status"] == (
+            Status.UNABLE_TO_COMMUNICATE
+        )
+        assert await client.get_characteristics(
+            [(2, brightness.iid)], deadline=loop.time() - 1
+        ) == (
+            True,
+            b'{"characteristics":[{"aid":2,"iid":%d,"value":50}]}' % brightness.iid,
+        )
+        await client.close()
+
+
+async def test_event_origin(
+    accessory_server: AccessoryServer, lightbulb: Accessory, tmp_path: Path
+) -> None:
+    on, _ = lightbulb[Lightbulb].characteristics
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        writer = await StateClient.connect(path)
+        other = await StateClient.connect(path)
+        origins: dict[str, int | None] = {}
+        writer.on_event = lambda _, origin: origins.update(writer=origin)
+        other.on_event = lambda _, origin: origins.update(other=origin)
+        await writer.subscribe([(2, on.iid)])
+        await other.subscribe([(2, on.iid)])
+
+        # Only the worker that made the change learns which connection did
+        await writer.put_characteristics([Write(2, on.iid, True)], origin=7)
+        await asyncio.sleep(0.01)
+        assert origins == {"writer": 7, "other": None}
+
+        # Changes made by the accessory itself have no origin
+        on.value = False
+        await asyncio.sleep(0.01)
+        assert origins == {"writer": None, "other": None}
+
+        await writer.close()
+        await other.close()
+
+
+async def test_get_characteristics_events(
+    accessory_server: AccessoryServer, lightbulb: Accessory, tmp_path: Path
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    path = str(tmp_path / "state.sock")
+
+    async with await StateOwner(accessory_server).start(path):
+        client = await StateClient.connect(path)
+        _, body = await client.get_characteristics(
+            [(2, on.iid), (2, brightness.iid)], ReadFlags.EV, events={(2, on.iid)}
+        )
+        assert [entry["ev"] for entry in json.loads(body)["characteristics"]] == [
+            True,
+            False,
+        ]
+        await client.close()
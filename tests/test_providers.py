@@ -0,0 +1,159 @@
+import asyncio
+import json
+
+import pytest
+
+from hap.accessories import Accessory, Lightbulb, ReadProvider
+from hap.server import AccessoryServer, Status
+
+pytestmark = pytest.mark.asyncio
+
+
+class Device:
+    """
+    A fake bridged device, whose brightness can only be read asynchronously.
+    """
+
+    def __init__(self, brightness: int = 70) -> None:
+        self.brightness = brightness
+        self.reads = 0
+        self.fail = False
+        self.delay = 0.0
+
+    async def read_brightness(self) -> int:
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("The device is unreachable")
+        return self.brightness
+
+
+async def read(server: AccessoryServer, iid: int) -> dict[str, object]:
+    _, body = await server.get_characteristics([(2, iid)])
+    entry: dict[str, object] = json.loads(body)["characteristics"][0]
+    return entry
+
+
+async def test_read_through(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    _, brightness = lightbulb[Lightbulb].characteristics
+    device = Device()
+    brightness.provider = ReadProvider(device.read_brightness, max_age=60)
+
+    assert (await read(accessory_server, brightness.iid))["value"] == 70
+    assert brightness.value == 70
+
+    # Fresh values are served from the cache
+    device.brightness = 10
+    assert (await read(accessory_server, brightness.iid))["value"] == 70
+    assert device.reads == 1
+
+
+async def test_stale_while_revalidate(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    _, brightness = lightbulb[Lightbulb].characteristics
+    device = Device()
+    brightness.provider = ReadProvider(device.read_brightness, max_age=0)
+
+    assert (await read(accessory_server, brightness.iid))["value"] == 70
+
+    # The stale value is served right away, and refreshed in the background
+    device.brightness = 10
+    assert (await read(accessory_server, brightness.iid))["value"] == 70
+    await asyncio.sleep(0.01)
+    assert (await read(accessory_server, brightness.iid))["value"] == 10
+
+
+async def test_too_stale(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    _, brightness = lightbulb[Lightbulb].characteristics
+    device = Device()
+    brightness.provider = ReadProvider(
+        device.read_brightness, max_age=0, stale_while_revalidate=0
+    )
+
+    assert (await read(accessory_server, brightness.iid))["value"] == 70
+    device.brightness = 10
+    assert (await read(accessory_server, brightness.iid))["value"] == 10
+
+
+async def test_coalesced_reads(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    _, brightness = lightbulb[Lightbulb].characteristics
+    device = Device()
+    device.delay = 0.01
+    brightness.provider = ReadProvider(device.read_brightness)
+
+    entries = await asyncio.gather(
+        *(read(accessory_server, brightness.iid) for _ in range(10))
+    )
+    assert [entry["value"] for entry in entries] == [70] * 10
+    assert device.reads == 1
+
+
+async def test_read_failure(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    device = Device()
+    device.fail = True
+    brightness.provider = ReadProvider(device.read_brightness)
+
+    success, body = await accessory_server.get_characteristics(
+        [(2, on.iid), (2, brightness.iid)]
+    )
+    assert not success
+    assert json.loads(body)["characteristics"] == [
+        {"aid": 2, "iid": on.iid, "value": False, "status": Status.SUCCESS},
+        {"aid": 2, "iid": brightness.iid, "status": Status.UNABLE_TO_COMMUNICATE},
+    ]
+
+
+async def test_read_deadline(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    device = Device()
+    device.delay = 0.05
+    brightness.provider = ReadProvider(device.read_brightness)
+
+    loop = asyncio.get_running_loop()
+    success, body = await accessory_server.get_characteristics(
+        [(2, on.iid), (2, brightness.iid)], deadline=loop.time() + 0.01
+    )
+    assert not success
+    assert json.loads(body)["characteristics"] == [
+        {"aid": 2, "iid": on.iid, "value": False, "status": Status.SUCCESS},
+        {"aid": 2, "iid": brightness.iid, "status": Status.UNABLE_TO_COMMUNICATE},
+    ]
+
+    # The read from the device itself isn't given up on, so that it can serve
+    # the next request
+    await asyncio.sleep(0.1)
+    assert (await read(accessory_server, brightness.iid))["value"] == 70
+    assert device.reads == 1
+
+
+async def test_read_timeout(
+    accessory_server: AccessoryServer, lightbulb: Accessory
+) -> None:
+    on, brightness = lightbulb[Lightbulb].characteristics
+    slow, fast = Device(), Device(brightness=1)
+    slow.delay = fast.delay = 0.05
+    brightness.provider = ReadProvider(slow.read_brightness, timeout=0.01)
+    on.provider = ReadProvider(fast.read_brightness)
+
+    # Only the read with a timeout fails, although the deadline is further away
+    loop = asyncio.get_running_loop()
+    success, body = await accessory_server.get_characteristics(
+        [(2, on.iid), (2, brightness.iid)], deadline=loop.time() + 1
+    )
+    assert not success
+    assert [entry["status"] for entry in json.loads(body)["characteristics"]] == [
+        Status.SUCCESS,
+        Status.UNABLE_TO_COMMUNICATE,
+    ]
@@ -0,0 +1,138 @@
+import itertools
+import json
+
+import pytest
+
+from hap.accessories import (
+    Accessory,
+    Brightness,
+    Lightbulb,
+    Name,
+    On,
+    Service,
+    ValueStore,
+)
+from hap.accessories import store as store_module
+from hap.accessories.store import StoredCharacteristic
+from hap.backends.memory import MemoryBackend
+from hap.server import AccessoryServer
+
+
+@pytest.fixture
+def store() -> ValueStore:
+    return ValueStore()
+
+
+def create_lightbulb(aid: int, store: ValueStore) -> Accessory:
+    return Accessory(
+        aid=aid,
+        services=[
+            Service.from_spec(
+                Lightbulb(On(False), Brightness(50), Name("Lamp"), primary=True),
+                itertools.count(1).__next__,
+                store,
+            )
+        ],
+    )
+
+
+def test_stored_values(store: ValueStore) -> None:
+    service = create_lightbulb(1, store).services[0]
+    on, brightness, name = service.characteristics
+    assert isinstance(on, StoredCharacteristic)
+    assert isinstance(brightness, StoredCharacteristic)
+
+    # Strings can't be stored
+    assert not isinstance(name, StoredCharacteristic)
+
+    # Stored characteristics have no slot for a value of their own
+    assert not hasattr(brightness, "_value")
+
+    assert on.value is False
+    assert brightness.value == 50
+    on.value = True
+    brightness.value = 20
+    assert on.value is True
+    assert brightness.value == 20
+    assert list(store.arrays["bool"]) == [1]
+    assert list(store.arrays["int32"]) == [20]
+
+
+def test_no_initial_value(store: ValueStore) -> None:
+    service = Service.from_spec(
+        Lightbulb(On(), primary=True), itertools.count(1).__next__, store
+    )
+    assert not isinstance(service.characteristics[0], StoredCharacteristic)
+    assert service.characteristics[0].value is None
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_bulk_access(
+    store: ValueStore, numpy: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(store_module, "_numpy", None)
+    server = AccessoryServer(MemoryBackend())
+    for aid in range(1, 4):
+        server.add_accessory(create_lightbulb(aid, store))
+    server.database.serialize()
+
+    assert store.read("int32", [0, 1, 2]) == [50, 50, 50]
+    assert store.read("bool", [1]) == [False]
+
+    # Only the values that changed are updated, and flushed to the listeners
+    # at once
+    updated: list[list[int]] = []
+    server.listeners.append(
+        lambda updates, _: updated.append([aid for aid, _, _ in updates])
+    )
+    assert store.write("int32", [0, 1, 2], [10, 50, 30]) == 2
+    assert updated == [[1, 3]]
+    brightness = server.get_characteristic(3, 3)
+    assert brightness is not None and brightness.value == 30
+
+    # The cached attribute database is kept up to date
+    database = json.loads(server.database.serialize())
+    values = [
+        [char.get("value") for char in accessory["services"][0]["characteristics"]]
+        for accessory in database["accessories"]
+    ]
+    assert values == [[False, 10, "Lamp"], [False, 50, "Lamp"], [False, 30, "Lamp"]]
+
+    # Ranges of slots are written as a slice without NumPy
+    assert store.write("int32", range(3), [10, 40, 40]) == 2
+    assert store.read("int32", [0, 1, 2]) == [10, 40, 40]
+    assert updated[1:] == [[2, 3]]
+
+    # Removed accessories are no longer updated
+    server.remove_accessory(3)
+    assert store.write("int32", [1, 2], [45, 45]) == 2
+    assert updated[2:] == [[2]]
+
+    with pytest.raises(ValueError):
+        store.write("int32", [0, 1], [1])
+
+    # Nothing is written if any value is invalid
+    with pytest.raises(ValueError):
+        store.write("int32", [0, 1], [20, 101])
+    assert store.read("int32", [0, 1]) == [10, 45]
+
+
+def test_view(store: ValueStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(store_module, "_numpy", None)
+    for aid in range(1, 4):
+        create_lightbulb(aid, store)
+
+    view = store.view("int32")
+    assert isinstance(view, memoryview)
+    assert view.tolist() == [50, 50, 50]
+    view.release()
+
+
+def test_numpy_view(store: ValueStore) -> None:
+    pytest.importorskip("numpy")
+    for aid in range(1, 4):
+        create_lightbulb(aid, store)
+    assert store.view("int32").sum() == 150
@@ -0,0 +1,130 @@
+import asyncio
+import itertools
+import json
+from typing import Any
+
+import pytest
+
+from hap.accessories import (
+    Accessory,
+    AccessoryInformation,
+    AccessoryTemplate,
+    Brightness,
+    FirmwareRevision,
+    Identify,
+    Lightbulb,
+    Manufacturer,
+    Model,
+    Name,
+    On,
+    SerialNumber,
+    Service,
+    TemperatureSensor,
+)
+from hap.accessories.base import ServiceSpec
+from hap.backends.memory import MemoryBackend
+from hap.server import AccessoryServer
+
+SPECS: list[ServiceSpec] = [
+    AccessoryInformation(
+        FirmwareRevision("1.0"),
+        Identify(),
+        Manufacturer("Acme"),
+        Model("Bulb"),
+        Name("Bulb"),
+        SerialNumber("0"),
+    ),
+    Lightbulb(On(False), Brightness(50), primary=True),
+]
+
+
+@pytest.fixture
+def template() -> AccessoryTemplate:
+    return AccessoryTemplate(SPECS)
+
+
+def create_from_specs(aid: int) -> Accessory:
+    iids = itertools.count(1)
+    return Accessory(
+        aid=aid, services=[Service.from_spec(spec, iids.__next__) for spec in SPECS]
+    )
+
+
+def test_create(template: AccessoryTemplate) -> None:
+    # The same as creating the accessory from its specs
+    assert template.create(2) == create_from_specs(2)
+
+
+def slots(instance: object) -> dict[str, Any]:
+    return {
+        name: getattr(instance, name)
+        for cls in type(instance).__mro__
+        for name in getattr(cls, "__slots__", ())
+    }
+
+
+def test_create_slots(template: AccessoryTemplate) -> None:
+    # Every slot is set just like the constructors set it
+    created, expected = template.create(2), create_from_specs(2)
+    assert slots(created) == slots(expected)
+    for service, expected_service in zip(created.services, expected.services):
+        assert slots(service) == slots(expected_service)
+        for char, expected_char in zip(
+            service.characteristics, expected_service.characteristics
+        ):
+            assert type(char) is type(expected_char)
+            assert slots(char) == slots(expected_char)
+
+
+def test_iid(template: AccessoryTemplate) -> None:
+    expected = create_from_specs(2)
+    information = expected[AccessoryInformation]
+    lightbulb = expected[Lightbulb]
+    assert template.iid(AccessoryInformation) == information.iid
+    for characteristic in information.characteristics:
+        assert (
+            template.iid(AccessoryInformation, characteristic.type)
+            == characteristic.iid
+        )
+    assert template.iid(Lightbulb) == lightbulb.iid
+    for characteristic in lightbulb.characteristics:
+        assert template.iid(Lightbulb, characteristic.type) == characteristic.iid
+
+    with pytest.raises(KeyError):
+        template.iid(TemperatureSensor)
+    with pytest.raises(KeyError):
+        template.iid(Lightbulb, information.characteristics[0].type)
+
+
+def test_values(template: AccessoryTemplate) -> None:
+    # Instance IDs are assigned in order, with the service's own first
+    name_iid = SPECS[0].characteristics.index(Name("Bulb")) + 2
+    first, second = template.create_many(
+        [2, 3], [{name_iid: "Kitchen"}, {name_iid: "Hall"}]
+    )
+    assert first[AccessoryInformation].characteristics[4].value == "Kitchen"
+    assert second[AccessoryInformation].characteristics[4].value == "Hall"
+
+    with pytest.raises(ValueError):
+        template.create(4, {name_iid: 1})
+    with pytest.raises(KeyError):
+        template.create(4, {99: 1})
+
+
+def test_instances_are_independent(template: AccessoryTemplate) -> None:
+    server = AccessoryServer(MemoryBackend())
+    first, second = template.create_many([2, 3])
+    server.add_accessory(first)
+    server.add_accessory(second)
+
+    _, brightness = first[Lightbulb].characteristics
+    brightness.value = 20
+    success, body = asyncio.run(
+        server.get_characteristics([(2, brightness.iid), (3, brightness.iid)])
+    )
+    assert success
+    assert [entry["value"] for entry in json.loads(body)["characteristics"]] == [
+        20,
+        50,
+    ]
+    assert server.get_characteristic(2, brightness.iid) is brightness
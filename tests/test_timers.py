@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from hap.timers import TimerWheel
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_timer_wheel_expiry() -> None:
+    expired: list[str] = []
+    wheel = TimerWheel(expired.append, resolution=0.01, size=8)
+
+    wheel.schedule("a", 0.02)
+    wheel.schedule("b", 0.2)  # More than a full rotation of the wheel
+    wheel.schedule("c", 0.02)
+    wheel.cancel("c")
+    assert len(wheel) == 2
+
+    await asyncio.sleep(0.08)
+    assert expired == ["a"]
+    assert "b" in wheel
+
+    await asyncio.sleep(0.2)
+    assert expired == ["a", "b"]
+    assert len(wheel) == 0
+
+
+async def test_timer_wheel_reschedule() -> None:
+    expired: list[str] = []
+    wheel = TimerWheel(expired.append, resolution=0.01, size=8)
+
+    wheel.schedule("a", 0.02)
+    wheel.schedule("a", 0.1)
+
+    await asyncio.sleep(0.05)
+    assert expired == []
+
+    await asyncio.sleep(0.1)
+    assert expired == ["a"]